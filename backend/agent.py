@@ -1,19 +1,35 @@
 import asyncio
 import logging
 import os
-from typing import List, Tuple
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from livekit.agents import (JobContext, VoicePipelineAgent, WorkerOptions, cli,
-                             llm)
+from livekit.agents import (JobContext, JobProcess, VoicePipelineAgent,
+                             WorkerOptions, cli, llm)
 from livekit.agents.llm import LLMFunction, LLMFunctionTool
 from livekit.agents.autosubscribe import AutoSubscribe
 from livekit.plugins import deepgram, elevenlabs, silero
 from livekit.plugins.google import LLM as GoogleLLM
 from sqlalchemy import select
 
-from backend.database import AsyncSessionLocal
+from backend.agent_metrics import TurnLatencyRecorder, mark_job_process_dead, start_agent_metrics_server
+from backend.agent_plugins import PluginClients, prewarm_plugins, prewarmed_plugins
+from backend.chat_context import ChatContextWindow
+from backend.config import settings
+from backend.database import AsyncSessionLocal, db
+from backend.interview_checkpoint import (InterviewCheckpointer, checkpoint_store, load_for_resume,
+                                          resume_history)
+from backend.metrics import (agent_prompt_tokens, agent_recovery_seconds, agent_session_capacity,
+                             agent_time_to_first_greeting, ai_agent_connections)
 from backend.models import Session as SessionModel
-from backend.transcript import TranscriptManager
+from backend.models import SessionStatus
+from backend.recording import recording_manager
+from backend.session_lifecycle import SessionLifecycle, load_transcript_text
+from backend.speech_chunker import make_before_tts_cb
+from backend.transcript import TranscriptManager, transcript_writer
+from backend.transcript_capture import AGENT_SPEAKER, SpeakerLabelMapper, TranscriptCapture
+from backend.tts_cache import wrap_tts
+from backend.worker_load import LoadCalculator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,18 +39,34 @@ logger = logging.getLogger(__name__)
 class GeminiWithTools(llm.LLM):
     """
     Wrapper around a LiveKit LLM plugin to provide tools on each
-    chat request.
+    chat request, keeping the history within the context window.
+
+    With `streaming` the plugin's stream is returned as is, so text deltas
+    reach the sentence chunker and TTS before the completion finishes.
     """
-    def __init__(self, wrapped_llm: llm.LLM, tools: List[LLMFunction]):
+    def __init__(
+        self,
+        wrapped_llm: llm.LLM,
+        tools: List[LLMFunction],
+        context_window: Optional[ChatContextWindow] = None,
+        streaming: bool = False
+    ):
         super().__init__(chat=self.chat)
         self._wrapped_llm = wrapped_llm
         self._tools = tools
+        self._context_window = context_window
+        self._streaming = streaming
 
     async def chat(
         self,
         history: llm.ChatContext,
         **kwargs
     ) -> llm.ChatCompletion:
+        if self._context_window is not None:
+            prompt_tokens = self._context_window.apply(history.messages)
+            agent_prompt_tokens.observe(prompt_tokens)
+        if self._streaming:
+            return self._wrapped_llm.chat(history=history, tools=self._tools, **kwargs)
         return await self._wrapped_llm.chat(
             history=history, tools=self._tools, **kwargs
         )
@@ -60,10 +92,11 @@ def _create_system_prompt(
     script_content: str,
     groom_name: str,
     bride_name: str,
-    strictness: str
+    strictness: str,
+    tool_capture: bool = True
 ) -> str:
     """Create the system prompt for the LLM."""
-    return (
+    prompt = (
         "You are a professional legal marriage verification officer for LexNova Legal.\n"
         "Your role is to conduct a formal verification interview with two participants.\n\n"
         f"REGISTERED PARTICIPANTS:\n"
@@ -80,53 +113,121 @@ def _create_system_prompt(
         "6. Maintain a warm but professional tone throughout the interview.\n"
         "7. If a participant's answer conflicts with the registered information, flag it politely and ask for clarification.\n"
         "8. After the script is completed, conclude the interview professionally.\n"
-        "9. Keep your responses concise and clear.\n\n"
-        "CRITICAL FOR LEGAL RECORDS:\n"
-        "After every single utterance from any participant (yourself, the groom, or the bride), you MUST call the `save_transcript_entry` function. Provide the speaker's name as either '{groom_name}', '{bride_name}', or 'AI Officer' and the exact text they said."
+        "9. Keep your responses concise and clear."
     )
+    if tool_capture:
+        prompt += (
+            "\n\nCRITICAL FOR LEGAL RECORDS:\n"
+            "After every single utterance from any participant (yourself, the groom, or the bride), you MUST call the `save_transcript_entry` function. Provide the speaker's name as either '{groom_name}', '{bride_name}', or 'AI Officer' and the exact text they said."
+        )
+    return prompt
 
-def _create_voice_agent(
-    system_prompt: str,
-    voice_style: str,
-    tools: List[LLMFunction]
-) -> VoicePipelineAgent:
-    """Initialize and return a VoicePipelineAgent."""
-    gemini_api_key = os.getenv("GEMINI_API_KEY", "")
-    deepgram_api_key = os.getenv("DEEPGRAM_API_KEY", "")
-    elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY", "")
+VOICE_MAP = {"warm": "Rachel", "neutral": "Adam", "firm": "Domi"}
+TTS_MODEL_ID = "eleven_turbo_v2"
+TTS_ENCODING = "mp3_44100_128"
 
-    gemini_llm = GoogleLLM(model="gemini-1.5-flash-latest", api_key=gemini_api_key)
-    gemini_with_tools = GeminiWithTools(wrapped_llm=gemini_llm, tools=tools)
+INITIAL_GREETING = (
+    "Good day. I am the LexNova automated verification officer. "
+    "This session is being recorded for legal purposes. "
+    "To begin, could each of you please state your full name?"
+)
 
-    voice_map = {"warm": "Rachel", "neutral": "Adam", "firm": "Domi"}
-    selected_voice = voice_map.get(
-        voice_style.lower() if voice_style else "warm", "Rachel"
-    )
+RESUME_GREETING = (
+    "Apologies for the interruption; the connection was briefly lost. "
+    "Let us continue where we left off."
+)
 
-    return VoicePipelineAgent(
+
+def select_voice(voice_style: str) -> str:
+    """Map a session's voice style to an ElevenLabs voice."""
+    return VOICE_MAP.get(voice_style.lower() if voice_style else "warm", "Rachel")
+
+
+def _build_plugin_clients() -> PluginClients:
+    """Create the VAD, STT, LLM and one TTS client per voice for this process."""
+    elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY", "")
+    return PluginClients(
         vad=silero.VAD.load(),
         stt=deepgram.STT(
-            api_key=deepgram_api_key,
+            api_key=os.getenv("DEEPGRAM_API_KEY", ""),
             model="nova-2",
             language="en-US",
             smart_format=True,
             diarize=True,
         ),
+        llm=GoogleLLM(model="gemini-1.5-flash-latest", api_key=os.getenv("GEMINI_API_KEY", "")),
+        tts={
+            voice: wrap_tts(
+                elevenlabs.TTS(
+                    api_key=elevenlabs_api_key,
+                    voice=voice,
+                    model_id=TTS_MODEL_ID,
+                    encoding=TTS_ENCODING,
+                ),
+                voice=voice,
+                model_id=TTS_MODEL_ID,
+                encoding=TTS_ENCODING,
+            )
+            for voice in set(VOICE_MAP.values())
+        },
+    )
+
+
+def prewarm(proc: JobProcess):
+    """Build the plugin clients in the job process before a job is assigned to it."""
+    prewarm_plugins(proc.userdata, _build_plugin_clients)
+
+
+def build_reply_pipeline(
+    plugins: PluginClients,
+    tools: List[LLMFunction],
+    context_window: Optional[ChatContextWindow] = None,
+    streaming: bool = settings.agent_llm_streaming,
+) -> Tuple[GeminiWithTools, Dict[str, Any]]:
+    """The LLM wrapper and pipeline options that turn a user turn into speech."""
+    gemini_with_tools = GeminiWithTools(
+        wrapped_llm=plugins.llm,
+        tools=tools,
+        context_window=context_window,
+        streaming=streaming,
+    )
+    pipeline_options: Dict[str, Any] = {}
+    if streaming:
+        # Hand each sentence to TTS as soon as it is complete; interruptions drop the rest
+        pipeline_options["before_tts_cb"] = make_before_tts_cb(
+            min_chars=settings.agent_tts_chunk_min_chars,
+            clause_chars=settings.agent_tts_chunk_clause_chars,
+            max_chars=settings.agent_tts_chunk_max_chars,
+        )
+    return gemini_with_tools, pipeline_options
+
+
+def _create_voice_agent(
+    system_prompt: str,
+    voice_style: str,
+    tools: List[LLMFunction],
+    plugins: PluginClients,
+    context_window: Optional[ChatContextWindow] = None,
+    history: Optional[List[llm.ChatMessage]] = None
+) -> VoicePipelineAgent:
+    """Initialize and return a VoicePipelineAgent."""
+    gemini_with_tools, pipeline_options = build_reply_pipeline(plugins, tools, context_window)
+    selected_voice = select_voice(voice_style)
+
+    return VoicePipelineAgent(
+        vad=plugins.vad,
+        stt=plugins.stt,
         llm=gemini_with_tools,
-        tts=elevenlabs.TTS(
-            api_key=elevenlabs_api_key,
-            voice=selected_voice,
-            model_id="eleven_turbo_v2",
-            encoding="mp3_44100_128",
-        ),
+        tts=plugins.tts[selected_voice],
         chat_ctx=llm.ChatContext(
             messages=[
                 llm.ChatMessage(
                     role=llm.ChatRole.SYSTEM,
                     content=system_prompt,
                 )
-            ]
+            ] + (history or [])
         ),
+        **pipeline_options,
     )
 
 
@@ -162,16 +263,67 @@ async def get_session_script(
         return "", "", "", "", ""
 
 
+async def _teardown(
+    ctx: JobContext,
+    session_id: str,
+    transcript_manager: Optional[TranscriptManager],
+    transcript_capture: Optional[TranscriptCapture],
+    checkpointer: Optional[InterviewCheckpointer],
+    completed: bool,
+    session_counted: bool,
+) -> None:
+    """Single end-of-interview pipeline; every step runs even if an earlier one fails."""
+    try:
+        if transcript_capture is not None:
+            await transcript_capture.drain()
+        if transcript_manager is not None:
+            await transcript_manager.close()
+        await transcript_writer.flush()
+    except Exception as e:
+        logger.error(f"Failed to flush transcript queue on shutdown: {e}")
+
+    if checkpointer is not None:
+        # A finished interview has nothing to resume; otherwise keep the latest state for the next job
+        await checkpointer.stop(discard=completed)
+
+    if completed:
+        try:
+            await db.update_session_status(session_id, SessionStatus.COMPLETED)
+        except Exception as e:
+            logger.error(f"Failed to mark session {session_id} completed: {e}")
+        try:
+            transcript_text = await load_transcript_text(session_id)
+            if transcript_text:
+                await recording_manager.upload_transcript(session_id, transcript_text)
+        except Exception as e:
+            logger.error(f"Failed to upload transcript for session {session_id}: {e}")
+
+    if session_counted:
+        ai_agent_connections.dec()
+    mark_job_process_dead()
+    # Hand the job slot back to the worker now rather than when LiveKit notices the room is gone
+    ctx.shutdown(reason="interview_completed" if completed else "agent_stopped")
+
+
 async def entrypoint(ctx: JobContext):
     """Main entry point for the AI agent."""
+    job_started = time.perf_counter()
+    session_id = ctx.room.name
+    transcript_manager = None
+    transcript_capture = None
+    checkpointer = None
+    session_counted = False
+    completed = False
+    lifecycle = SessionLifecycle(empty_room_grace=settings.agent_empty_room_grace)
     try:
         _validate_env_vars()
         logger.info(f"Agent starting for room: {ctx.room.name}")
 
+        # Subscribe before connecting so an early disconnect is not missed
+        lifecycle.attach(ctx.room)
         await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
         logger.info("Agent connected to room")
 
-        session_id = ctx.room.name
         (
             script_content,
             groom_name,
@@ -193,69 +345,149 @@ async def entrypoint(ctx: JobContext):
         # 1. Create TranscriptManager
         transcript_manager = TranscriptManager(session_id)
 
-        # 2. Define the function for the LLM to call
-        async def save_transcript_entry(speaker: str, text: str):
-            """Saves a single entry to the session transcript for legal records."""
-            await transcript_manager.add_entry(speaker, text)
-            return f"Entry for {speaker} saved."
-
-        # 3. Create the tool definition
-        save_tool = LLMFunction(
-            fn=save_transcript_entry,
-            metadata=LLMFunctionTool(
-                description="Save a single utterance from the conversation to the legal transcript.",
-                parameters={
-                    "type": "object",
-                    "properties": {
-                        "speaker": {
-                            "type": "string",
-                            "description": f"The speaker's name or role. Must be one of: '{groom_name}', '{bride_name}', or 'AI Officer'.",
-                        },
-                        "text": {
-                            "type": "string",
-                            "description": "The exact utterance from the speaker.",
+        tool_capture = settings.transcript_capture_mode == "tool"
+        tools: List[LLMFunction] = []
+
+        if tool_capture:
+            # 2. Define the function for the LLM to call
+            async def save_transcript_entry(speaker: str, text: str):
+                """Saves a single entry to the session transcript for legal records."""
+                await transcript_manager.add_entry(speaker, text)
+                return f"Entry for {speaker} saved."
+
+            # 3. Create the tool definition
+            tools.append(LLMFunction(
+                fn=save_transcript_entry,
+                metadata=LLMFunctionTool(
+                    description="Save a single utterance from the conversation to the legal transcript.",
+                    parameters={
+                        "type": "object",
+                        "properties": {
+                            "speaker": {
+                                "type": "string",
+                                "description": f"The speaker's name or role. Must be one of: '{groom_name}', '{bride_name}', or 'AI Officer'.",
+                            },
+                            "text": {
+                                "type": "string",
+                                "description": "The exact utterance from the speaker.",
+                            },
                         },
+                        "required": ["speaker", "text"],
                     },
-                    "required": ["speaker", "text"],
-                },
-            ),
-        )
+                ),
+            ))
         
         system_prompt = _create_system_prompt(
-            script_content, groom_name, bride_name, strictness
+            script_content, groom_name, bride_name, strictness, tool_capture=tool_capture
         )
 
+        make_message = lambda role, content: llm.ChatMessage(role=role, content=content)
+        context_window = ChatContextWindow(
+            script_content,
+            message_factory=make_message,
+            max_tokens=settings.agent_context_max_tokens,
+            min_recent_messages=settings.agent_context_min_recent_messages,
+        )
+        speakers = SpeakerLabelMapper(groom_name, bride_name)
+
+        # Resume an interrupted interview from its checkpoint and stored transcript
+        resume_state, resume_entries = None, []
+        try:
+            resume_state, resume_entries = await asyncio.wait_for(
+                load_for_resume(session_id, checkpoint_store, settings.agent_recovery_transcript_rows),
+                timeout=settings.agent_recovery_timeout,
+            )
+        except Exception as e:
+            logger.error(f"Could not load recovery state for session {session_id}, starting fresh: {e}")
+        if resume_state is not None:
+            if resume_state.context:
+                context_window.restore(**resume_state.context)
+            speakers.restore(resume_state.speakers)
+            # Older turns are already in the checkpointed summary
+            resume_entries = resume_entries[-2 * settings.agent_context_min_recent_messages:]
+        resuming = bool(resume_state and resume_state.greeted) or bool(resume_entries)
+
+        history: List[llm.ChatMessage] = []
+        if resume_entries:
+            history = resume_history(resume_entries, system_prompt, context_window, make_message)
+            logger.info(f"Resuming session {session_id} from {len(resume_entries)} stored entries")
+
         agent = _create_voice_agent(
-            system_prompt, voice_style, tools=[save_tool]
+            system_prompt,
+            voice_style,
+            tools=tools,
+            plugins=prewarmed_plugins(ctx.proc.userdata, _build_plugin_clients),
+            context_window=context_window,
+            history=history,
         )
+        TurnLatencyRecorder(voice_style).attach(agent)
+        agent.once(
+            "agent_started_speaking",
+            lambda: (agent_recovery_seconds if resuming else agent_time_to_first_greeting).observe(
+                time.perf_counter() - job_started
+            )
+        )
+
+        if not tool_capture:
+            # 2. Capture committed speech straight from the pipeline events
+            transcript_capture = TranscriptCapture(transcript_manager, speakers)
+            transcript_capture.attach(agent)
+
+        checkpointer = InterviewCheckpointer(
+            session_id, checkpoint_store, context_window, speakers,
+            interval=settings.agent_checkpoint_interval, greeted=resuming,
+        )
+        checkpointer.attach(agent)
 
         agent.start(ctx.room)
+        checkpointer.start()
+        ai_agent_connections.inc()
+        session_counted = True
         logger.info("✅ AI Agent is now active in the room for all participants")
 
-        # Initial greeting is also a transcript entry
-        initial_greeting = (
-            "Good day. I am the LexNova automated verification officer. "
-            "This session is being recorded for legal purposes. "
-            "To begin, could each of you please state your full name?"
-        )
-        await agent.say(initial_greeting, allow_interruptions=False)
+        # Greetings are said on their own so they match the TTS phrase cache exactly
+        if resuming:
+            openings = [RESUME_GREETING]
+            if context_window.next_question:
+                openings.append(context_window.next_question)
+        else:
+            # Initial greeting is also a transcript entry
+            openings = [INITIAL_GREETING]
+        for opening in openings:
+            await agent.say(opening, allow_interruptions=False)
+        checkpointer.mark_greeted()
         
-        # Manually save the agent's first utterance
-        await transcript_manager.add_entry("AI Officer", initial_greeting)
+        if tool_capture:
+            # Manually save the agent's first utterances (event capture records them itself)
+            for opening in openings:
+                await transcript_manager.add_entry(AGENT_SPEAKER, opening)
 
-        while ctx.room.connection_state == "connected":
-            await asyncio.sleep(1)
+        reason = await lifecycle.wait()
+        # Losing the room interrupts the interview; the checkpoint stays for the next job
+        completed = lifecycle.completed
+        logger.info(f"Session {session_id} {'finished' if completed else 'interrupted'} ({reason})")
 
     except Exception as e:
         logger.error(f"Agent runtime error: {e}", exc_info=True)
     finally:
+        await _teardown(
+            ctx, session_id, transcript_manager, transcript_capture, checkpointer,
+            completed=completed, session_counted=session_counted,
+        )
         logger.info("Agent shutting down.")
 
 
 if __name__ == "__main__":
+    start_agent_metrics_server()
+    agent_session_capacity.set(settings.agent_max_sessions)
+    load_calculator = LoadCalculator()
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
+            request_fnc=load_calculator.request_fnc,
+            load_fnc=load_calculator.load,
+            load_threshold=settings.agent_load_threshold,
             api_key=os.getenv("LIVEKIT_API_KEY", ""),
             api_secret=os.getenv("LIVEKIT_API_SECRET", ""),
             ws_url=os.getenv("LIVEKIT_URL", "ws://localhost:7880"),
@@ -0,0 +1,98 @@
+"""
+Metrics wiring for the agent worker
+
+LiveKit runs every job in its own process, so the worker uses
+prometheus_client's multiprocess mode when PROMETHEUS_MULTIPROC_DIR is set:
+job processes write their samples to that directory and the main worker
+process serves the aggregate on `settings.agent_metrics_port`.
+
+The directory must be emptied before the worker starts (samples from a
+previous run would be merged into the new totals), and before anything
+imports `backend.metrics`: prometheus_client opens its sample files when
+a metric is created, so clearing the directory later would unlink the
+main process's own files. Dockerfile.worker clears it before exec'ing
+the worker.
+"""
+import logging
+import os
+from typing import Any, Dict
+
+from prometheus_client import CollectorRegistry, start_http_server
+
+from .config import settings
+from .metrics import (agent_end_of_utterance_delay, agent_llm_ttft, agent_stt_final_latency,
+                      agent_tts_ttfb, agent_turn_latency)
+
+logger = logging.getLogger(__name__)
+
+# Pending per-turn parts are dropped after this many turns without all three
+_MAX_PENDING_TURNS = 32
+
+
+def start_agent_metrics_server(port: int = settings.agent_metrics_port) -> None:
+    """Serve worker metrics, aggregating job processes in multiprocess mode."""
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not multiproc_dir:
+        start_http_server(port)
+        logger.info(f"Agent metrics on :{port}")
+        return
+
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, registry=registry)
+    logger.info(f"Agent metrics on :{port} (multiprocess: {multiproc_dir})")
+
+
+def mark_job_process_dead() -> None:
+    """Drop live gauges of the current job process from the multiprocess aggregate."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class TurnLatencyRecorder:
+    """
+    Turns the pipeline's `metrics_collected` events into latency histograms.
+
+    End-of-utterance, LLM and TTS metrics of the same turn share a sequence
+    id; once all three have arrived their sum is recorded as the turn latency.
+    """
+
+    def __init__(self, voice_style: str):
+        self._voice_style = voice_style or "warm"
+        self._turns: Dict[str, Dict[str, float]] = {}
+
+    def attach(self, agent: Any) -> None:
+        agent.on("metrics_collected", self.record)
+
+    def record(self, metrics: Any) -> None:
+        labels = {"voice_style": self._voice_style}
+        sequence_id = getattr(metrics, "sequence_id", None) or getattr(metrics, "speech_id", None)
+
+        if hasattr(metrics, "end_of_utterance_delay"):
+            agent_end_of_utterance_delay.labels(**labels).observe(metrics.end_of_utterance_delay)
+            transcription_delay = getattr(metrics, "transcription_delay", None)
+            if transcription_delay is not None:
+                agent_stt_final_latency.labels(**labels).observe(transcription_delay)
+            self._add_part(sequence_id, "eou", metrics.end_of_utterance_delay)
+        elif hasattr(metrics, "ttft"):
+            if metrics.ttft >= 0:
+                agent_llm_ttft.labels(**labels).observe(metrics.ttft)
+                self._add_part(sequence_id, "llm", metrics.ttft)
+        elif hasattr(metrics, "ttfb"):
+            if metrics.ttfb >= 0:
+                agent_tts_ttfb.labels(**labels).observe(metrics.ttfb)
+                self._add_part(sequence_id, "tts", metrics.ttfb)
+
+    def _add_part(self, sequence_id: Any, part: str, value: float) -> None:
+        if sequence_id is None:
+            return
+        turn = self._turns.setdefault(str(sequence_id), {})
+        turn[part] = value
+        if len(turn) == 3:
+            agent_turn_latency.labels(voice_style=self._voice_style).observe(sum(turn.values()))
+            del self._turns[str(sequence_id)]
+        while len(self._turns) > _MAX_PENDING_TURNS:
+            self._turns.pop(next(iter(self._turns)))
@@ -0,0 +1,58 @@
+"""
+STT, LLM, TTS and VAD clients for the agent worker, built in prewarm
+
+LiveKit runs every job in its own process and calls the worker's
+`prewarm_fnc` in that process before a job is assigned to it. Building
+the plugin clients there (loading the Silero model, creating the HTTP
+sessions of the Deepgram, Gemini and ElevenLabs clients) keeps all of
+that off the path from job assignment to the first greeting; the job
+only picks the instances up from `JobProcess.userdata`.
+
+A process that was not prewarmed (or whose prewarm failed, e.g. on a
+missing API key) builds the clients when its job starts instead.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, MutableMapping, Optional
+
+logger = logging.getLogger(__name__)
+
+USERDATA_KEY = "plugins"
+
+
+@dataclass
+class PluginClients:
+    vad: Any
+    stt: Any
+    llm: Any
+    tts: Dict[str, Any]  # one client per ElevenLabs voice
+
+
+def prewarm_plugins(
+    userdata: MutableMapping[str, Any],
+    build: Callable[[], PluginClients],
+) -> Optional[PluginClients]:
+    """Build the clients and store them in the process userdata; None if building failed."""
+    started = time.perf_counter()
+    try:
+        clients = build()
+    except Exception as e:
+        logger.error(f"Failed to prewarm agent plugins: {e}")
+        return None
+    userdata[USERDATA_KEY] = clients
+    logger.info(f"Prewarmed agent plugins in {time.perf_counter() - started:.2f}s")
+    return clients
+
+
+def prewarmed_plugins(
+    userdata: MutableMapping[str, Any],
+    build: Callable[[], PluginClients],
+) -> PluginClients:
+    """The clients built by prewarm, building them now if prewarm did not."""
+    clients = userdata.get(USERDATA_KEY)
+    if clients is None:
+        logger.warning("Agent plugins were not prewarmed; building them on the job path")
+        clients = build()
+        userdata[USERDATA_KEY] = clients
+    return clients
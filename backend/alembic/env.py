@@ -2,9 +2,9 @@ from logging.config import fileConfig
 import sys
 import os
 
-# Add parent directory to path to import modules
+# Add the repository root to path to import the backend package
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(parent_dir))
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -12,8 +12,8 @@ from sqlalchemy import pool
 from alembic import context
 
 # Import models and config
-from models import Base
-from config import settings
+from backend.models import Base
+from backend.config import settings
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
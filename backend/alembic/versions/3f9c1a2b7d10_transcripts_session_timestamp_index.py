@@ -0,0 +1,40 @@
+"""Index transcripts by (session_id, timestamp, id)
+
+Revision ID: 3f9c1a2b7d10
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a2b7d10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps transcript inserts flowing while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transcripts_session_id_timestamp_id',
+            'transcripts',
+            ['session_id', 'timestamp', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_transcripts_session_id_timestamp_id',
+            table_name='transcripts',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
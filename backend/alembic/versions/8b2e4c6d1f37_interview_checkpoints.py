@@ -0,0 +1,34 @@
+"""Add interview_checkpoints for agent crash recovery
+
+Revision ID: 8b2e4c6d1f37
+Revises: 3f9c1a2b7d10
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4c6d1f37'
+down_revision: Union[str, None] = '3f9c1a2b7d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db's create_all may already have created it on fresh databases
+    if sa.inspect(op.get_bind()).has_table('interview_checkpoints'):
+        return
+    op.create_table(
+        'interview_checkpoints',
+        sa.Column('session_id', sa.String(), sa.ForeignKey('sessions.id'), primary_key=True),
+        sa.Column('state', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('interview_checkpoints')
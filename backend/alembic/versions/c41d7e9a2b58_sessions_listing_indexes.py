@@ -0,0 +1,48 @@
+"""Index sessions for keyset-paginated, filtered listing
+
+Revision ID: c41d7e9a2b58
+Revises: 8b2e4c6d1f37
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a2b58'
+down_revision: Union[str, None] = '8b2e4c6d1f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_sessions_created_at_id', ['created_at', 'id']),
+    ('ix_sessions_lawyer_id_created_at_id', ['lawyer_id', 'created_at', 'id']),
+    ('ix_sessions_status_created_at_id', ['status', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps session writes flowing while the indexes build
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                'sessions',
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name='sessions',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
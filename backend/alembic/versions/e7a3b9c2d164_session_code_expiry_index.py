@@ -0,0 +1,41 @@
+"""Index session code expiry for the expiry sweeper
+
+Revision ID: e7a3b9c2d164
+Revises: c41d7e9a2b58
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3b9c2d164'
+down_revision: Union[str, None] = 'c41d7e9a2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Partial: sessions whose code has been released are never swept again
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sessions_session_code_expires',
+            'sessions',
+            ['session_code_expires'],
+            postgresql_where=sa.text('session_code IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sessions_session_code_expires',
+            table_name='sessions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,85 @@
+"""Store transcript ids as native UUIDs
+
+New transcript ids are UUIDv7 (time-ordered, see backend.utils.ids), so
+inserts append to the primary key index instead of landing on random
+pages, and the key shrinks from a 36-character string to 16 bytes.
+Existing uuid4 ids convert as they are; any id that is not a UUID is
+first backfilled with a UUIDv7 built from the row's timestamp.
+
+The type change rewrites the table under an ACCESS EXCLUSIVE lock; run
+it in a maintenance window on large databases. Run it before rolling out
+the code that maps `Transcript.id` as `Uuid`: that code binds ids as uuid,
+which a varchar column rejects. Databases whose tables were created by
+`create_all` from the new model already have a uuid column and are left
+as they are.
+
+Revision ID: f3c8d2a6e915
+Revises: e7a3b9c2d164
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from backend.utils.ids import new_id
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8d2a6e915'
+down_revision: Union[str, None] = 'e7a3b9c2d164'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_PATTERN = '^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$'
+BACKFILL_BATCH = 5000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite keeps UUIDs as CHAR(32) and its tables come from create_all
+        return
+    columns = {column['name']: column for column in sa.inspect(bind).get_columns('transcripts')}
+    if isinstance(columns['id']['type'], sa.Uuid):
+        return
+
+    while True:
+        rows = bind.execute(
+            sa.text('SELECT id, timestamp FROM transcripts WHERE id !~ :pattern LIMIT :limit'),
+            {'pattern': UUID_PATTERN, 'limit': BACKFILL_BATCH},
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text('UPDATE transcripts SET id = :new_id WHERE id = :old_id'),
+            [{'new_id': new_id(row.timestamp), 'old_id': row.id} for row in rows],
+        )
+
+    op.alter_column(
+        'transcripts',
+        'id',
+        type_=postgresql.UUID(as_uuid=False),
+        existing_type=sa.String(),
+        existing_nullable=False,
+        postgresql_using='id::uuid',
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    columns = {column['name']: column for column in sa.inspect(bind).get_columns('transcripts')}
+    if not isinstance(columns['id']['type'], sa.Uuid):
+        return
+    op.alter_column(
+        'transcripts',
+        'id',
+        type_=sa.String(),
+        existing_type=postgresql.UUID(as_uuid=False),
+        existing_nullable=False,
+        postgresql_using='id::text',
+    )
@@ -0,0 +1,276 @@
+"""
+Offline load simulator for the agent worker
+
+Runs N concurrent simulated interviews in one process against the stubbed
+Deepgram/Gemini/ElevenLabs backends from `stubs.py`. Each session gets
+fake `PluginClients` the way a job gets its prewarmed ones and replies
+through the agent's own reply path (`agent.build_reply_pipeline`: the
+LLM wrapper trimming the chat context, then the streamed reply chunked
+into sentences for TTS), with the same transcript capture as
+`agent.entrypoint`. Only the room transport is left out: a synthetic
+participant streams 20 ms PCM frames in real time through an
+energy-based VAD. No network access or API keys are needed.
+
+For every concurrency level it reports per-turn latency percentiles
+(end of speech until first agent audio), event-loop lag, CPU use and RSS.
+
+Run with:
+    python -m backend.benchmarks.agent_load --sessions 1 10 25 50 --turns 8 --json load.json
+"""
+import argparse
+import array
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from livekit.agents import llm
+
+from ..agent import _create_system_prompt, build_reply_pipeline, select_voice
+from ..agent_plugins import PluginClients, prewarm_plugins, prewarmed_plugins
+from ..chat_context import ChatContextWindow
+from ..transcript import TranscriptManager
+from ..transcript_capture import SpeakerLabelMapper, TranscriptCapture
+from .stubs import FakeChatLLM, FakeLLM, FakeSTT, FakeTTS, Latency, StubTranscriptWriter, make_rng
+
+FRAME_MS = 20
+SAMPLE_RATE = 48000
+SAMPLES_PER_FRAME = SAMPLE_RATE * FRAME_MS // 1000
+SILENCE_FRAMES_FOR_EOU = 25  # 500 ms of silence ends an utterance
+
+SCRIPT = "\n".join(f"Question {i + 1}: Please confirm detail number {i + 1} for the record?" for i in range(20))
+ANSWERS = ["Yes, that is correct.", "We met in 2018 at university.", "I confirm it freely and willingly."]
+REPLY = "Thank you for confirming. For the record, please answer the next question clearly."
+VOICE_STYLE = "warm"
+
+
+class FakeAgent:
+    """Minimal event emitter standing in for VoicePipelineAgent."""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[..., Any]]] = {}
+
+    def on(self, event: str, handler: Callable[..., Any]) -> None:
+        self._handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event: str, *args: Any) -> None:
+        for handler in self._handlers.get(event, []):
+            handler(*args)
+
+
+@dataclass
+class Results:
+    turn_latencies: List[float] = field(default_factory=list)
+    loop_lag: List[float] = field(default_factory=list)
+
+
+def _speech_frame(rng: random.Random, amplitude: int) -> bytes:
+    samples = array.array("h", (int(amplitude * math.sin(i / 7.0)) + rng.randint(-50, 50) for i in range(SAMPLES_PER_FRAME)))
+    return samples.tobytes()
+
+
+def _frame_energy(frame: bytes) -> float:
+    samples = array.array("h")
+    samples.frombytes(frame)
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class SyntheticParticipant:
+    """Streams speech then silence frames in real time; reports when the VAD detects end of speech."""
+
+    def __init__(self, rng: random.Random):
+        self._speech = [_speech_frame(rng, 6000) for _ in range(8)]
+        self._silence = [_speech_frame(rng, 0) for _ in range(2)]
+
+    async def speak(self, seconds: float) -> float:
+        """Return the monotonic time at which end of speech was detected."""
+        silent_frames = 0
+        frames = int(seconds * 1000 / FRAME_MS)
+        for i in range(frames + SILENCE_FRAMES_FOR_EOU):
+            frame = self._speech[i % len(self._speech)] if i < frames else self._silence[i % len(self._silence)]
+            if _frame_energy(frame) < 500:
+                silent_frames += 1
+                if silent_frames >= SILENCE_FRAMES_FOR_EOU:
+                    break
+            else:
+                silent_frames = 0
+            await asyncio.sleep(FRAME_MS / 1000)
+        return time.perf_counter()
+
+
+def _fake_plugin_clients(args: argparse.Namespace, rng: random.Random) -> PluginClients:
+    fake_llm = FakeLLM(Latency(args.llm_ttft_ms, args.llm_ttft_ms * 0.25, 80), per_token_ms=args.llm_token_ms, rng=rng)
+    return PluginClients(
+        vad=None,  # the synthetic participant detects its own end of speech
+        stt=FakeSTT(Latency(args.stt_ms, args.stt_ms * 0.25, 50), rng),
+        llm=FakeChatLLM(fake_llm, REPLY),
+        tts={select_voice(VOICE_STYLE): FakeTTS(Latency(args.tts_ttfb_ms, args.tts_ttfb_ms * 0.25, 50), rng)},
+    )
+
+
+async def _text_deltas(stream: Any) -> AsyncIterator[str]:
+    """Text of a streamed completion, as the pipeline hands it to `before_tts_cb`."""
+    async for chunk in stream:
+        content = chunk.choices[0].delta.content if chunk.choices else None
+        if content:
+            yield content
+
+
+async def _reply_chunks(gemini: Any, before_tts_cb: Any, agent: FakeAgent, chat_ctx: llm.ChatContext) -> AsyncIterator[str]:
+    """The pieces of text the pipeline hands to TTS for one reply."""
+    completion = await gemini.chat(history=chat_ctx)
+    if before_tts_cb is None:
+        # Without streaming the whole completion is synthesized at once
+        yield completion.choices[0].message.content
+        return
+    async for chunk in before_tts_cb(agent, _text_deltas(completion)):
+        yield chunk
+
+
+async def _run_session(index: int, args: argparse.Namespace, writer: StubTranscriptWriter, results: Results) -> None:
+    rng = make_rng(args.seed + index)
+    # Each job process prewarms its own clients; a fresh userdata stands in for it
+    userdata: Dict[str, Any] = {}
+    build = lambda: _fake_plugin_clients(args, rng)
+    prewarm_plugins(userdata, build)
+    plugins = prewarmed_plugins(userdata, build)
+    tts = plugins.tts[select_voice(VOICE_STYLE)]
+
+    # Same per-session wiring as agent.entrypoint
+    agent = FakeAgent()
+    manager = TranscriptManager(f"load-{index}", writer=writer)
+    capture = TranscriptCapture(manager, SpeakerLabelMapper("John Doe", "Jane Smith"))
+    capture.attach(agent)
+    make_message = lambda role, content: llm.ChatMessage(role=role, content=content)
+    window = ChatContextWindow(SCRIPT, message_factory=make_message, max_tokens=args.context_tokens)
+    gemini, pipeline_options = build_reply_pipeline(
+        plugins, tools=[], context_window=window, streaming=not args.no_streaming
+    )
+    before_tts_cb = pipeline_options.get("before_tts_cb")
+    system_prompt = _create_system_prompt(SCRIPT, "John Doe", "Jane Smith", "standard", tool_capture=False)
+    chat_ctx = llm.ChatContext(messages=[make_message("system", system_prompt)])
+    participant = SyntheticParticipant(rng)
+
+    # Stagger session starts like real room joins
+    await asyncio.sleep(rng.random() * 2)
+    for turn in range(args.turns):
+        answer = ANSWERS[turn % len(ANSWERS)]
+        end_of_speech = await participant.speak(args.speech_seconds)
+
+        text = await plugins.stt.final_transcript(f"Speaker {turn % 2}: {answer}")
+        user_message = make_message("user", text)
+        agent.emit("user_speech_committed", user_message)
+        chat_ctx.messages.append(user_message)
+
+        spoken: List[str] = []
+        async for chunk in _reply_chunks(gemini, before_tts_cb, agent, chat_ctx):
+            first_audio = not spoken
+            spoken.append(chunk)
+            async for _ in tts.synthesize(chunk):
+                if first_audio:
+                    results.turn_latencies.append(time.perf_counter() - end_of_speech)
+                    first_audio = False
+        reply_message = make_message("assistant", " ".join(spoken))
+        chat_ctx.messages.append(reply_message)
+        agent.emit("agent_speech_committed", reply_message)
+
+    await capture.drain()
+
+
+async def _measure_loop_lag(results: Results, stop: asyncio.Event, interval: float = 0.05) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        results.loop_lag.append(max(0.0, time.perf_counter() - started - interval))
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)]
+
+
+async def run_level(sessions: int, args: argparse.Namespace) -> Dict[str, float]:
+    results = Results()
+    writer = StubTranscriptWriter(Latency(args.db_ms, args.db_ms * 0.25), make_rng(args.seed), flush_interval=0.2)
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(results, stop))
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(_run_session(i, args, writer, results) for i in range(sessions)))
+    wall = time.perf_counter() - wall_started
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    stop.set()
+    await lag_task
+    await writer.close()
+
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    latencies_ms = [v * 1000 for v in results.turn_latencies]
+    return {
+        "sessions": sessions,
+        "turns": len(latencies_ms),
+        "p50_ms": statistics.median(latencies_ms),
+        "p95_ms": _percentile(latencies_ms, 95),
+        "p99_ms": _percentile(latencies_ms, 99),
+        "loop_lag_p99_ms": _percentile(results.loop_lag, 99) * 1000,
+        "cpu_pct": 100 * cpu / wall,
+        "rss_mb": _rss_mb(),
+        "rows_written": writer.rows_written,
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, float]]:
+    report = []
+    print(f"{'sessions':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'lag p99':>8} {'cpu %':>7} {'rss MB':>8}")
+    for sessions in args.sessions:
+        row = await run_level(sessions, args)
+        report.append(row)
+        print(
+            f"{row['sessions']:>8} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{row['loop_lag_p99_ms']:>8.1f} {row['cpu_pct']:>7.1f} {row['rss_mb']:>8.1f}"
+        )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--speech-seconds", type=float, default=1.5)
+    parser.add_argument("--stt-ms", type=float, default=250)
+    parser.add_argument("--llm-ttft-ms", type=float, default=350)
+    parser.add_argument("--llm-token-ms", type=float, default=8)
+    parser.add_argument("--tts-ttfb-ms", type=float, default=220)
+    parser.add_argument("--db-ms", type=float, default=4)
+    parser.add_argument("--context-tokens", type=int, default=6000)
+    parser.add_argument("--no-streaming", action="store_true", help="Synthesize whole replies instead of sentence chunks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Report latency versus transcripts table size
+
+Grows the `transcripts` table in steps (spread over many sessions) and
+times paginated and full report reads for one session of fixed length at
+each step. With the (session_id, timestamp, id) index the numbers should
+stay flat as the table grows.
+
+Run with:
+    python -m backend.benchmarks.report_latency --db sqlite+aiosqlite:///bench.db --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..models import Base, Session as SessionModel, SessionStatus, Transcript as TranscriptModel
+from ..routers.reports import _transcript_page
+
+PROBE_SESSION = "probe"
+PROBE_ROWS = 2000
+FILLER_ROWS_PER_SESSION = 500
+INSERT_BATCH = 5000
+
+
+async def _insert_filler(factory, count: int, offset: int) -> None:
+    start = datetime.utcnow()
+    async with factory() as db:
+        batch = []
+        for i in range(offset, offset + count):
+            batch.append({
+                "id": str(uuid.uuid4()),
+                "session_id": f"filler-{i // FILLER_ROWS_PER_SESSION}",
+                "speaker": "AI Officer",
+                "text": "Filler utterance for benchmark purposes.",
+                "timestamp": start + timedelta(milliseconds=i),
+            })
+            if len(batch) >= INSERT_BATCH:
+                await db.execute(insert(TranscriptModel), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(TranscriptModel), batch)
+        await db.commit()
+
+
+async def _seed_probe(factory) -> None:
+    start = datetime.utcnow()
+    async with factory() as db:
+        db.add(SessionModel(
+            id=PROBE_SESSION, groom_name="John", bride_name="Jane",
+            date="2024-12-15", status=SessionStatus.COMPLETED
+        ))
+        await db.execute(insert(TranscriptModel), [
+            {
+                "id": str(uuid.uuid4()),
+                "session_id": PROBE_SESSION,
+                "speaker": "Groom" if i % 2 else "AI Officer",
+                "text": f"Probe utterance {i}",
+                "timestamp": start + timedelta(seconds=i),
+            }
+            for i in range(PROBE_ROWS)
+        ])
+        await db.commit()
+
+
+async def _time(factory, limit, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        async with factory() as db:
+            started = time.perf_counter()
+            await _transcript_page(db, PROBE_SESSION, None, limit)
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def run(db_url: str, sizes, repeats: int) -> None:
+    engine = create_async_engine(db_url, echo=False)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await _seed_probe(factory)
+
+    print(f"{'table rows':>12} {'page(100) ms':>14} {'full(' + str(PROBE_ROWS) + ') ms':>16}")
+    current = 0
+    for size in sorted(sizes):
+        await _insert_filler(factory, size - current, current)
+        current = size
+        page_ms = await _time(factory, 100, repeats)
+        full_ms = await _time(factory, None, repeats)
+        print(f"{size:>12} {page_ms:>14.2f} {full_ms:>16.2f}")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="sqlite+aiosqlite:///report_bench.db", help="Database URL (tables are recreated)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.db, args.sizes, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Session code allocation under a filling code space
+
+The real space (36^6 codes) never fills in practice, so this load test
+shrinks it to `--space` codes and pre-fills it to each `--fill` ratio
+(part of the pre-filled codes already expired) before creating sessions
+concurrently through `Database.create_session`. It reports create
+latency, allocation failures, the live-code share afterwards and any
+duplicated codes (there should be none).
+
+Run with:
+    python -m backend.benchmarks.session_code_allocation --space 5000 --fill 0.5 0.9 0.99 --creates 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .. import database
+from ..config import settings
+from ..models import Base, Session as SessionModel, SessionStatus
+from ..schemas import SessionCreate
+
+
+async def _prefill(factory, codes, expired_share: float, rng: random.Random) -> None:
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": f"fill-{i}", "groom_name": "John", "bride_name": "Jane", "date": "2024-12-15",
+            "status": SessionStatus.PENDING, "session_code": code, "created_at": now,
+            "session_code_expires": now - timedelta(hours=1) if rng.random() < expired_share
+            else now + timedelta(hours=24),
+        }
+        for i, code in enumerate(codes)
+    ]
+    async with factory() as db:
+        await db.execute(insert(SessionModel), rows)
+        await db.commit()
+
+
+async def run_level(db_url: str, space: int, fill: float, creates: int, concurrency: int,
+                    expired_share: float, seed: int) -> None:
+    rng = random.Random(seed)
+    engine = create_async_engine(db_url, echo=False)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    universe = [f"{i:06d}" for i in range(space)]
+    await _prefill(factory, rng.sample(universe, int(space * fill)), expired_share, rng)
+
+    # Same allocation path, drawing from the reduced space
+    database.AsyncSessionLocal = factory
+    database.generate_session_code = lambda: rng.choice(universe)
+
+    payload = SessionCreate(groomName="John", brideName="Jane", date="2024-12-15")
+    latencies, failures = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await database.db.create_session(payload)
+            except database.SessionCodeAllocationError:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(create() for _ in range(creates)))
+
+    async with factory() as db:
+        live = await db.scalar(
+            select(func.count()).select_from(SessionModel)
+            .where(SessionModel.session_code_expires > datetime.utcnow())
+        )
+        duplicates = await db.scalar(
+            select(func.count()).select_from(
+                select(SessionModel.session_code).where(SessionModel.session_code.isnot(None))
+                .group_by(SessionModel.session_code).having(func.count() > 1).subquery()
+            )
+        )
+    await engine.dispose()
+
+    ordered = sorted(latencies) or [0.0]
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{fill:>6.2f} {statistics.median(ordered) * 1000:>9.2f} {p95 * 1000:>9.2f} "
+        f"{failures:>9} {live / space:>10.2f} {duplicates:>6}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"code space {args.space}, {args.creates} creates, max {settings.session_code_max_attempts} attempts")
+    print(f"{'fill':>6} {'p50 ms':>9} {'p95 ms':>9} {'failures':>9} {'live after':>10} {'dups':>6}")
+    for fill in args.fill:
+        await run_level(args.db, args.space, fill, args.creates, args.concurrency, args.expired, args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="sqlite+aiosqlite:///code_bench.db", help="Database URL (tables are recreated)")
+    parser.add_argument("--space", type=int, default=5000)
+    parser.add_argument("--fill", type=float, nargs="+", default=[0.5, 0.8, 0.9, 0.95, 0.99])
+    parser.add_argument("--expired", type=float, default=0.3, help="Share of pre-filled codes already expired")
+    parser.add_argument("--creates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
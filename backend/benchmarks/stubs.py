@@ -0,0 +1,141 @@
+"""
+In-process stand-ins for Deepgram, Gemini and ElevenLabs
+
+Each stub only sleeps according to a latency model and returns canned
+output, so benchmarks run offline and deterministically (seeded).
+"""
+import asyncio
+import random
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, List, Optional
+
+from ..chat_context import estimate_tokens, message_text
+from ..transcript import TranscriptWriter
+
+
+@dataclass
+class Latency:
+    """Normally distributed latency in milliseconds, clipped at `floor_ms`."""
+    mean_ms: float
+    jitter_ms: float = 0.0
+    floor_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        value = rng.gauss(self.mean_ms, self.jitter_ms) if self.jitter_ms else self.mean_ms
+        return max(value, self.floor_ms) / 1000
+
+
+class FakeSTT:
+    """Returns the spoken text after an end-of-speech to final-transcript delay."""
+
+    def __init__(self, final_latency: Latency, rng: random.Random):
+        self._latency = final_latency
+        self._rng = rng
+
+    async def final_transcript(self, spoken: str) -> str:
+        await asyncio.sleep(self._latency.sample(self._rng))
+        return spoken
+
+
+class FakeLLM:
+    """Streams a canned reply with a time-to-first-token and a per-token delay."""
+
+    def __init__(self, ttft: Latency, per_token_ms: float, rng: random.Random):
+        self._ttft = ttft
+        self._per_token = per_token_ms / 1000
+        self._rng = rng
+        self.output_tokens = 0
+        self.prompt_tokens = 0
+
+    async def stream(self, reply: str, prompt_tokens: int = 0) -> AsyncIterator[str]:
+        self.prompt_tokens += prompt_tokens
+        await asyncio.sleep(self._ttft.sample(self._rng))
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            self.output_tokens += estimate_tokens(word)
+            if i:
+                await asyncio.sleep(self._per_token * estimate_tokens(word))
+            yield word if i == 0 else " " + word
+
+    async def complete(self, reply: str, prompt_tokens: int = 0) -> str:
+        return "".join([delta async for delta in self.stream(reply, prompt_tokens)])
+
+
+class FakeChatLLM:
+    """`FakeLLM` behind the LLM plugin interface: `chat(history=...)` answers with a canned reply."""
+
+    def __init__(self, llm: FakeLLM, reply: str):
+        self._llm = llm
+        self._reply = reply
+
+    def chat(self, history: Any, tools: Any = None, **kwargs) -> "FakeChatStream":
+        prompt_tokens = sum(estimate_tokens(message_text(m)) for m in history.messages)
+        return FakeChatStream(self._llm.stream(self._reply, prompt_tokens))
+
+
+class FakeChatStream:
+    """
+    Streamed chat completion shaped like the plugins' LLM stream.
+
+    Iterating yields chunks with the text delta in `choices[0].delta.content`;
+    awaiting it instead returns the whole completion.
+    """
+
+    def __init__(self, deltas: AsyncIterator[str]):
+        self._deltas = deltas
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._chunks()
+
+    def __await__(self):
+        return self._complete().__await__()
+
+    async def aclose(self) -> None:
+        await self._deltas.aclose()
+
+    async def _chunks(self) -> AsyncIterator[Any]:
+        async for delta in self._deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+    async def _complete(self) -> Any:
+        text = "".join([delta async for delta in self._deltas])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class FakeTTS:
+    """Produces silent 20 ms PCM frames after a time-to-first-byte delay."""
+
+    FRAME = b"\x00" * 1920  # 20 ms of 48 kHz mono 16-bit audio
+
+    def __init__(self, ttfb: Latency, rng: random.Random, ms_per_char: float = 0.2):
+        self._ttfb = ttfb
+        self._rng = rng
+        self._ms_per_char = ms_per_char
+        self.characters = 0
+
+    async def synthesize(self, text: str) -> AsyncIterator[bytes]:
+        self.characters += len(text)
+        await asyncio.sleep(self._ttfb.sample(self._rng))
+        frames = max(1, len(text) // 15)
+        for _ in range(frames):
+            yield self.FRAME
+            await asyncio.sleep(self._ms_per_char * 15 / 1000)
+
+
+class StubTranscriptWriter(TranscriptWriter):
+    """Write-behind queue whose database writes only sleep."""
+
+    def __init__(self, write_latency: Latency, rng: random.Random, **kwargs):
+        super().__init__(**kwargs)
+        self._write_latency = write_latency
+        self._rng = rng
+        self.rows_written = 0
+
+    async def _write_batch(self, batch: List[dict]) -> None:
+        await asyncio.sleep(self._write_latency.sample(self._rng))
+        self.rows_written += len(batch)
+
+
+def make_rng(seed: Optional[int]) -> random.Random:
+    return random.Random(seed)
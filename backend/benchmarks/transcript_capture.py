@@ -0,0 +1,96 @@
+"""
+Turn latency: LLM tool-call transcript capture versus pipeline events
+
+Replays a scripted interview against stubbed STT/LLM/TTS and compares
+time-to-first-audio per turn and LLM output tokens for the two capture
+modes in `settings.transcript_capture_mode`.
+
+Run with:
+    python -m backend.benchmarks.transcript_capture --turns 40 --seed 1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from ..chat_context import estimate_tokens
+from ..transcript import TranscriptManager
+from ..transcript_capture import AGENT_SPEAKER
+from .stubs import FakeLLM, FakeSTT, FakeTTS, Latency, StubTranscriptWriter, make_rng
+
+ANSWERS = [
+    "My name is John Doe.",
+    "My name is Jane Smith.",
+    "We met at university about six years ago.",
+    "Yes, I enter this marriage freely and of my own will.",
+    "We live together in Springfield.",
+]
+REPLY = "Thank you. For the record, could you please confirm the date you first met?"
+
+
+def _tool_call_json(speaker: str, text: str) -> str:
+    return f'{{"name": "save_transcript_entry", "args": {{"speaker": "{speaker}", "text": "{text}"}}}}'
+
+
+async def _run_mode(mode: str, turns: int, seed: int) -> Dict[str, float]:
+    rng = make_rng(seed)
+    stt = FakeSTT(Latency(250, 60, 80), rng)
+    llm = FakeLLM(Latency(350, 80, 120), per_token_ms=8, rng=rng)
+    tts = FakeTTS(Latency(220, 50, 80), rng)
+    writer = StubTranscriptWriter(Latency(4, 1), rng, flush_interval=0.2)
+    manager = TranscriptManager("bench", writer=writer)
+
+    first_audio: List[float] = []
+    for turn in range(turns):
+        answer = ANSWERS[turn % len(ANSWERS)]
+        started = time.perf_counter()
+        text = await stt.final_transcript(answer)
+
+        if mode == "tool":
+            # The model first emits the tool call, the tool runs, then the model is asked again
+            await llm.complete(_tool_call_json("Groom", text))
+            await manager.add_entry("Groom", text)
+            reply_stream = llm.stream(REPLY)
+        else:
+            await manager.add_entry("Groom", text)
+            reply_stream = llm.stream(REPLY)
+
+        reply = "".join([delta async for delta in reply_stream])
+        async for _ in tts.synthesize(reply):
+            first_audio.append(time.perf_counter() - started)
+            break
+
+        if mode == "tool":
+            # The agent's own utterance costs another tool call after it speaks
+            await llm.complete(_tool_call_json(AGENT_SPEAKER, reply))
+        await manager.add_entry(AGENT_SPEAKER, reply)
+
+    await writer.close()
+    ordered = sorted(first_audio)
+    return {
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+        "output_tokens_per_turn": llm.output_tokens / turns,
+        "rows": writer.rows_written,
+    }
+
+
+async def run(turns: int, seed: int) -> None:
+    print(f"{'mode':>8} {'p50 ms':>10} {'p95 ms':>10} {'out tok/turn':>14} {'rows':>6}")
+    for mode in ("tool", "events"):
+        r = await _run_mode(mode, turns, seed)
+        print(f"{mode:>8} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f} {r['output_tokens_per_turn']:>14.1f} {r['rows']:>6}")
+    print(f"(reply alone is ~{estimate_tokens(REPLY)} tokens)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns, args.seed))
+
+
+if __name__ == "__main__":
+    main()
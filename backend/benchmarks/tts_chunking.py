@@ -0,0 +1,77 @@
+"""
+Time-to-first-audio: full LLM reply versus sentence-chunked streaming to TTS
+
+Replays agent replies against the stubbed Gemini and ElevenLabs backends.
+In "full" mode TTS starts after the whole completion; in "chunked" mode
+the first sentence from `SpeechChunker` is synthesized while the LLM is
+still generating.
+
+Run with:
+    python -m backend.benchmarks.tts_chunking --turns 40 --seed 1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from ..speech_chunker import SpeechChunker, chunk_text_stream
+from .stubs import FakeLLM, FakeTTS, Latency, make_rng
+
+REPLIES = [
+    "Thank you, John. For the record, could you please confirm the date on which you and Jane first met, "
+    "and where that meeting took place?",
+    "Understood. Next, please tell me whether either of you has been married before, and if so, "
+    "whether that marriage was legally dissolved.",
+    "Thank you both. Finally, do you each enter into this marriage freely, without pressure from anyone?",
+]
+
+
+async def _run_mode(mode: str, turns: int, seed: int) -> Dict[str, float]:
+    rng = make_rng(seed)
+    llm = FakeLLM(Latency(350, 80, 120), per_token_ms=25, rng=rng)
+    tts = FakeTTS(Latency(220, 50, 80), rng)
+
+    first_audio: List[float] = []
+    for turn in range(turns):
+        reply = REPLIES[turn % len(REPLIES)]
+        started = time.perf_counter()
+
+        if mode == "full":
+            text = await llm.complete(reply)
+            async for _ in tts.synthesize(text):
+                first_audio.append(time.perf_counter() - started)
+                break
+        else:
+            chunks = chunk_text_stream(llm.stream(reply), SpeechChunker())
+            first_chunk = await chunks.__anext__()
+            async for _ in tts.synthesize(first_chunk):
+                first_audio.append(time.perf_counter() - started)
+                break
+            async for _ in chunks:
+                pass
+
+    ordered = sorted(first_audio)
+    return {
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+    }
+
+
+async def run(turns: int, seed: int) -> None:
+    print(f"{'mode':>8} {'p50 ms':>10} {'p95 ms':>10}")
+    for mode in ("full", "chunked"):
+        r = await _run_mode(mode, turns, seed)
+        print(f"{mode:>8} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns, args.seed))
+
+
+if __name__ == "__main__":
+    main()
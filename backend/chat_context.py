@@ -0,0 +1,188 @@
+"""
+Bounded chat context for long interviews
+
+`ChatContextWindow` trims the LLM history in place before every request:
+the system prompt is always kept, the most recent turns are kept verbatim,
+and older turns are folded into a compact rolling summary message, so the
+prompt stays under a token budget however long the interview runs. It
+also tracks which script questions have already been asked.
+"""
+import re
+from typing import Any, Callable, List, Optional, Set
+
+from .utils.scripts import extract_script_questions
+
+SUMMARY_MARKER = "INTERVIEW SO FAR (summary of earlier turns):"
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; good enough for budgeting
+    return max(1, len(text) // 4)
+
+
+def message_role(message: Any) -> str:
+    role = getattr(message, "role", "")
+    return str(getattr(role, "value", role)).lower()
+
+
+def message_text(message: Any) -> str:
+    content = getattr(message, "content", "")
+    if isinstance(content, list):
+        content = " ".join(c for c in content if isinstance(c, str))
+    return str(content or "")
+
+
+def _words(text: str) -> Set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+class ChatContextWindow:
+    """Keeps the system prompt, recent turns and a rolling summary under `max_tokens`."""
+
+    def __init__(
+        self,
+        script_content: str,
+        message_factory: Callable[[str, str], Any],
+        max_tokens: int = 6000,
+        min_recent_messages: int = 6,
+        summary_line_chars: int = 160,
+    ):
+        self._questions = extract_script_questions(script_content)
+        self._question_words = [_words(q) for q in self._questions]
+        self._asked: Set[int] = set()
+        self._make_message = message_factory
+        self._max_tokens = max_tokens
+        self._min_recent = min_recent_messages
+        self._line_chars = summary_line_chars
+        self._summary_lines: List[str] = []
+        self._omitted = 0
+        # Conversation messages folded into the summary so far (counted from the first turn)
+        self._summarized = 0
+
+    @property
+    def summary(self) -> str:
+        lines = self._summary_lines
+        if self._omitted:
+            lines = [f"- ({self._omitted} earlier exchanges omitted)"] + lines
+        return "\n".join(lines)
+
+    @property
+    def next_question_index(self) -> int:
+        """Index of the first script question not asked yet."""
+        return max(self._asked) + 1 if self._asked else 0
+
+    @property
+    def next_question(self) -> Optional[str]:
+        index = self.next_question_index
+        return self._questions[index] if index < len(self._questions) else None
+
+    def restore(self, summary_lines: List[str], asked: List[int], omitted: int = 0) -> None:
+        """Seed the window from checkpointed state."""
+        self._summary_lines = list(summary_lines)
+        self._asked = set(asked)
+        self._omitted = omitted
+        # The resumed history only holds turns that are not in the summary
+        self._summarized = 0
+
+    def state(self) -> dict:
+        return {"summary_lines": list(self._summary_lines), "asked": sorted(self._asked), "omitted": self._omitted}
+
+    def apply(self, messages: List[Any]) -> int:
+        """
+        Trim `messages` in place and return the estimated prompt size in tokens.
+
+        The first system message is treated as the fixed prompt; a previous
+        summary message is replaced by a fresh one. `messages` may be either
+        the list trimmed by the previous call (plus new turns) or a fresh
+        copy of the whole conversation: without a summary message in it,
+        the turns already folded into the summary are skipped, so calling
+        this on every turn never summarizes a turn twice.
+        """
+        for message in messages:
+            if message_role(message) == "assistant":
+                self._track_progress(message_text(message))
+
+        system = messages[0] if messages and message_role(messages[0]) == "system" else None
+        body = messages[1 if system is not None else 0:]
+        summary_index = None
+        for index, message in enumerate(body):
+            if message_role(message) == "system" and message_text(message).startswith(SUMMARY_MARKER):
+                summary_index = index
+        if summary_index is not None:
+            # Trimmed by a previous call: everything before the summary is already in it
+            history = body[summary_index + 1:]
+        else:
+            history = body[self._summarized:]
+
+        budget = self._max_tokens - (estimate_tokens(message_text(system)) if system is not None else 0)
+        cut = self._find_cut(history, budget)
+        for message in history[:cut]:
+            self._summarize(message)
+        self._summarized += cut
+        recent = history[cut:]
+
+        trimmed = [system] if system is not None else []
+        summary_message = self._summary_message()
+        if summary_message is not None:
+            trimmed.append(summary_message)
+        trimmed.extend(recent)
+        messages[:] = trimmed
+
+        return sum(estimate_tokens(message_text(m)) for m in messages)
+
+    def _find_cut(self, history: List[Any], budget: int) -> int:
+        """Index of the oldest message kept verbatim."""
+        # Reserve room for the summary at its cap (a third of the budget) plus progress lines
+        budget -= self._max_tokens // 3 + 64
+        kept_tokens = 0
+        cut = len(history)
+        while cut > 0:
+            cost = estimate_tokens(message_text(history[cut - 1]))
+            if len(history) - cut >= self._min_recent and kept_tokens + cost > budget:
+                break
+            kept_tokens += cost
+            cut -= 1
+        # Never start the window on a tool result detached from its call
+        while cut < len(history) and message_role(history[cut]) == "tool":
+            cut += 1
+        return cut
+
+    def _summarize(self, message: Any) -> None:
+        role = message_role(message)
+        text = " ".join(message_text(message).split())
+        if not text or role == "tool":
+            return
+        if len(text) > self._line_chars:
+            text = text[:self._line_chars - 1] + "…"
+        speaker = "Officer" if role == "assistant" else "Participant"
+        self._summary_lines.append(f"- {speaker}: {text}")
+
+        # The summary itself may use at most a third of the budget
+        while len(self._summary_lines) > 1 and estimate_tokens(self.summary) > self._max_tokens // 3:
+            self._summary_lines.pop(0)
+            self._omitted += 1
+
+    def _summary_message(self) -> Optional[Any]:
+        if not self._summary_lines and not self._questions:
+            return None
+        parts = [SUMMARY_MARKER]
+        if self._summary_lines:
+            parts.append(self.summary)
+        if self._questions:
+            next_index = self.next_question_index
+            parts.append(f"SCRIPT PROGRESS: {next_index} of {len(self._questions)} questions asked.")
+            if next_index < len(self._questions):
+                parts.append(f"NEXT QUESTION: {self._questions[next_index]}")
+        return self._make_message("system", "\n".join(parts))
+
+    def _track_progress(self, text: str) -> None:
+        spoken = _words(text)
+        if not spoken:
+            return
+        for index, words in enumerate(self._question_words):
+            if index in self._asked or not words:
+                continue
+            if len(words & spoken) / len(words) >= 0.7:
+                self._asked.add(index)
@@ -1,30 +1,38 @@
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session as OrmSession, defer, sessionmaker
+from fastapi import Request
 from .config import settings
+from .db_pool import engine_options, instrument_engine
+from .db_replica import ReplicaMonitor
 from .models import Base, Session as SessionModel, SessionStatus
+from .metrics import db_read_routes, session_code_allocation_attempts
+from .report_cache import report_cache
+from .session_code_cache import session_code_cache
+from .session_code_filter import session_code_filter
 from .schemas import SessionCreate, SessionOut, AIConfig
+from .utils.ids import new_id
 from .utils.session_codes import generate_session_code, get_code_expiry
-from typing import List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
-import uuid
 from datetime import datetime
 
 
+def _async_url(url: str) -> str:
+    """Use asyncpg for plain postgresql:// URLs and drop psycopg-only query params."""
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    parts = urlsplit(url)
+    query_params = [(k, v) for k, v in parse_qsl(parts.query) if k != "sslmode"]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query_params), parts.fragment))
+
+
 # Create async engine
-_db_url = settings.database_url
-if _db_url.startswith("postgresql://"):
-    _db_url = _db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-
-# Strip psycopg-only query params when using asyncpg
-parts = urlsplit(_db_url)
-query_params = [(k, v) for k, v in parse_qsl(parts.query) if k != "sslmode"]
-_db_url = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query_params), parts.fragment))
-
-engine = create_async_engine(
-    _db_url,
-    echo=True,  # Set to False in production
-    future=True
-)
+_db_url = _async_url(settings.database_url)
+engine = create_async_engine(_db_url, **engine_options(_db_url))
+instrument_engine(engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -33,6 +41,44 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Optional read replica, used only while it is reachable and caught up
+replica_engine = None
+ReplicaSessionLocal = None
+replica_monitor = None
+if settings.database_replica_url:
+    _replica_url = _async_url(settings.database_replica_url)
+    replica_engine = create_async_engine(_replica_url, **engine_options(_replica_url))
+    instrument_engine(replica_engine)
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+    replica_monitor = ReplicaMonitor(
+        replica_engine,
+        max_lag=settings.db_replica_max_lag,
+        check_interval=settings.db_replica_check_interval
+    )
+
+
+def read_session() -> AsyncSession:
+    """
+    Session for read-only work
+    
+    Routed to the replica when one is configured and within the lag
+    budget, otherwise to the primary. Reads that must see a write made
+    just before (read-your-writes) should keep using `AsyncSessionLocal`.
+    """
+    if ReplicaSessionLocal is not None and replica_monitor is not None and replica_monitor.usable:
+        db_read_routes.labels(target="replica").inc()
+        return ReplicaSessionLocal()
+    db_read_routes.labels(target="primary").inc()
+    return AsyncSessionLocal()
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    return replica_engine is not None and session.bind is replica_engine
+
 
 async def init_db():
     """Initialize database tables"""
@@ -40,71 +86,229 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
-async def get_db():
-    """Dependency for getting database session"""
-    async with AsyncSessionLocal() as session:
+# Unit of work: one session per request (or per standalone call), whose
+# transaction is committed only if something was written. Writes are
+# noticed from ORM flushes and INSERT/UPDATE/DELETE statements, and
+# read-only units run as READ ONLY transactions on Postgres.
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+_HAS_WRITES = "lexnova_has_writes"
+_READ_ONLY = "lexnova_read_only"
+_AFTER_COMMIT = "lexnova_after_commit"
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _track_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _track_flush_writes(session, flush_context):
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(OrmSession, "after_begin")
+def _begin_read_only(session, transaction, connection):
+    if session.info.get(_READ_ONLY) and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """Run `callback` (cache invalidation and the like) once the unit of work has committed."""
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def complete(session: AsyncSession) -> None:
+    """Finish a unit of work: commit if anything was written, otherwise just end the transaction."""
+    callbacks = session.info.pop(_AFTER_COMMIT, [])
+    if not (session.info.pop(_HAS_WRITES, False) or session.new or session.dirty or session.deleted):
+        await session.rollback()
+        return
+    await session.commit()
+    for callback in callbacks:
+        await callback()
+
+
+@asynccontextmanager
+async def unit_of_work(
+    db_session: Optional[AsyncSession] = None,
+    read_only: bool = False,
+    factory: Optional[Callable[[], AsyncSession]] = None
+) -> AsyncIterator[AsyncSession]:
+    """
+    Yield `db_session` when the caller already has one (the request's),
+    otherwise a new session that is completed on exit.
+    """
+    if db_session is not None:
+        yield db_session
+        return
+    async with (factory or AsyncSessionLocal)() as session:
+        session.info[_READ_ONLY] = read_only
         try:
             yield session
-            await session.commit()
         except Exception:
+            session.info.pop(_AFTER_COMMIT, None)
             await session.rollback()
             raise
-        finally:
-            await session.close()
+        await complete(session)
+
+
+async def get_db(request: Request):
+    """
+    Dependency for the request's database session
+    
+    Every `Database` call and query of the request shares this session, so
+    a request holds at most one connection. GET requests run READ ONLY and
+    are never committed; other requests commit only if they wrote.
+    """
+    async with unit_of_work(read_only=request.method in READ_ONLY_METHODS) as session:
+        yield session
+
+
+async def get_read_db():
+    """Dependency for a read-only request session (replica when usable)"""
+    async with unit_of_work(read_only=True, factory=read_session) as session:
+        yield session
+
+
+class SessionStatusConflict(Exception):
+    """A conditional status update found the session in another status"""
+    
+    def __init__(self, current_status: SessionStatus):
+        super().__init__(f"session_status_conflict:{current_status.value}")
+        self.current_status = current_status
+
+
+class SessionCodeAllocationError(Exception):
+    """No free session code was found within the configured attempts"""
+    
+    def __init__(self):
+        super().__init__("session_code_allocation_failed")
 
 
 class Database:
-    """Database operations wrapper"""
+    """
+    Database operations wrapper
     
-    async def create_session(self, payload: SessionCreate) -> SessionOut:
-        """Create a new interview session"""
-        async with AsyncSessionLocal() as db:
-            session_id = str(uuid.uuid4())[:8]
-            
-            # Generate unique session code
+    Each method takes the caller's session as `db_session` (the request's,
+    from `get_db`) and runs inside its unit of work; without one it opens
+    and completes its own.
+    """
+    
+    async def create_session(self, payload: SessionCreate, db_session: Optional[AsyncSession] = None) -> SessionOut:
+        """
+        Create a new interview session
+        
+        The session code is allocated optimistically: the row is inserted
+        with a random code and ON CONFLICT DO NOTHING, so the unique index
+        on `session_code` decides without aborting the transaction. On a
+        conflict an expired holder of the code is reclaimed, otherwise a
+        fresh code is drawn.
+        """
+        async with unit_of_work(db_session) as db:
             session_code = generate_session_code()
-            # Ensure uniqueness (retry if collision)
-            from sqlalchemy import select
-            max_retries = 5
-            for _ in range(max_retries):
+            for attempt in range(1, settings.session_code_max_attempts + 1):
+                session_id = new_id()
                 result = await db.execute(
-                    select(SessionModel).where(SessionModel.session_code == session_code)
+                    _insert_ignoring_conflicts(db)
+                    .values(
+                        id=session_id,
+                        groom_name=payload.groomName,
+                        bride_name=payload.brideName,
+                        date=payload.date,
+                        status=SessionStatus.PENDING,
+                        ai_voice_style=payload.aiConfig.voiceStyle if payload.aiConfig else "warm",
+                        ai_strictness=payload.aiConfig.strictness if payload.aiConfig else "high",
+                        livekit_room_name=session_id,
+                        session_code=session_code,
+                        session_code_expires=get_code_expiry(hours=24)
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(SessionModel)
                 )
-                if not result.scalar_one_or_none():
-                    break
-                session_code = generate_session_code()
-            
-            new_session = SessionModel(
-                id=session_id,
-                groom_name=payload.groomName,
-                bride_name=payload.brideName,
-                date=payload.date,
-                status=SessionStatus.PENDING,
-                ai_voice_style=payload.aiConfig.voiceStyle if payload.aiConfig else "warm",
-                ai_strictness=payload.aiConfig.strictness if payload.aiConfig else "high",
-                livekit_room_name=session_id,
-                session_code=session_code,
-                session_code_expires=get_code_expiry(hours=24)
-            )
+                new_session = result.scalar_one_or_none()
+                if new_session is None:
+                    if not await self._reclaim_expired_code(db, session_code):
+                        session_code = generate_session_code()
+                    continue
+                
+                session_code_allocation_attempts.observe(attempt)
+                after_commit(db, lambda code=session_code: _announce_code(code))
+                return self._to_session_out(new_session)
             
-            db.add(new_session)
-            await db.commit()
-            await db.refresh(new_session)
-            
-            return self._to_session_out(new_session)
+            session_code_allocation_attempts.observe(settings.session_code_max_attempts)
+            raise SessionCodeAllocationError()
+    
+    async def _reclaim_expired_code(self, db: AsyncSession, code: str) -> bool:
+        """Detach `code` from a session whose code has expired; True if it is free now."""
+        result = await db.execute(
+            update(SessionModel)
+            .where(SessionModel.session_code == code, SessionModel.session_code_expires < datetime.utcnow())
+            .values(session_code=None)
+        )
+        if result.rowcount:
+            after_commit(db, lambda: session_code_cache.invalidate(code))
+            return True
+        return False
     
-    async def list_sessions(self) -> List[SessionOut]:
-        """List all sessions"""
-        async with AsyncSessionLocal() as db:
-            from sqlalchemy import select
-            result = await db.execute(select(SessionModel).order_by(SessionModel.created_at.desc()))
+    async def list_sessions(
+        self,
+        limit: int = 100,
+        after: Optional[str] = None,
+        lawyer_id: Optional[str] = None,
+        status: Optional[SessionStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        include_script: bool = True,
+        db_session: Optional[AsyncSession] = None
+    ) -> Tuple[List[SessionOut], Optional[str]]:
+        """
+        List sessions newest first, one keyset page at a time.
+        
+        `after` is the id of the last session of the previous page; the
+        returned cursor is the id to pass for the next page, or None.
+        """
+        query = select(SessionModel)
+        if lawyer_id is not None:
+            query = query.where(SessionModel.lawyer_id == lawyer_id)
+        if status is not None:
+            query = query.where(SessionModel.status == status)
+        if created_from is not None:
+            query = query.where(SessionModel.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(SessionModel.created_at < created_to)
+        if not include_script:
+            # Scripts can be large; leave the column out of the SELECT entirely
+            query = query.options(defer(SessionModel.script_content))
+        
+        async with unit_of_work(db_session, read_only=True, factory=read_session) as db:
+            if after:
+                after_created = await db.scalar(
+                    select(SessionModel.created_at).where(SessionModel.id == after)
+                )
+                if after_created is not None:
+                    query = query.where(
+                        or_(
+                            SessionModel.created_at < after_created,
+                            and_(SessionModel.created_at == after_created, SessionModel.id < after)
+                        )
+                    )
+            
+            # One extra row tells whether another page exists
+            result = await db.execute(
+                query.order_by(SessionModel.created_at.desc(), SessionModel.id.desc()).limit(limit + 1)
+            )
             sessions = result.scalars().all()
-            return [self._to_session_out(s) for s in sessions]
+            
+            next_cursor = None
+            if len(sessions) > limit:
+                sessions = sessions[:limit]
+                next_cursor = sessions[-1].id
+            return [self._to_session_out(s, include_script=include_script) for s in sessions], next_cursor
     
-    async def get_session(self, session_id: str) -> SessionOut:
+    async def get_session(self, session_id: str, db_session: Optional[AsyncSession] = None) -> SessionOut:
         """Get a specific session by ID"""
-        async with AsyncSessionLocal() as db:
-            from sqlalchemy import select
+        async with unit_of_work(db_session, read_only=True) as db:
             result = await db.execute(select(SessionModel).where(SessionModel.id == session_id))
             session = result.scalar_one_or_none()
             
@@ -113,39 +317,60 @@ class Database:
             
             return self._to_session_out(session)
     
-    async def update_session_script(self, session_id: str, content: str):
+    async def update_session_script(self, session_id: str, content: str, db_session: Optional[AsyncSession] = None):
         """Update session with parsed script content"""
-        async with AsyncSessionLocal() as db:
-            from sqlalchemy import select
-            result = await db.execute(select(SessionModel).where(SessionModel.id == session_id))
-            session = result.scalar_one_or_none()
-            
-            if not session:
+        async with unit_of_work(db_session) as db:
+            result = await db.execute(
+                update(SessionModel)
+                .where(SessionModel.id == session_id)
+                .values(script_content=content, status=SessionStatus.READY)
+                .returning(SessionModel.id, SessionModel.session_code)
+            )
+            row = result.one_or_none()
+            if row is None:
                 raise KeyError("session_not_found")
-            
-            session.script_content = content
-            session.status = SessionStatus.READY
-            await db.commit()
+            after_commit(db, lambda: _invalidate_session(session_id, row.session_code))
     
-    async def update_session_status(self, session_id: str, status: SessionStatus):
-        """Update session status"""
-        async with AsyncSessionLocal() as db:
-            from sqlalchemy import select
-            result = await db.execute(select(SessionModel).where(SessionModel.id == session_id))
+    async def update_session_status(
+        self,
+        session_id: str,
+        status: SessionStatus,
+        expected_status: Optional[SessionStatus] = None,
+        db_session: Optional[AsyncSession] = None
+    ) -> SessionOut:
+        """
+        Update session status in a single UPDATE ... RETURNING.
+        
+        With `expected_status` the update is a compare-and-set: it only
+        applies while the session is still in that status, otherwise
+        SessionStatusConflict is raised with the current status.
+        """
+        values = {"status": status}
+        if status == SessionStatus.ACTIVE:
+            values["started_at"] = datetime.utcnow()
+        elif status == SessionStatus.COMPLETED:
+            values["completed_at"] = datetime.utcnow()
+        
+        stmt = update(SessionModel).where(SessionModel.id == session_id)
+        if expected_status is not None:
+            stmt = stmt.where(SessionModel.status == expected_status)
+        
+        async with unit_of_work(db_session) as db:
+            result = await db.execute(
+                stmt.values(**values).returning(SessionModel),
+                execution_options={"synchronize_session": False}
+            )
             session = result.scalar_one_or_none()
-            
-            if not session:
-                raise KeyError("session_not_found")
-            
-            session.status = status
-            if status == SessionStatus.ACTIVE:
-                session.started_at = datetime.utcnow()
-            elif status == SessionStatus.COMPLETED:
-                session.completed_at = datetime.utcnow()
-            
-            await db.commit()
+            if session is None:
+                # Only the failure path pays for a second round trip
+                current = await db.scalar(select(SessionModel.status).where(SessionModel.id == session_id))
+                if current is None:
+                    raise KeyError("session_not_found")
+                raise SessionStatusConflict(current)
+            after_commit(db, lambda: _invalidate_session(session_id, session.session_code))
+            return self._to_session_out(session)
     
-    def _to_session_out(self, session: SessionModel) -> SessionOut:
+    def _to_session_out(self, session: SessionModel, include_script: bool = True) -> SessionOut:
         """Convert SQLAlchemy model to Pydantic schema"""
         return SessionOut(
             id=session.id,
@@ -153,7 +378,7 @@ class Database:
             brideName=session.bride_name,
             date=session.date,
             status=session.status.value,
-            scriptContent=session.script_content,
+            scriptContent=session.script_content if include_script else None,
             aiConfig=AIConfig(
                 voiceStyle=session.ai_voice_style,
                 strictness=session.ai_strictness
@@ -162,5 +387,21 @@ class Database:
         )
 
 
+def _insert_ignoring_conflicts(db: AsyncSession):
+    """INSERT into sessions that can take ON CONFLICT DO NOTHING on either backend."""
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    return dialect.insert(SessionModel)
+
+
+async def _announce_code(code: str) -> None:
+    await session_code_filter.add(code)
+    await session_code_cache.invalidate(code)
+
+
+async def _invalidate_session(session_id: str, session_code: Optional[str]) -> None:
+    await report_cache.invalidate(session_id)
+    await session_code_cache.invalidate(session_code)
+
+
 # Global database instance
 db = Database()
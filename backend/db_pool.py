@@ -0,0 +1,88 @@
+"""
+Database engine pool configuration and metrics
+
+The API and the agent worker share `database.py` but use the database very
+differently: the API serves many short requests from a few processes,
+while every agent job runs in its own process and needs only a couple of
+connections. `engine_options` builds `create_async_engine` arguments from
+the settings of the active profile (`settings.db_profile`, "api" or
+"agent"), and `instrument_engine` feeds pool checkouts into
+`database_connections` and a checkout-wait histogram.
+"""
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .config import settings
+from .metrics import database_connections, db_pool_checkout_wait
+
+
+class MeteredAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    profile = "api"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait.labels(profile=self.profile).observe(time.perf_counter() - started)
+
+
+def profile_settings(profile: str) -> Dict[str, Any]:
+    """Pool size, overflow and statement timeout of a profile."""
+    if profile == "agent":
+        return {
+            "pool_size": settings.db_agent_pool_size,
+            "max_overflow": settings.db_agent_max_overflow,
+            "statement_timeout_ms": settings.db_agent_statement_timeout_ms,
+        }
+    return {
+        "pool_size": settings.db_api_pool_size,
+        "max_overflow": settings.db_api_max_overflow,
+        "statement_timeout_ms": settings.db_api_statement_timeout_ms,
+    }
+
+
+def engine_options(db_url: str, profile: str = settings.db_profile) -> Dict[str, Any]:
+    """Keyword arguments for `create_async_engine` for the given URL and profile."""
+    options: Dict[str, Any] = {"echo": settings.db_echo, "future": True}
+    if not db_url.startswith("postgresql"):
+        # SQLite (tests, benchmarks) keeps SQLAlchemy's default pool
+        return options
+
+    tuned = profile_settings(profile)
+    options.update(
+        poolclass=type("MeteredAsyncPool", (MeteredAsyncPool,), {"profile": profile}),
+        pool_size=tuned["pool_size"],
+        max_overflow=tuned["max_overflow"],
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if db_url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            # Set to 0 behind PgBouncer in transaction mode
+            "statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": {
+                "statement_timeout": str(tuned["statement_timeout_ms"]),
+                "application_name": f"lexnova-{profile}",
+            },
+        }
+    return options
+
+
+def instrument_engine(engine: Any) -> None:
+    """Track connections currently checked out of the engine's pool."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        database_connections.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        database_connections.dec()
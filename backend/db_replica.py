@@ -0,0 +1,92 @@
+"""
+Replication lag tracking for the optional read replica
+
+`database.read_session()` sends read-only work to the replica engine
+while `ReplicaMonitor.usable` holds: the last lag measurement is fresh
+and within `max_lag`. Anything else (replica down, lagging, not checked
+yet) routes to the primary.
+
+For local testing point DATABASE_REPLICA_URL at a second SQLite file or
+Postgres instance; without real replication the lag reads as 0.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from sqlalchemy import text
+
+from .metrics import db_replica_lag_seconds
+
+logger = logging.getLogger(__name__)
+
+# A standby that has replayed everything it received is caught up even if
+# the primary has been idle (the replay timestamp only moves on writes)
+POSTGRES_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    """Periodically measures replica lag and decides whether reads may use it."""
+
+    def __init__(self, engine: Any, max_lag: float = 5.0, check_interval: float = 2.0):
+        self._engine = engine
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._lag: Optional[float] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def lag(self) -> Optional[float]:
+        return self._lag
+
+    @property
+    def usable(self) -> bool:
+        if self._lag is None or self._lag > self._max_lag:
+            return False
+        # A measurement the loop has stopped refreshing says nothing about now
+        return time.monotonic() - self._checked_at < self._check_interval * 3
+
+    async def check(self) -> Optional[float]:
+        """Measure the lag now; None when the replica could not be reached."""
+        try:
+            lag = await self._measure()
+        except Exception as e:
+            logger.error(f"Replica lag check failed: {e}")
+            lag = None
+        self._lag = lag
+        self._checked_at = time.monotonic()
+        if lag is not None:
+            db_replica_lag_seconds.set(lag)
+        return lag
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _measure(self) -> float:
+        async with self._engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            return float(await conn.scalar(POSTGRES_LAG_QUERY))
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self._check_interval)
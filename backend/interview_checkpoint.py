@@ -0,0 +1,209 @@
+"""
+Checkpointed interview state for agent crash recovery
+
+While an interview runs, the agent periodically saves a compact snapshot
+(script progress and rolling summary from `ChatContextWindow`, the
+diarization speaker map, whether the greeting was given) to Redis or to
+the `interview_checkpoints` table. A new job for the same room loads the
+snapshot plus the latest stored transcript rows and resumes the interview
+instead of starting over.
+"""
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from . import database
+from .chat_context import ChatContextWindow
+from .config import settings
+from .models import InterviewCheckpoint as CheckpointModel
+from .models import Transcript
+from .redis_client import get_redis, redis_available
+from .transcript_capture import AGENT_SPEAKER, SpeakerLabelMapper
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "lexnova:checkpoint:"
+
+
+@dataclass
+class InterviewState:
+    context: Dict[str, Any] = field(default_factory=dict)
+    speakers: Dict[str, str] = field(default_factory=dict)
+    greeted: bool = False
+
+
+class CheckpointStore:
+    """Saves interview snapshots to Redis ("redis") or Postgres ("database")."""
+
+    def __init__(self, backend: str = "redis", ttl_seconds: int = 86400):
+        if backend == "redis" and not redis_available():
+            logger.warning("redis package not installed; interview checkpoints go to the database")
+            backend = "database"
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+
+    async def save(self, session_id: str, state: InterviewState) -> None:
+        payload = json.dumps(asdict(state))
+        if self._backend == "redis":
+            await get_redis().set(f"{KEY_PREFIX}{session_id}", payload, ex=self._ttl_seconds)
+            return
+        async with database.AsyncSessionLocal() as db:
+            await db.merge(CheckpointModel(session_id=session_id, state=payload))
+            await db.commit()
+
+    async def load(self, session_id: str) -> Optional[InterviewState]:
+        if self._backend == "redis":
+            payload = await get_redis().get(f"{KEY_PREFIX}{session_id}")
+        else:
+            async with database.AsyncSessionLocal() as db:
+                payload = await db.scalar(
+                    select(CheckpointModel.state).where(CheckpointModel.session_id == session_id)
+                )
+        if payload is None:
+            return None
+        return InterviewState(**json.loads(payload))
+
+    async def delete(self, session_id: str) -> None:
+        if self._backend == "redis":
+            await get_redis().delete(f"{KEY_PREFIX}{session_id}")
+            return
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(delete(CheckpointModel).where(CheckpointModel.session_id == session_id))
+            await db.commit()
+
+
+async def load_recent_transcripts(session_id: str, limit: int) -> List[Tuple[str, str]]:
+    """The last `limit` (speaker, text) entries of a session, oldest first."""
+    async with database.AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Transcript.speaker, Transcript.text)
+            .where(Transcript.session_id == session_id)
+            .order_by(Transcript.timestamp.desc(), Transcript.id.desc())
+            .limit(limit)
+        )
+        rows = result.all()
+    return [(speaker, text) for speaker, text in reversed(rows)]
+
+
+def transcript_to_messages(entries: List[Tuple[str, str]], message_factory) -> List[Any]:
+    """Turn stored transcript entries back into chat history messages."""
+    return [
+        message_factory("assistant", text) if speaker == AGENT_SPEAKER
+        else message_factory("user", f"{speaker}: {text}")
+        for speaker, text in entries
+    ]
+
+
+def resume_history(
+    entries: List[Tuple[str, str]],
+    system_prompt: str,
+    context_window: ChatContextWindow,
+    message_factory,
+) -> List[Any]:
+    """
+    Chat history to resume an interview with: the stored turns, verbatim.
+
+    The window folds the turns that do not fit into its summary and picks
+    up script progress from them right away, but the returned history holds
+    no summary message: later calls on copies of the conversation skip the
+    folded turns rather than summarizing them again.
+    """
+    history = transcript_to_messages(entries, message_factory)
+    context_window.apply([message_factory("system", system_prompt)] + history)
+    return history
+
+
+class InterviewCheckpointer:
+    """
+    Saves the interview state every `interval` seconds while it changes.
+
+    Call `mark_dirty` after each committed utterance; `attach` does that
+    from the pipeline's speech events.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        store: CheckpointStore,
+        context_window: ChatContextWindow,
+        speakers: SpeakerLabelMapper,
+        interval: float = 5.0,
+        greeted: bool = False,
+    ):
+        self._session_id = session_id
+        self._store = store
+        self._context_window = context_window
+        self._speakers = speakers
+        self._interval = interval
+        self._greeted = greeted
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def attach(self, agent: Any) -> None:
+        agent.on("user_speech_committed", lambda *_: self.mark_dirty())
+        agent.on("agent_speech_committed", lambda *_: self.mark_dirty())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def mark_greeted(self) -> None:
+        self._greeted = True
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        self._dirty.set()
+
+    def state(self) -> InterviewState:
+        return InterviewState(
+            context=self._context_window.state(),
+            speakers=self._speakers.mapping,
+            greeted=self._greeted,
+        )
+
+    async def save(self) -> None:
+        self._dirty.clear()
+        try:
+            await self._store.save(self._session_id, self.state())
+        except Exception as e:
+            logger.error(f"Failed to checkpoint session {self._session_id}: {e}")
+
+    async def stop(self, discard: bool = False) -> None:
+        """Stop checkpointing; `discard` removes the snapshot once the interview is complete."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            if discard:
+                await self._store.delete(self._session_id)
+            elif self._dirty.is_set():
+                await self.save()
+        except Exception as e:
+            logger.error(f"Failed to finalize checkpoint of session {self._session_id}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await self._dirty.wait()
+            await self.save()
+            await asyncio.sleep(self._interval)
+
+
+async def load_for_resume(
+    session_id: str,
+    store: CheckpointStore,
+    transcript_limit: int,
+) -> Tuple[Optional[InterviewState], List[Tuple[str, str]]]:
+    """Load the checkpoint and the latest transcript rows concurrently."""
+    return await asyncio.gather(
+        store.load(session_id),
+        load_recent_transcripts(session_id, transcript_limit),
+    )
+
+
+# Global checkpoint store for this process
+checkpoint_store = CheckpointStore(backend=settings.agent_checkpoint_backend)
@@ -3,7 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from .routers import documents, rooms, client_auth, reports, analysis
 from .routers.sessions import router as sessions_router
 from .routers.auth import router as auth_router
-from .database import init_db
+from .database import init_db, replica_monitor
+from .config import settings
+from .session_code_filter import session_code_filter
+from .session_code_sweeper import session_code_sweeper
 from .metrics import MetricsMiddleware, metrics_endpoint
 from .middleware.rate_limit import limiter, rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -23,6 +26,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Add metrics middleware if enabled
@@ -36,6 +40,21 @@ async def startup_event():
     if os.getenv("INIT_DB_ON_STARTUP", "true").lower() == "true":
         await init_db()
         print("✅ Database initialized")
+    if replica_monitor is not None:
+        await replica_monitor.check()
+        replica_monitor.start()
+    if settings.session_code_filter_enabled:
+        session_code_filter.start()
+    if settings.session_code_sweep_enabled:
+        session_code_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await session_code_filter.stop()
+    await session_code_sweeper.stop()
+    if replica_monitor is not None:
+        await replica_monitor.stop()
 
 
 @app.get("/health")
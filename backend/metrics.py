@@ -26,12 +26,182 @@ active_sessions = Gauge(
 
 ai_agent_connections = Gauge(
     'lexnova_ai_agent_connections',
-    'Number of active AI agent connections'
+    'Number of active AI agent connections',
+    multiprocess_mode='livesum'
 )
 
 database_connections = Gauge(
     'lexnova_database_connections',
-    'Number of active database connections'
+    'Number of active database connections',
+    multiprocess_mode='livesum'
+)
+
+db_pool_checkout_wait = Histogram(
+    'lexnova_db_pool_checkout_wait_seconds',
+    'Time spent waiting for a connection from the engine pool',
+    ['profile'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+)
+
+db_replica_lag_seconds = Gauge(
+    'lexnova_db_replica_lag_seconds',
+    'Replication lag of the read replica as last measured',
+    multiprocess_mode='livemax'
+)
+
+db_read_routes = Counter(
+    'lexnova_db_read_routes_total',
+    'Read-only sessions opened, by the database they were routed to',
+    ['target']
+)
+
+session_code_allocation_attempts = Histogram(
+    'lexnova_session_code_allocation_attempts',
+    'INSERT attempts needed to allocate a unique session code',
+    buckets=(1, 2, 3, 4, 5, 7, 10)
+)
+
+session_code_cache_requests = Counter(
+    'lexnova_session_code_cache_requests_total',
+    'Session code lookups by cache result',
+    ['result']
+)
+
+session_codes_live = Gauge(
+    'lexnova_session_codes_live',
+    'Session codes assigned and not yet expired (reported by the sweeper leader)',
+    multiprocess_mode='livemax'
+)
+
+session_codes_swept = Counter(
+    'lexnova_session_codes_swept_total',
+    'Expired session codes released by the expiry sweeper'
+)
+
+session_code_filter_checks = Counter(
+    'lexnova_session_code_filter_checks_total',
+    'Session code lookups by filter outcome (rejected, passed, false_positive)',
+    ['result']
+)
+
+session_code_filter_items = Gauge(
+    'lexnova_session_code_filter_items',
+    'Codes added to the session code filter since its last rebuild',
+    multiprocess_mode='livemax'
+)
+
+session_code_filter_bytes = Gauge(
+    'lexnova_session_code_filter_bytes',
+    'Size of the session code filter bitset in bytes',
+    multiprocess_mode='livemax'
+)
+
+session_code_filter_estimated_fp = Gauge(
+    'lexnova_session_code_filter_estimated_false_positive_rate',
+    'Expected false positive rate of the session code filter at its current fill',
+    multiprocess_mode='livemax'
+)
+
+transcript_queue_depth = Gauge(
+    'lexnova_transcript_queue_depth',
+    'Transcript entries waiting in the write-behind queue',
+    multiprocess_mode='livesum'
+)
+
+transcript_flush_duration = Histogram(
+    'lexnova_transcript_flush_duration_seconds',
+    'Time spent writing one batch of transcript entries',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+transcript_flush_batch_size = Histogram(
+    'lexnova_transcript_flush_batch_size',
+    'Number of transcript entries written per bulk insert',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500)
+)
+
+transcript_rows_dead_lettered = Counter(
+    'lexnova_transcript_rows_dead_lettered_total',
+    'Transcript entries the database rejected and that were set aside'
+)
+
+agent_time_to_first_greeting = Histogram(
+    'lexnova_agent_time_to_first_greeting_seconds',
+    'Time from job start until the agent starts speaking its greeting',
+    buckets=(0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 13.0)
+)
+
+agent_recovery_seconds = Histogram(
+    'lexnova_agent_recovery_seconds',
+    'Time from a restarted agent job starting to resuming an interrupted interview',
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0)
+)
+
+agent_prompt_tokens = Histogram(
+    'lexnova_agent_prompt_tokens',
+    'Estimated prompt size sent to the LLM per conversational turn',
+    buckets=(500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000, 32000)
+)
+
+agent_interrupted_replies = Counter(
+    'lexnova_agent_interrupted_replies_total',
+    'Streamed agent replies cut short by a participant interruption'
+)
+
+# Per-turn conversational latency, exported by the agent worker
+_TURN_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0)
+
+agent_end_of_utterance_delay = Histogram(
+    'lexnova_agent_end_of_utterance_delay_seconds',
+    'Time from end of user speech until the turn is committed',
+    ['voice_style'],
+    buckets=_TURN_BUCKETS
+)
+
+agent_stt_final_latency = Histogram(
+    'lexnova_agent_stt_final_latency_seconds',
+    'Time from end of user speech until the final STT transcript',
+    ['voice_style'],
+    buckets=_TURN_BUCKETS
+)
+
+agent_llm_ttft = Histogram(
+    'lexnova_agent_llm_time_to_first_token_seconds',
+    'LLM time to first token',
+    ['voice_style'],
+    buckets=_TURN_BUCKETS
+)
+
+agent_tts_ttfb = Histogram(
+    'lexnova_agent_tts_time_to_first_byte_seconds',
+    'TTS time to first audio byte',
+    ['voice_style'],
+    buckets=_TURN_BUCKETS
+)
+
+agent_turn_latency = Histogram(
+    'lexnova_agent_turn_latency_seconds',
+    'End of user speech until first agent audio (end of utterance + LLM TTFT + TTS TTFB)',
+    ['voice_style'],
+    buckets=_TURN_BUCKETS
+)
+
+agent_session_capacity = Gauge(
+    'lexnova_agent_session_capacity',
+    'Maximum concurrent interview sessions accepted by an agent worker',
+    multiprocess_mode='max'
+)
+
+agent_worker_load = Gauge(
+    'lexnova_agent_worker_load',
+    'Load reported by an agent worker to LiveKit (0-1)',
+    multiprocess_mode='livemax'
+)
+
+agent_jobs_rejected = Counter(
+    'lexnova_agent_jobs_rejected_total',
+    'Job requests rejected by an agent worker',
+    ['reason']
 )
 
 
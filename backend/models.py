@@ -1,9 +1,11 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, Uuid, text, Enum as SQLEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
+from .utils.ids import new_id
+
 Base = declarative_base()
 
 
@@ -32,6 +34,19 @@ class User(Base):
 class Session(Base):
     """Interview session between bride, groom, and AI"""
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Serve the dashboard listing in (created_at, id) keyset order, optionally filtered
+        Index("ix_sessions_created_at_id", "created_at", "id"),
+        Index("ix_sessions_lawyer_id_created_at_id", "lawyer_id", "created_at", "id"),
+        Index("ix_sessions_status_created_at_id", "status", "created_at", "id"),
+        # Expiry sweeps only look at sessions that still hold a code
+        Index(
+            "ix_sessions_session_code_expires",
+            "session_code_expires",
+            postgresql_where=text("session_code IS NOT NULL"),
+            sqlite_where=text("session_code IS NOT NULL"),
+        ),
+    )
     
     id = Column(String, primary_key=True)
     lawyer_id = Column(String, ForeignKey("users.id"), nullable=True)
@@ -70,10 +85,24 @@ class Session(Base):
 class Transcript(Base):
     """Store conversation transcripts for legal records"""
     __tablename__ = "transcripts"
+    __table_args__ = (
+        # Serves per-session retrieval in (timestamp, id) keyset order
+        Index("ix_transcripts_session_id_timestamp_id", "session_id", "timestamp", "id"),
+    )
     
-    id = Column(String, primary_key=True)
+    # UUIDv7 (backend.utils.ids): time-ordered, so inserts append to the primary key index
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
     session_id = Column(String, ForeignKey("sessions.id"), nullable=False)
     
     speaker = Column(String, nullable=False)  # "AI", "GROOM", "BRIDE", "LAWYER"
     text = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
+
+
+class InterviewCheckpoint(Base):
+    """Compact agent interview state, used to resume after a worker crash"""
+    __tablename__ = "interview_checkpoints"
+    
+    session_id = Column(String, ForeignKey("sessions.id"), primary_key=True)
+    state = Column(Text, nullable=False)  # JSON: script progress, speaker map, rolling summary
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
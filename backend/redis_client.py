@@ -0,0 +1,30 @@
+"""
+Shared asyncio Redis client
+
+Redis is optional: callers get None when the `redis` package is missing
+and fall back to in-process behaviour.
+"""
+from typing import Optional
+
+try:
+    import redis.asyncio as aioredis
+except Exception:  # pragma: no cover
+    aioredis = None
+
+from .config import settings
+
+_client = None
+
+
+def redis_available() -> bool:
+    return aioredis is not None
+
+
+def get_redis() -> Optional["aioredis.Redis"]:
+    """Return the process-wide client for `settings.redis_url`, creating it lazily."""
+    global _client
+    if aioredis is None:
+        return None
+    if _client is None:
+        _client = aioredis.from_url(settings.redis_url, decode_responses=True)
+    return _client
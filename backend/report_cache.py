@@ -0,0 +1,126 @@
+"""
+Cache of serialized reports for completed sessions
+
+A completed session's report only changes if its status or transcript is
+written again, so the rendered JSON is kept in an in-process LRU (and
+optionally in Redis, shared by every API process) together with a strong
+ETag. Writers invalidate entries through `invalidate`.
+
+An invalidation only clears the LRU of the process that made it (the
+agent's transcript writer and other API workers cannot reach this one),
+so the local tier keeps an entry for a few seconds at most; a report
+rewritten elsewhere is served stale for at most `local_ttl` seconds.
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+from .config import settings
+from .redis_client import get_redis, redis_available
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "lexnova:report:"
+
+
+@dataclass
+class CachedReport:
+    etag: str
+    body: str
+
+
+def make_etag(version: str, body: str) -> str:
+    """Strong ETag derived from the content version and the exact bytes served."""
+    digest = hashlib.sha256(f"{version}\n{body}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class ReportCache:
+    """Two-tier report cache: short-lived in-process LRU in front of an optional Redis tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        backend: str = "local",
+        ttl_seconds: int = 86400,
+        local_ttl: float = 5.0,
+    ):
+        if backend == "redis" and not redis_available():
+            logger.warning("redis package not installed; report cache is in-process only")
+            backend = "local"
+        self._backend = backend
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._local_ttl = local_ttl
+        self._entries: "OrderedDict[str, Tuple[float, CachedReport]]" = OrderedDict()
+
+    async def get(self, session_id: str) -> Optional[CachedReport]:
+        cached = self._entries.get(session_id)
+        if cached is not None:
+            deadline, entry = cached
+            if time.monotonic() < deadline:
+                self._entries.move_to_end(session_id)
+                return entry
+            del self._entries[session_id]
+
+        if self._backend != "redis":
+            return None
+        try:
+            raw = await get_redis().get(f"{KEY_PREFIX}{session_id}")
+        except Exception as e:
+            logger.error(f"Report cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        entry = CachedReport(etag=data["etag"], body=data["body"])
+        self._remember(session_id, entry)
+        return entry
+
+    async def set(self, session_id: str, entry: CachedReport) -> None:
+        self._remember(session_id, entry)
+        if self._backend != "redis":
+            return
+        try:
+            await get_redis().set(
+                f"{KEY_PREFIX}{session_id}",
+                json.dumps({"etag": entry.etag, "body": entry.body}),
+                ex=self._ttl_seconds
+            )
+        except Exception as e:
+            logger.error(f"Report cache write failed: {e}")
+
+    async def invalidate(self, *session_ids: str) -> None:
+        await self.invalidate_many(session_ids)
+
+    async def invalidate_many(self, session_ids: Iterable[str]) -> None:
+        keys = []
+        for session_id in set(session_ids):
+            self._entries.pop(session_id, None)
+            keys.append(f"{KEY_PREFIX}{session_id}")
+
+        if self._backend != "redis" or not keys:
+            return
+        try:
+            await get_redis().delete(*keys)
+        except Exception as e:
+            logger.error(f"Report cache invalidation failed: {e}")
+
+    def _remember(self, session_id: str, entry: CachedReport) -> None:
+        self._entries[session_id] = (time.monotonic() + self._local_ttl, entry)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+# Global report cache for this process
+report_cache = ReportCache(
+    max_entries=settings.report_cache_max_entries,
+    backend=settings.report_cache_backend,
+    local_ttl=settings.report_cache_local_ttl,
+)
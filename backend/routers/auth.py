@@ -16,6 +16,7 @@ from .. import database as db
 from ..models import User
 from ..middleware.rate_limit import limiter
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 router = APIRouter(tags=["Authentication"])
@@ -40,84 +41,81 @@ class UserResponse(BaseModel):
 
 @router.post("/register", response_model=UserResponse)
 @limiter.limit("5/minute")
-async def register(request: Request, user_data: UserRegister):
+async def register(request: Request, user_data: UserRegister, db_session: AsyncSession = Depends(db.get_db)):
     """Register a new lawyer account"""
-    async with db.AsyncSessionLocal() as db_session:
-        # Check if user already exists
-        result = await db_session.execute(
-            select(User).where(User.email == user_data.email)
-        )
-        existing_user = result.scalar_one_or_none()
-        
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        
-        # Create new user
-        new_user = User(
-            id=str(uuid.uuid4()),
-            email=user_data.email,
-            name=user_data.name,
-            password_hash=get_password_hash(user_data.password)
-        )
-        
-        db_session.add(new_user)
-        await db_session.commit()
-        await db_session.refresh(new_user)
-        
-        return UserResponse(
-            id=new_user.id,
-            email=new_user.email,
-            name=new_user.name
+    # Check if user already exists
+    result = await db_session.execute(
+        select(User).where(User.email == user_data.email)
+    )
+    existing_user = result.scalar_one_or_none()
+    
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
         )
+    
+    # Create new user
+    new_user = User(
+        id=str(uuid.uuid4()),
+        email=user_data.email,
+        name=user_data.name,
+        password_hash=get_password_hash(user_data.password)
+    )
+    
+    # Committed by the request's unit of work
+    db_session.add(new_user)
+    await db_session.flush()
+    
+    return UserResponse(
+        id=new_user.id,
+        email=new_user.email,
+        name=new_user.name
+    )
 
 
 @router.post("/login", response_model=Token)
 @limiter.limit("5/minute")
-async def login(request: Request, credentials: UserLogin):
+async def login(request: Request, credentials: UserLogin, db_session: AsyncSession = Depends(db.get_db)):
     """Login and receive JWT token"""
-    async with db.AsyncSessionLocal() as db_session:
-        # Find user
-        result = await db_session.execute(
-            select(User).where(User.email == credentials.email)
+    # Find user
+    result = await db_session.execute(
+        select(User).where(User.email == credentials.email)
+    )
+    user = result.scalar_one_or_none()
+    
+    if not user or not verify_password(credentials.password, user.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        user = result.scalar_one_or_none()
-        
-        if not user or not verify_password(credentials.password, user.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Create access token
-        access_token = create_access_token(
-            data={"sub": user.id, "email": user.email},
-            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        )
-        
-        return Token(access_token=access_token)
+    
+    # Create access token
+    access_token = create_access_token(
+        data={"sub": user.id, "email": user.email},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    
+    return Token(access_token=access_token)
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user = Depends(get_current_user)):
+async def get_current_user_info(current_user = Depends(get_current_user), db_session: AsyncSession = Depends(db.get_db)):
     """Get current authenticated user information"""
-    async with db.AsyncSessionLocal() as db_session:
-        result = await db_session.execute(
-            select(User).where(User.id == current_user.user_id)
-        )
-        user = result.scalar_one_or_none()
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        return UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name
+    result = await db_session.execute(
+        select(User).where(User.id == current_user.user_id)
+    )
+    user = result.scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
+    
+    return UserResponse(
+        id=user.id,
+        email=user.email,
+        name=user.name
+    )
@@ -3,10 +3,14 @@ Client authentication endpoints for joining sessions
 """
 from fastapi import APIRouter, HTTPException, status, Depends, Request
 from pydantic import BaseModel
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from ..database import get_db
+from .. import database
+from ..database import get_read_db
 from ..models import Session
+from ..session_code_cache import CodeEntry, session_code_cache
+from ..session_code_filter import session_code_filter
 from .rooms import generate_livekit_token
 from ..utils.session_codes import is_code_expired, validate_session_code_format
 from ..middleware.rate_limit import limiter
@@ -33,7 +37,7 @@ class ClientJoinResponse(BaseModel):
 async def client_join_session(
     request: Request,
     join_request: ClientJoinRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Allow clients (bride/groom) to join a session using a session code
@@ -58,10 +62,7 @@ async def client_join_session(
         )
     
     # Find session by code
-    result = await db.execute(
-        select(Session).where(Session.session_code == code)
-    )
-    session = result.scalar_one_or_none()
+    session = await _lookup_code(db, code)
     
     if not session:
         raise HTTPException(
@@ -70,7 +71,7 @@ async def client_join_session(
         )
     
     # Check if code has expired
-    if session.session_code_expires and is_code_expired(session.session_code_expires):
+    if session.expires_at and is_code_expired(session.expires_at):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Session code has expired. Please contact your lawyer for a new code."
@@ -84,19 +85,19 @@ async def client_join_session(
         )
     
     # Generate LiveKit token
-    room_name = session.livekit_room_name or session.id
+    room_name = session.room_name
     token = generate_livekit_token(
         room_name=room_name,
         participant_name=join_request.participant_name,
         metadata={
             "type": join_request.participant_type,
-            "session_id": session.id
+            "session_id": session.session_id
         }
     )
     
     return ClientJoinResponse(
         token=token,
-        session_id=session.id,
+        session_id=session.session_id,
         room_name=room_name,
         groom_name=session.groom_name,
         bride_name=session.bride_name
@@ -108,7 +109,7 @@ async def client_join_session(
 async def get_session_info(
     request: Request,
     session_code: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get basic session information using a session code (without joining)
@@ -122,10 +123,7 @@ async def get_session_info(
     """
     code = session_code.upper().replace("-", "")
     
-    result = await db.execute(
-        select(Session).where(Session.session_code == code)
-    )
-    session = result.scalar_one_or_none()
+    session = await _lookup_code(db, code)
     
     if not session:
         raise HTTPException(
@@ -133,17 +131,56 @@ async def get_session_info(
             detail="Session not found"
         )
     
-    if session.session_code_expires and is_code_expired(session.session_code_expires):
+    if session.expires_at and is_code_expired(session.expires_at):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Session code has expired"
         )
     
     return {
-        "session_id": session.id,
+        "session_id": session.session_id,
         "groom_name": session.groom_name,
         "bride_name": session.bride_name,
         "date": session.date,
-        "status": session.status.value,
-        "code_expires": session.session_code_expires.isoformat() if session.session_code_expires else None
+        "status": session.status,
+        "code_expires": session.expires
     }
+
+
+async def _lookup_code(db: AsyncSession, code: str) -> Optional[CodeEntry]:
+    """
+    Resolve a session code through the read-through cache
+    
+    Unknown codes are turned away by the negative cache or the code
+    filter before they reach the database.
+    """
+    entry = await session_code_cache.get(code)
+    if entry is not None:
+        return entry
+    if session_code_cache.is_missing(code):
+        return None
+    if not await session_code_filter.might_exist(code):
+        return None
+    
+    query = select(Session).where(Session.session_code == code)
+    session = (await db.execute(query)).scalar_one_or_none()
+    if session is None and database.is_replica_session(db):
+        # The code may be newer than the replica
+        async with database.AsyncSessionLocal() as primary:
+            session = (await primary.execute(query)).scalar_one_or_none()
+    session_code_filter.record_lookup(found=session is not None)
+    if not session:
+        session_code_cache.set_missing(code)
+        return None
+    
+    entry = CodeEntry(
+        session_id=session.id,
+        room_name=session.livekit_room_name or session.id,
+        groom_name=session.groom_name,
+        bride_name=session.bride_name,
+        date=session.date,
+        status=session.status.value,
+        expires=session.session_code_expires.isoformat() if session.session_code_expires else None
+    )
+    await session_code_cache.set(code, entry)
+    return entry
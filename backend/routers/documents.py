@@ -1,5 +1,6 @@
-from fastapi import UploadFile, APIRouter
-from ..database import db
+from fastapi import UploadFile, APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import db, get_db
 import json
 
 try:
@@ -11,7 +12,7 @@ router = APIRouter()
 
 
 @router.post("/sessions/{session_id}/script")
-async def upload_script(session_id: str, file: UploadFile):
+async def upload_script(session_id: str, file: UploadFile, db_session: AsyncSession = Depends(get_db)):
     content = ""
     if file.filename.endswith(".pdf"):
         if pdfplumber is not None:
@@ -25,5 +26,5 @@ async def upload_script(session_id: str, file: UploadFile):
         content = json.dumps(data)
     else:
         content = (await file.read()).decode("utf-8", errors="ignore")
-    await db.update_session_script(session_id, content)
+    await db.update_session_script(session_id, content, db_session)
     return {"status": "ready"}
@@ -1,18 +1,33 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import json
 
-from ..database import get_db
+from .. import database
+from ..config import settings
+from ..database import get_db, get_read_db
 from ..models import Session as SessionModel, Transcript as TranscriptModel
 from ..schemas import AIConfig as AISchemaConfig
 from ..models import SessionStatus
+from ..report_cache import CachedReport, make_etag, report_cache
+from ..transcript_events import OVERFLOW, transcript_broadcaster
+from ..utils.ids import is_uuid
 
 
 router = APIRouter(tags=["Reports"])
 
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
+
+# Completed reports may still be invalidated, so clients revalidate every time (cheap 304s)
+REPORT_CACHE_CONTROL = "private, no-cache"
+
 
 class TranscriptEntry(BaseModel):
     id: str
@@ -30,19 +45,43 @@ class SessionReportOut(BaseModel):
     scriptContent: Optional[str] = None
     aiConfig: Optional[AISchemaConfig] = None
     transcripts: List[TranscriptEntry] = []
+    nextCursor: Optional[str] = None
     
     class Config:
         orm_mode = True # This allows Pydantic to read from SQLAlchemy models
 
 
+class TranscriptPage(BaseModel):
+    items: List[TranscriptEntry] = []
+    nextCursor: Optional[str] = None
+
+
 @router.get("/sessions/{session_id}/report", response_model=SessionReportOut)
 async def get_session_report(
     session_id: str,
-    db: AsyncSession = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Retrieves a comprehensive report for a specific session, including all transcripts.
+    Retrieves a comprehensive report for a specific session, including its transcripts.
+
+    Without `limit` every transcript entry is returned. With `limit`, at most that
+    many entries following the `after` cursor are returned, plus `nextCursor`
+    when more remain. `stream=true` returns the full report with the same schema,
+    serialized incrementally from a server-side cursor so memory stays bounded.
+
+    Full reports of completed sessions are cached with a strong ETag; a matching
+    `If-None-Match` is answered with 304 without querying the database.
     """
+    cacheable = limit is None and after is None and not stream
+    if cacheable:
+        cached = await report_cache.get(session_id)
+        if cached is not None:
+            return _cached_report_response(cached, if_none_match)
+
     session_result = await db.execute(
         select(SessionModel).where(SessionModel.id == session_id)
     )
@@ -54,13 +93,44 @@ async def get_session_report(
             detail="Session not found"
         )
 
-    transcript_result = await db.execute(
-        select(TranscriptModel)
-        .where(TranscriptModel.session_id == session_id)
-        .order_by(TranscriptModel.timestamp)
-    )
-    transcripts = transcript_result.scalars().all()
-    
+    report = _to_report(session)
+
+    if stream:
+        return StreamingResponse(
+            _stream_report(report, after),
+            media_type="application/json"
+        )
+
+    transcripts, next_cursor = await _transcript_page(db, session_id, after, limit)
+    report.transcripts = [_to_transcript_entry(t) for t in transcripts]
+    report.nextCursor = next_cursor
+
+    if cacheable and report.status == SessionStatus.COMPLETED:
+        body = report.model_dump_json()
+        version = f"{session.completed_at.isoformat() if session.completed_at else ''}:{len(transcripts)}"
+        entry = CachedReport(etag=make_etag(version, body), body=body)
+        await report_cache.set(session_id, entry)
+        return _cached_report_response(entry, if_none_match)
+
+    return report
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _cached_report_response(entry: CachedReport, if_none_match: Optional[str]) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": REPORT_CACHE_CONTROL}
+    if _etag_matches(entry.etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _to_report(session: SessionModel) -> SessionReportOut:
+    """Build a report for a session without its transcripts."""
     # Manually map session status to SessionStatus enum for consistency
     session_status = SessionStatus(session.status.value) if session.status else SessionStatus.PENDING
 
@@ -74,13 +144,195 @@ async def get_session_report(
         aiConfig=AISchemaConfig(
             voiceStyle=session.ai_voice_style,
             strictness=session.ai_strictness
-        ) if session.ai_voice_style and session.ai_strictness else None,
-        transcripts=[
-            TranscriptEntry(
-                id=t.id,
-                speaker=t.speaker,
-                text=t.text,
-                timestamp=t.get('timestamp', datetime.utcnow()) # use .get for compatibility
-            ) for t in transcripts
-        ]
+        ) if session.ai_voice_style and session.ai_strictness else None
+    )
+
+
+async def _stream_report(report: SessionReportOut, after: Optional[str]) -> AsyncIterator[str]:
+    """Serialize a report as JSON, streaming transcript rows in chunks."""
+    head = report.model_dump_json(exclude={"transcripts", "nextCursor"})
+    yield head[:-1] + ',"transcripts":['
+
+    # The request's session is closed once the response starts; use our own
+    async with database.read_session() as db:
+        query = await _transcripts_query(db, report.id, after)
+        rows = await db.stream_scalars(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+
+        chunk: List[str] = []
+        first = True
+        async for t in rows:
+            chunk.append(_to_transcript_entry(t).model_dump_json())
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield ("" if first else ",") + ",".join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield ("" if first else ",") + ",".join(chunk)
+
+    yield '],"nextCursor":null}'
+
+
+@router.get("/sessions/{session_id}/transcripts", response_model=TranscriptPage)
+async def list_session_transcripts(
+    session_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Page through a session's transcript in chronological order.
+
+    Pass the returned `nextCursor` as `after` to fetch the following page.
+    """
+    session_result = await db.execute(
+        select(SessionModel.id).where(SessionModel.id == session_id)
+    )
+    if session_result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+
+    transcripts, next_cursor = await _transcript_page(db, session_id, after, limit)
+    return TranscriptPage(
+        items=[_to_transcript_entry(t) for t in transcripts],
+        nextCursor=next_cursor
+    )
+
+
+def _to_transcript_entry(t: TranscriptModel) -> TranscriptEntry:
+    return TranscriptEntry(
+        id=t.id,
+        speaker=t.speaker,
+        text=t.text,
+        timestamp=t.timestamp or datetime.utcnow()
+    )
+
+
+async def _transcript_page(
+    db: AsyncSession,
+    session_id: str,
+    after: Optional[str],
+    limit: Optional[int]
+) -> Tuple[List[TranscriptModel], Optional[str]]:
+    """Fetch one page of transcripts and the cursor for the next one."""
+    if limit is None:
+        return await _transcripts_after(db, session_id, after), None
+
+    # One extra row tells whether another page exists
+    rows = await _transcripts_after(db, session_id, after, limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
+async def _transcripts_query(
+    db: AsyncSession,
+    session_id: str,
+    after_id: Optional[str] = None
+) -> Select:
+    """
+    Build a query for a session's transcript rows ordered by (timestamp, id),
+    starting right after the row `after_id` when given.
+    """
+    query = select(TranscriptModel).where(TranscriptModel.session_id == session_id)
+
+    # Transcript ids are UUIDs; any other cursor is unknown, as before
+    if after_id and is_uuid(after_id):
+        cursor_result = await db.execute(
+            select(TranscriptModel.timestamp).where(
+                TranscriptModel.session_id == session_id,
+                TranscriptModel.id == after_id
+            )
+        )
+        after_timestamp = cursor_result.scalar_one_or_none()
+        if after_timestamp is not None:
+            query = query.where(
+                or_(
+                    TranscriptModel.timestamp > after_timestamp,
+                    and_(TranscriptModel.timestamp == after_timestamp, TranscriptModel.id > after_id)
+                )
+            )
+
+    return query.order_by(TranscriptModel.timestamp, TranscriptModel.id)
+
+
+async def _transcripts_after(
+    db: AsyncSession,
+    session_id: str,
+    after_id: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[TranscriptModel]:
+    """Fetch a session's transcript rows following `after_id`."""
+    query = await _transcripts_query(db, session_id, after_id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+def _sse_event(entry: dict) -> str:
+    return f"id: {entry['id']}\nevent: transcript\ndata: {json.dumps(entry)}\n\n"
+
+
+@router.get("/sessions/{session_id}/transcript/stream")
+async def stream_session_transcript(
+    session_id: str,
+    request: Request,
+    after: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-sent event stream of transcript entries as they are written.
+
+    Clients resume with the standard `Last-Event-ID` header (or `?after=<id>`)
+    and only receive rows newer than that id.
+    """
+    session_result = await db.execute(
+        select(SessionModel.id).where(SessionModel.id == session_id)
+    )
+    if session_result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+
+    resume_from = last_event_id or after
+
+    async def event_stream() -> AsyncIterator[str]:
+        # Subscribe before backfilling so no row falls between the two
+        async with transcript_broadcaster.subscribe(session_id) as queue:
+            sent_ids = set()
+            # Primary, not the replica: a lagging backfill would leave a gap before the live rows
+            async with database.AsyncSessionLocal() as backfill_db:
+                backlog = await _transcripts_after(backfill_db, session_id, resume_from)
+            for t in backlog:
+                sent_ids.add(t.id)
+                yield _sse_event({
+                    "id": t.id,
+                    "session_id": t.session_id,
+                    "speaker": t.speaker,
+                    "text": t.text,
+                    "timestamp": t.timestamp.isoformat() if t.timestamp else None,
+                })
+
+            while not await request.is_disconnected():
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout=settings.transcript_stream_heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if entry is OVERFLOW:
+                    # Client fell behind; it reconnects with Last-Event-ID to backfill
+                    break
+                if entry["id"] in sent_ids:
+                    continue
+                yield _sse_event(entry)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
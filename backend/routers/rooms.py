@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 try:
     from livekit import api
 except Exception:
     api = None
-from ..database import db
+from ..database import SessionStatusConflict, complete, db, get_db
 from ..config import settings
 from ..models import SessionStatus
 from datetime import timedelta
@@ -63,22 +64,22 @@ def generate_livekit_token(
 
 
 @router.post("/sessions/{session_id}/start")
-async def start_session(session_id: str):
+async def start_session(session_id: str, db_session: AsyncSession = Depends(get_db)):
     """Start an interview session and generate LiveKit tokens"""
+    # ready -> active as one compare-and-set, so concurrent clicks start the session only once
     try:
-        session = await db.get_session(session_id)
+        session = await db.update_session_status(
+            session_id, SessionStatus.ACTIVE, expected_status=SessionStatus.READY, db_session=db_session
+        )
     except KeyError:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Verify session is ready
-    if session.status != "ready":
+    except SessionStatusConflict as e:
         raise HTTPException(
             status_code=400, 
-            detail=f"Session must be in 'ready' status. Current status: {session.status}"
+            detail=f"Session must be in 'ready' status. Current status: {e.current_status.value}"
         )
-    
-    # Update session status to active
-    await db.update_session_status(session_id, SessionStatus.ACTIVE)
+    # Release the row lock before the LiveKit round trips
+    await complete(db_session)
     
     # Generate LiveKit tokens
     room_name = session_id
@@ -1,16 +1,56 @@
-from fastapi import APIRouter, Request
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas import SessionCreate, SessionOut
-from ..database import db
+from ..database import SessionCodeAllocationError, db, get_db, get_read_db
+from ..models import SessionStatus
 from ..middleware.rate_limit import limiter
 
 router = APIRouter()
 
+DEFAULT_SESSION_PAGE_SIZE = 100
+MAX_SESSION_PAGE_SIZE = 500
+
 @router.post("/sessions", response_model=SessionOut)
 @limiter.limit("10/minute")
-async def create_session(request: Request, payload: SessionCreate):
-    return await db.create_session(payload)
+async def create_session(request: Request, payload: SessionCreate, db_session: AsyncSession = Depends(get_db)):
+    try:
+        return await db.create_session(payload, db_session)
+    except SessionCodeAllocationError:
+        raise HTTPException(status_code=503, detail="Could not allocate a session code. Please try again.")
 
 @router.get("/sessions", response_model=list[SessionOut])
 @limiter.limit("30/minute")
-async def list_sessions(request: Request):
-    return await db.list_sessions()
+async def list_sessions(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_SESSION_PAGE_SIZE, ge=1, le=MAX_SESSION_PAGE_SIZE),
+    after: Optional[str] = None,
+    lawyer_id: Optional[str] = Query(None, alias="lawyerId"),
+    status: Optional[SessionStatus] = None,
+    created_from: Optional[datetime] = Query(None, alias="createdFrom"),
+    created_to: Optional[datetime] = Query(None, alias="createdTo"),
+    include_script: bool = Query(True, alias="includeScript"),
+    db_session: AsyncSession = Depends(get_read_db),
+):
+    """
+    List sessions newest first, one page at a time.
+
+    Pass the `X-Next-Cursor` response header back as `after` to get the
+    next page; the header is absent on the last page.
+    """
+    sessions, next_cursor = await db.list_sessions(
+        limit=limit,
+        after=after,
+        lawyer_id=lawyer_id,
+        status=status,
+        created_from=created_from,
+        created_to=created_to,
+        include_script=include_script,
+        db_session=db_session,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return sessions
@@ -0,0 +1,169 @@
+"""
+Read-through cache for session-code lookups on the client join path
+
+Client join pages poll `GET /api/client/session/{code}` while they wait,
+so code -> session lookups are cached. Entries live in Redis (shared by
+every API process, and invalidated by the agent too) with a TTL equal to
+the code's remaining lifetime, and in a small in-process LRU in front of
+it. The local tier only keeps an entry for a few seconds, so a status
+change invalidated in another process is seen almost immediately.
+
+Codes the database did not know are remembered in-process for a few
+seconds too (a negative entry), so repeated guesses of the same code
+are answered without a query. Creating a code clears its negative entry
+in the creating process; other processes may answer "not found" for at
+most `negative_ttl` seconds after the code is issued.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from .config import settings
+from .metrics import session_code_cache_requests
+from .redis_client import get_redis, redis_available
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "lexnova:code:"
+
+
+@dataclass
+class CodeEntry:
+    session_id: str
+    room_name: str
+    groom_name: str
+    bride_name: str
+    date: str
+    status: str
+    expires: Optional[str] = None  # ISO timestamp (UTC)
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        return datetime.fromisoformat(self.expires) if self.expires else None
+
+    def remaining_seconds(self) -> Optional[float]:
+        expires_at = self.expires_at
+        if expires_at is None:
+            return None
+        return (expires_at - datetime.utcnow()).total_seconds()
+
+
+class SessionCodeCache:
+    """Two-tier code cache: short-lived in-process LRU in front of an optional Redis tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        backend: str = "local",
+        local_ttl: float = 5.0,
+        max_ttl: int = 86400,
+        negative_ttl: float = 10.0,
+    ):
+        if backend == "redis" and not redis_available():
+            logger.warning("redis package not installed; session code cache is in-process only")
+            backend = "local"
+        self._backend = backend
+        self._max_entries = max_entries
+        self._local_ttl = local_ttl
+        self._max_ttl = max_ttl
+        self._negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[float, CodeEntry]]" = OrderedDict()
+        self._missing: "OrderedDict[str, float]" = OrderedDict()
+
+    async def get(self, code: str) -> Optional[CodeEntry]:
+        cached = self._entries.get(code)
+        if cached is not None:
+            deadline, entry = cached
+            if time.monotonic() < deadline:
+                self._entries.move_to_end(code)
+                session_code_cache_requests.labels(result="hit_local").inc()
+                return entry
+            del self._entries[code]
+
+        if self._backend == "redis":
+            try:
+                raw = await get_redis().get(f"{KEY_PREFIX}{code}")
+            except Exception as e:
+                logger.error(f"Session code cache read failed: {e}")
+                raw = None
+            if raw is not None:
+                entry = CodeEntry(**json.loads(raw))
+                self._remember(code, entry)
+                session_code_cache_requests.labels(result="hit_redis").inc()
+                return entry
+
+        session_code_cache_requests.labels(result="miss").inc()
+        return None
+
+    async def set(self, code: str, entry: CodeEntry) -> None:
+        remaining = entry.remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            return  # expired codes are answered from the database
+        ttl = int(min(remaining, self._max_ttl)) if remaining is not None else self._max_ttl
+        if ttl <= 0:
+            return
+
+        self._remember(code, entry)
+        if self._backend != "redis":
+            return
+        try:
+            await get_redis().set(f"{KEY_PREFIX}{code}", json.dumps(asdict(entry)), ex=ttl)
+        except Exception as e:
+            logger.error(f"Session code cache write failed: {e}")
+
+    def is_missing(self, code: str) -> bool:
+        """True while `code` has a fresh negative entry."""
+        deadline = self._missing.get(code)
+        if deadline is None:
+            return False
+        if time.monotonic() < deadline:
+            session_code_cache_requests.labels(result="hit_negative").inc()
+            return True
+        del self._missing[code]
+        return False
+
+    def set_missing(self, code: str) -> None:
+        if self._negative_ttl <= 0:
+            return
+        self._missing[code] = time.monotonic() + self._negative_ttl
+        self._missing.move_to_end(code)
+        while len(self._missing) > self._max_entries:
+            self._missing.popitem(last=False)
+
+    async def invalidate(self, *codes: Optional[str]) -> None:
+        await self.invalidate_many(codes)
+
+    async def invalidate_many(self, codes: Iterable[Optional[str]]) -> None:
+        keys = []
+        for code in set(c for c in codes if c):
+            self._entries.pop(code, None)
+            self._missing.pop(code, None)
+            keys.append(f"{KEY_PREFIX}{code}")
+
+        if self._backend != "redis" or not keys:
+            return
+        try:
+            await get_redis().delete(*keys)
+        except Exception as e:
+            logger.error(f"Session code cache invalidation failed: {e}")
+
+    def _remember(self, code: str, entry: CodeEntry) -> None:
+        remaining = entry.remaining_seconds()
+        local_ttl = self._local_ttl if remaining is None else min(self._local_ttl, remaining)
+        self._entries[code] = (time.monotonic() + local_ttl, entry)
+        self._entries.move_to_end(code)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+# Global session code cache for this process
+session_code_cache = SessionCodeCache(
+    max_entries=settings.session_code_cache_max_entries,
+    backend=settings.session_code_cache_backend,
+    local_ttl=settings.session_code_cache_local_ttl,
+    negative_ttl=settings.session_code_negative_ttl,
+)
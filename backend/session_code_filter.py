@@ -0,0 +1,227 @@
+"""
+Bloom filter of assigned session codes
+
+Guessed or mistyped codes on the client join path would each cost a
+unique-index lookup that finds nothing. The filter answers "definitely
+not a session code" without touching the database: it is rebuilt from
+the `sessions` table at startup and on an interval (Bloom filters cannot
+delete, so rebuilding is how released codes drop out) and new codes are
+added as they are created. Expired codes stay in the filter while a
+session still holds them, so their holders keep getting the "expired"
+answer rather than "not found".
+
+With the Redis backend the bitset lives in one Redis string shared by
+every API process, so a code created in one process is visible to the
+others. The local backend keeps the bitset in-process and is only
+correct when a single process creates and looks up codes.
+
+Whenever the filter cannot answer (not built yet, Redis down) lookups
+fall through to the database.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from .config import settings
+from .metrics import (
+    session_code_filter_bytes,
+    session_code_filter_checks,
+    session_code_filter_estimated_fp,
+    session_code_filter_items,
+)
+from .redis_client import get_redis, redis_available
+
+logger = logging.getLogger(__name__)
+
+KEY = "lexnova:codefilter"
+
+# Codes created while a rebuild was scanning the table are re-added
+# after the swap; this covers commits that raced the scan.
+REBUILD_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    Bits are numbered most-significant-first within each byte, the same
+    order Redis uses for SETBIT/GETBIT, so `bits` can be stored as a
+    Redis string as-is.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def offsets(self, item: str) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        for offset in self.offsets(item):
+            self.bits[offset >> 3] |= 0x80 >> (offset & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[offset >> 3] & (0x80 >> (offset & 7)) for offset in self.offsets(item))
+
+    def estimated_false_positive_rate(self, count: Optional[int] = None) -> float:
+        n = self.count if count is None else count
+        return (1 - math.exp(-self.hashes * n / self.size)) ** self.hashes
+
+
+class SessionCodeFilter:
+    """Assigned-code filter in front of the session code lookup."""
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        backend: str = "local",
+        rebuild_interval: float = 3600.0,
+    ):
+        if backend == "redis" and not redis_available():
+            logger.warning("redis package not installed; session code filter is in-process only")
+            backend = "local"
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._backend = backend
+        self._rebuild_interval = rebuild_interval
+        self._filter = BloomFilter(capacity, error_rate)
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def might_exist(self, code: str) -> bool:
+        """False only when `code` is certainly not held by any session."""
+        if not self._ready:
+            return True
+        if self._backend == "redis":
+            try:
+                pipe = get_redis().pipeline(transaction=False)
+                for offset in self._filter.offsets(code):
+                    pipe.getbit(KEY, offset)
+                present = all(await pipe.execute())
+            except Exception as e:
+                logger.error(f"Session code filter read failed: {e}")
+                return True
+        else:
+            present = code in self._filter
+
+        if not present:
+            session_code_filter_checks.labels(result="rejected").inc()
+        return present
+
+    def record_lookup(self, found: bool) -> None:
+        """Record the database outcome of a code the filter let through."""
+        if not self._ready:
+            return
+        session_code_filter_checks.labels(result="passed" if found else "false_positive").inc()
+
+    async def add(self, code: str) -> None:
+        self._filter.add(code)
+        if self._backend == "redis":
+            try:
+                pipe = get_redis().pipeline(transaction=False)
+                for offset in self._filter.offsets(code):
+                    pipe.setbit(KEY, offset, 1)
+                await pipe.execute()
+            except Exception as e:
+                # The shared filter is now missing a code; stop trusting
+                # it in this process until the next rebuild
+                logger.error(f"Session code filter update failed: {e}")
+                self._ready = False
+        self._observe()
+
+    async def rebuild(self) -> None:
+        """Rebuild the filter from the codes held in the sessions table."""
+        from . import database  # database imports this module
+        from .models import Session as SessionModel
+
+        started = datetime.utcnow()
+        codes = await _assigned_codes(database.AsyncSessionLocal, SessionModel)
+        if len(codes) > self._capacity:
+            logger.warning(
+                f"{len(codes)} session codes exceed the filter capacity of {self._capacity}; "
+                "the false positive rate will be above target"
+            )
+        rebuilt = BloomFilter(self._capacity, self._error_rate)
+        for code in codes:
+            rebuilt.add(code)
+
+        if self._backend == "redis":
+            try:
+                redis = get_redis()
+                building = f"{KEY}:building:{uuid.uuid4().hex}"
+                await redis.set(building, bytes(rebuilt.bits))
+                await redis.rename(building, KEY)
+            except Exception as e:
+                logger.error(f"Session code filter rebuild failed: {e}")
+                self._ready = False
+                return
+
+        self._filter = rebuilt
+        self._ready = True
+        for code in await _assigned_codes(database.AsyncSessionLocal, SessionModel, started - REBUILD_OVERLAP):
+            await self.add(code)
+        self._observe()
+        logger.info(f"Session code filter rebuilt with {self._filter.count} codes")
+
+    def start(self) -> None:
+        """Build the filter now and keep rebuilding it in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Session code filter rebuild failed: {e}")
+                self._ready = False
+            await asyncio.sleep(self._rebuild_interval)
+
+    def _observe(self) -> None:
+        session_code_filter_items.set(self._filter.count)
+        session_code_filter_bytes.set(len(self._filter.bits))
+        session_code_filter_estimated_fp.set(self._filter.estimated_false_positive_rate())
+
+
+async def _assigned_codes(session_factory, model, created_since: Optional[datetime] = None) -> List[str]:
+    query = select(model.session_code).where(model.session_code.isnot(None))
+    if created_since is not None:
+        query = query.where(model.created_at >= created_since)
+    async with session_factory() as db:
+        return list(await db.scalars(query))
+
+
+# Global session code filter for this process
+session_code_filter = SessionCodeFilter(
+    capacity=settings.session_code_filter_capacity,
+    error_rate=settings.session_code_filter_error_rate,
+    backend=settings.session_code_filter_backend,
+    rebuild_interval=settings.session_code_filter_rebuild_interval,
+)
@@ -0,0 +1,170 @@
+"""
+Background sweeper that releases expired session codes
+
+Expired codes would otherwise keep their slot in the unique index
+forever (lookups only check `session_code_expires` lazily), shrinking
+the space `generate_session_code` draws from. Every API process runs a
+sweeper, but with the Redis backend only the one holding the leader key
+sweeps: it nulls codes that expired more than `grace` seconds ago in
+batches and reports how many live codes remain.
+
+The grace period keeps the "code has expired" answer for a while before
+a code starts reading as unknown; `create_session` still reclaims an
+expired code on conflict, so allocation never waits for the sweeper.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+
+from . import database
+from .config import settings
+from .metrics import session_codes_live, session_codes_swept
+from .models import Session as SessionModel
+from .redis_client import get_redis, redis_available
+from .session_code_cache import session_code_cache
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = "lexnova:code-sweeper:leader"
+
+# Compare-and-act on the leader key in one step, so a lease that expires
+# between the check and the action is never renewed or deleted for its
+# new holder
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SessionCodeSweeper:
+    """Periodically nulls expired session codes, one leader at a time."""
+
+    def __init__(
+        self,
+        interval: float = 300.0,
+        batch_size: int = 500,
+        grace: float = 3600.0,
+        backend: str = "local",
+    ):
+        if backend == "redis" and not redis_available():
+            logger.warning("redis package not installed; every process sweeps session codes")
+            backend = "local"
+        self._interval = interval
+        self._batch_size = batch_size
+        self._grace = timedelta(seconds=grace)
+        self._backend = backend
+        self._token = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        """Release expired codes in batches; returns how many were released."""
+        cutoff = datetime.utcnow() - self._grace
+        released = 0
+        while True:
+            codes = await self._release_batch(cutoff)
+            if not codes:
+                break
+            released += len(codes)
+            session_codes_swept.inc(len(codes))
+            await session_code_cache.invalidate_many(codes)
+            if len(codes) < self._batch_size:
+                break
+        if released:
+            logger.info(f"Released {released} expired session codes")
+        return released
+
+    async def count_live(self) -> int:
+        async with database.AsyncSessionLocal() as db:
+            return await db.scalar(
+                select(func.count()).select_from(SessionModel).where(
+                    SessionModel.session_code.isnot(None),
+                    SessionModel.session_code_expires > datetime.utcnow(),
+                )
+            )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._backend == "redis":
+            try:
+                await get_redis().eval(RELEASE_SCRIPT, 1, LEADER_KEY, self._token)
+            except Exception as e:
+                logger.error(f"Session code sweeper could not release leadership: {e}")
+
+    async def _release_batch(self, cutoff: datetime) -> List[str]:
+        async with database.AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(SessionModel.id, SessionModel.session_code)
+                .where(
+                    SessionModel.session_code.isnot(None),
+                    SessionModel.session_code_expires < cutoff,
+                )
+                .order_by(SessionModel.session_code_expires)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return []
+            await db.execute(
+                update(SessionModel)
+                .where(SessionModel.id.in_([row.id for row in rows]))
+                .values(session_code=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        return [row.session_code for row in rows]
+
+    async def _is_leader(self) -> bool:
+        if self._backend != "redis":
+            return True
+        try:
+            redis = get_redis()
+            ttl = int(self._interval * 3)
+            if await redis.set(LEADER_KEY, self._token, nx=True, ex=ttl):
+                return True
+            if await redis.eval(RENEW_SCRIPT, 1, LEADER_KEY, self._token, ttl):
+                return True
+        except Exception as e:
+            logger.error(f"Session code sweeper leader election failed: {e}")
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Only the leader reports; other processes leave the gauge alone
+                if await self._is_leader():
+                    await self.sweep()
+                    session_codes_live.set(await self.count_live())
+            except Exception as e:
+                logger.error(f"Session code sweep failed: {e}")
+            await asyncio.sleep(self._interval)
+
+
+# Global session code sweeper for this process
+session_code_sweeper = SessionCodeSweeper(
+    interval=settings.session_code_sweep_interval,
+    batch_size=settings.session_code_sweep_batch_size,
+    grace=settings.session_code_sweep_grace,
+    backend=settings.session_code_sweep_backend,
+)
@@ -0,0 +1,100 @@
+"""
+Event-driven end of an interview in the agent
+
+`SessionLifecycle` listens to the room's disconnect and participant
+events and resolves `wait()` as soon as the agent's part is over: every
+participant has left and not come back within a short grace period (a
+dropped connection may rejoin), which completes the interview, or the
+agent itself was disconnected from the room, which only interrupts it:
+the checkpoint is kept so the next job can resume.
+
+Attach before connecting so an early disconnect is not missed.
+"""
+import asyncio
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import select
+
+from . import database
+from .models import Transcript
+
+logger = logging.getLogger(__name__)
+
+# Reasons that mean the interview is finished rather than interrupted
+COMPLETED_REASONS = {"participants_left"}
+
+
+class SessionLifecycle:
+    """Resolves when the room disconnects or is left empty by its participants."""
+
+    def __init__(self, empty_room_grace: float = 30.0):
+        self._grace = empty_room_grace
+        self._ended = asyncio.Event()
+        self._empty_timer: Optional[asyncio.TimerHandle] = None
+        self._room: Any = None
+        self.reason: Optional[str] = None
+
+    @property
+    def ended(self) -> bool:
+        return self._ended.is_set()
+
+    @property
+    def completed(self) -> bool:
+        return self.reason in COMPLETED_REASONS
+
+    def attach(self, room: Any) -> None:
+        self._room = room
+        room.on("disconnected", self._on_disconnected)
+        room.on("participant_connected", self._on_participant_connected)
+        room.on("participant_disconnected", self._on_participant_disconnected)
+
+    async def wait(self) -> str:
+        await self._ended.wait()
+        return self.reason
+
+    def end(self, reason: str) -> None:
+        if self._ended.is_set():
+            return
+        self._cancel_empty_timer()
+        self.reason = reason
+        logger.info(f"Interview ended: {reason}")
+        self._ended.set()
+
+    def _on_disconnected(self, *args: Any) -> None:
+        self.end("room_disconnected")
+
+    def _on_participant_connected(self, participant: Any) -> None:
+        self._cancel_empty_timer()
+
+    def _on_participant_disconnected(self, participant: Any) -> None:
+        if self._room is None or len(getattr(self._room, "remote_participants", {}) or {}) > 0:
+            return
+        self._cancel_empty_timer()
+        if self._grace <= 0:
+            self.end("participants_left")
+            return
+        self._empty_timer = asyncio.get_running_loop().call_later(
+            self._grace, self.end, "participants_left"
+        )
+
+    def _cancel_empty_timer(self) -> None:
+        if self._empty_timer is not None:
+            self._empty_timer.cancel()
+            self._empty_timer = None
+
+
+async def load_transcript_text(session_id: str) -> str:
+    """Render a session's stored transcript as plain text, one entry per line."""
+    async with database.AsyncSessionLocal() as db:
+        result = await db.stream_scalars(
+            select(Transcript)
+            .where(Transcript.session_id == session_id)
+            .order_by(Transcript.timestamp, Transcript.id)
+            .execution_options(yield_per=500)
+        )
+        lines = [
+            f"[{t.timestamp.isoformat() if t.timestamp else ''}] {t.speaker}: {t.text}"
+            async for t in result
+        ]
+    return "\n".join(lines)
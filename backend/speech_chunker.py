@@ -0,0 +1,124 @@
+"""
+Sentence-chunked LLM -> TTS streaming
+
+The agent should start speaking as soon as the first sentence of a reply
+is known, not after the whole completion. `SpeechChunker` splits streamed
+LLM text deltas at sentence boundaries (and at clause boundaries once a
+chunk is long enough), and `chunk_text_stream` is used as the pipeline's
+`before_tts_cb` so each chunk is handed to TTS the moment it is complete.
+
+When a participant interrupts, the pipeline cancels the reply's synthesis;
+the chunk stream then closes the upstream LLM stream, so no further deltas
+are requested and chunks not yet synthesized are dropped.
+"""
+import logging
+import re
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Union
+
+from .metrics import agent_interrupted_replies
+
+logger = logging.getLogger(__name__)
+
+# Words whose trailing period does not end a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "jr", "sr", "prof", "no", "vs", "etc", "e.g", "i.e"}
+
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+_CLAUSE_END = re.compile(r"[,;:—]+(?=\s)")
+
+
+class SpeechChunker:
+    """
+    Accumulates text deltas and emits speakable chunks.
+
+    A chunk ends at a sentence boundary once it holds at least `min_chars`
+    characters, at a clause boundary once it holds `clause_chars`, and is
+    cut at the last space when it reaches `max_chars` without either.
+    """
+
+    def __init__(self, min_chars: int = 20, clause_chars: int = 80, max_chars: int = 240):
+        self._min_chars = min_chars
+        self._clause_chars = clause_chars
+        self._max_chars = max_chars
+        self._buffer = ""
+
+    @property
+    def pending(self) -> str:
+        return self._buffer
+
+    def push(self, delta: str) -> List[str]:
+        """Add a delta; returns the chunks completed by it."""
+        self._buffer += delta
+        chunks = []
+        while True:
+            end = self._find_boundary()
+            if end is None:
+                break
+            chunk, self._buffer = self._buffer[:end].strip(), self._buffer[end:].lstrip()
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left at the end of the reply."""
+        chunk, self._buffer = self._buffer.strip(), ""
+        return chunk or None
+
+    def _find_boundary(self) -> Optional[int]:
+        text = self._buffer
+        for match in _SENTENCE_END.finditer(text):
+            if match.end() >= self._min_chars and not self._is_abbreviation(text, match.start()):
+                return match.end()
+        if len(text) >= self._clause_chars:
+            for match in _CLAUSE_END.finditer(text, self._min_chars):
+                return match.end()
+        if len(text) >= self._max_chars:
+            space = text.rfind(" ", 0, self._max_chars)
+            return space if space > 0 else self._max_chars
+        return None
+
+    @staticmethod
+    def _is_abbreviation(text: str, dot_index: int) -> bool:
+        if text[dot_index] != ".":
+            return False
+        word = text[:dot_index].rsplit(None, 1)[-1].lower() if text[:dot_index].strip() else ""
+        # Titles ("Mr.") and initials ("J. Smith")
+        return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+async def chunk_text_stream(
+    deltas: AsyncIterable[str],
+    chunker: Optional[SpeechChunker] = None,
+) -> AsyncIterator[str]:
+    """Re-chunk an async stream of text deltas into sentence-sized pieces."""
+    chunker = chunker or SpeechChunker()
+    completed = False
+    try:
+        async for delta in deltas:
+            for chunk in chunker.push(delta):
+                yield chunk
+        tail = chunker.flush()
+        if tail:
+            yield tail
+        completed = True
+    finally:
+        if not completed:
+            # Interrupted: stop pulling LLM deltas and drop what was not spoken yet
+            agent_interrupted_replies.inc()
+            close = getattr(deltas, "aclose", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception as e:
+                    logger.debug(f"Error closing interrupted LLM stream: {e}")
+
+
+def make_before_tts_cb(min_chars: int = 20, clause_chars: int = 80, max_chars: int = 240):
+    """Build a VoicePipelineAgent `before_tts_cb` that chunks streamed replies."""
+
+    def before_tts_cb(agent: Any, source: Union[str, AsyncIterable[str]]) -> Union[str, AsyncIterable[str]]:
+        if isinstance(source, str):
+            # Fixed phrases (agent.say) are synthesized whole, which keeps the phrase cache effective
+            return source
+        return chunk_text_stream(source, SpeechChunker(min_chars, clause_chars, max_chars))
+
+    return before_tts_cb
@@ -0,0 +1,63 @@
+"""
+Unit tests for agent worker latency metrics
+"""
+import os
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from backend.agent_metrics import TurnLatencyRecorder
+
+
+def _turn_count(voice_style):
+    return REGISTRY.get_sample_value(
+        "lexnova_agent_turn_latency_seconds_count", {"voice_style": voice_style}
+    ) or 0
+
+
+class TestTurnLatencyRecorder:
+    """Test per-turn latency aggregation"""
+    
+    def test_turn_recorded_once_all_parts_arrive(self):
+        recorder = TurnLatencyRecorder("test-voice")
+        before = _turn_count("test-voice")
+        
+        recorder.record(SimpleNamespace(sequence_id="s1", end_of_utterance_delay=0.3, transcription_delay=0.2))
+        recorder.record(SimpleNamespace(sequence_id="s1", ttft=0.4))
+        assert _turn_count("test-voice") == before
+        
+        recorder.record(SimpleNamespace(sequence_id="s1", ttfb=0.25))
+        assert _turn_count("test-voice") == before + 1
+        assert REGISTRY.get_sample_value(
+            "lexnova_agent_turn_latency_seconds_sum", {"voice_style": "test-voice"}
+        ) >= 0.95
+
+
+class TestAgentMetricsServer:
+    """Test the multiprocess metrics endpoint of the worker"""
+    
+    def test_serves_main_process_gauges(self, tmp_path):
+        import socket
+        import subprocess
+        import sys
+        
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        
+        # Multiprocess mode is fixed when prometheus_client is imported, so scrape from a fresh process
+        script = (
+            "import urllib.request\n"
+            "from backend.metrics import agent_session_capacity\n"
+            "from backend.agent_metrics import start_agent_metrics_server\n"
+            "agent_session_capacity.set(7)\n"
+            f"start_agent_metrics_server({port})\n"
+            f"print(urllib.request.urlopen('http://127.0.0.1:{port}/metrics').read().decode())\n"
+        )
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+        repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=repo_root, env=env,
+            capture_output=True, text=True, timeout=60, check=True
+        )
+        assert "lexnova_agent_session_capacity 7.0" in result.stdout
@@ -0,0 +1,45 @@
+"""
+Unit tests for prewarmed agent plugin clients
+"""
+from backend.agent_plugins import PluginClients, prewarm_plugins, prewarmed_plugins
+
+
+class CountingBuilder:
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self) -> PluginClients:
+        self.calls += 1
+        if self.fail:
+            raise ValueError("missing API key")
+        return PluginClients(vad=object(), stt=object(), llm=object(), tts={"Rachel": object()})
+
+
+class TestPrewarmedPlugins:
+    """Test that jobs reuse the clients built in prewarm"""
+
+    def test_job_uses_prewarmed_instances(self):
+        userdata = {}
+        build = CountingBuilder()
+        prewarmed = prewarm_plugins(userdata, build)
+
+        assert prewarmed_plugins(userdata, build) is prewarmed
+        assert build.calls == 1
+
+    def test_job_builds_clients_when_not_prewarmed(self):
+        userdata = {}
+        build = CountingBuilder()
+
+        clients = prewarmed_plugins(userdata, build)
+        assert prewarmed_plugins(userdata, build) is clients
+        assert build.calls == 1
+
+    def test_failed_prewarm_leaves_building_to_the_job(self):
+        userdata = {}
+        assert prewarm_plugins(userdata, CountingBuilder(fail=True)) is None
+        assert userdata == {}
+
+        build = CountingBuilder()
+        prewarmed_plugins(userdata, build)
+        assert build.calls == 1
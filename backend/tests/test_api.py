@@ -10,7 +10,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from backend.main import app
 from backend.models import Base
-from backend.database import get_db
+from backend.database import get_db, unit_of_work
+from backend.middleware.rate_limit import limiter
 import asyncio
 
 
@@ -59,9 +60,13 @@ async def test_db(loop):
 async def client(test_db):
     """Create a test client"""
     async def override_get_db():
-        yield test_db
+        # A unit of work per request, like get_db, on the test database
+        async with unit_of_work() as session:
+            yield session
     
     app.dependency_overrides[get_db] = override_get_db
+    # Rate limits are per test, not per run
+    limiter.reset()
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
@@ -211,6 +216,290 @@ class TestSessions:
         data = response.json()
         assert isinstance(data, list)
         assert len(data) >= 1
+    
+    @pytest.mark.asyncio
+    async def test_list_sessions_keyset_pages(self, client):
+        for i in range(5):
+            created = await client.post(
+                "/api/sessions",
+                json={"groomName": f"Groom {i}", "brideName": "Jane Smith", "date": "2024-12-15"}
+            )
+            assert created.status_code == 200
+        
+        seen = []
+        after = None
+        while True:
+            params = {"limit": 2, "includeScript": "false"}
+            if after:
+                params["after"] = after
+            response = await client.get("/api/sessions", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            assert all(s["scriptContent"] is None for s in page)
+            seen.extend(s["id"] for s in page)
+            after = response.headers.get("x-next-cursor")
+            if not after:
+                break
+        
+        assert len(seen) == len(set(seen)) == 5
+        
+        filtered = await client.get("/api/sessions", params={"status": "ready"})
+        assert filtered.json() == []
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_starts_activate_once(self, client):
+        from backend.database import db
+        
+        session_response = await client.post(
+            "/api/sessions",
+            json={"groomName": "John Doe", "brideName": "Jane Smith", "date": "2024-12-15"}
+        )
+        session_id = session_response.json()["id"]
+        
+        pending = await client.post(f"/api/sessions/{session_id}/start")
+        assert pending.status_code == 400
+        assert "pending" in pending.json()["detail"]
+        
+        await db.update_session_script(session_id, "Question 1: State your name")
+        responses = await asyncio.gather(
+            *(client.post(f"/api/sessions/{session_id}/start") for _ in range(5))
+        )
+        assert sorted(r.status_code for r in responses) == [200, 400, 400, 400, 400]
+        
+        missing = await client.post("/api/sessions/does-not-exist/start")
+        assert missing.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_expired_session_code_is_reclaimed(self, client, test_db, monkeypatch):
+        from datetime import datetime, timedelta
+        import backend.database as dbmod
+        from backend.models import Session as SessionModel, SessionStatus
+        from backend.schemas import SessionCreate
+
+        test_db.add(SessionModel(
+            id="old", groom_name="John", bride_name="Jane", date="2024-12-15",
+            status=SessionStatus.COMPLETED, session_code="ABC234",
+            session_code_expires=datetime.utcnow() - timedelta(hours=1)
+        ))
+        await test_db.commit()
+
+        monkeypatch.setattr(dbmod, "generate_session_code", lambda: "ABC234")
+        payload = SessionCreate(groomName="John Doe", brideName="Jane Smith", date="2024-12-15")
+        session_id = (await dbmod.db.create_session(payload)).id
+
+        info = await client.get("/api/client/session/ABC234")
+        assert info.status_code == 200
+        assert info.json()["session_id"] == session_id
+        assert info.json()["status"] == "pending"
+
+        # The code is live now, so a second create has to give up
+        with pytest.raises(dbmod.SessionCodeAllocationError):
+            await dbmod.db.create_session(payload)
+
+        # Status changes invalidate the cached lookup
+        await dbmod.db.update_session_script(session_id, "Question 1: State your name")
+        info = await client.get("/api/client/session/ABC234")
+        assert info.json()["status"] == "ready"
+
+    @pytest.mark.asyncio
+    async def test_code_filter_rejects_unknown_codes(self, client, test_db, monkeypatch):
+        import backend.database as dbmod
+        from backend.routers import client_auth
+        from backend.schemas import SessionCreate
+        from backend.session_code_filter import SessionCodeFilter
+
+        payload = SessionCreate(groomName="John Doe", brideName="Jane Smith", date="2024-12-15")
+        monkeypatch.setattr(dbmod, "generate_session_code", lambda: "XYZ789")
+        await dbmod.db.create_session(payload)
+
+        code_filter = SessionCodeFilter(capacity=1000, error_rate=0.001)
+        assert await code_filter.might_exist("QQQ111")  # not built yet: no opinion
+        await code_filter.rebuild()
+        monkeypatch.setattr(dbmod, "session_code_filter", code_filter)
+        monkeypatch.setattr(client_auth, "session_code_filter", code_filter)
+
+        assert await code_filter.might_exist("XYZ789")
+        assert not await code_filter.might_exist("QQQ111")
+        assert (await client.get("/api/client/session/QQQ111")).status_code == 404
+
+        # Newly created codes are added straight away
+        monkeypatch.setattr(dbmod, "generate_session_code", lambda: "QQQ111")
+        session = await dbmod.db.create_session(payload)
+        info = await client.get("/api/client/session/QQQ111")
+        assert info.status_code == 200
+        assert info.json()["session_id"] == session.id
+
+    @pytest.mark.asyncio
+    async def test_sweeper_releases_expired_codes(self, test_db):
+        from datetime import datetime, timedelta
+        from sqlalchemy import select
+        from backend.models import Session as SessionModel, SessionStatus
+        from backend.session_code_sweeper import SessionCodeSweeper
+
+        now = datetime.utcnow()
+        expiries = [now - timedelta(hours=2)] * 7 + [now - timedelta(minutes=10), now + timedelta(hours=2)]
+        for i, expires in enumerate(expiries):
+            test_db.add(SessionModel(
+                id=f"s{i}", groom_name="John", bride_name="Jane", date="2024-12-15",
+                status=SessionStatus.COMPLETED, session_code=f"CODE{i:02d}",
+                session_code_expires=expires
+            ))
+        await test_db.commit()
+
+        sweeper = SessionCodeSweeper(batch_size=3, grace=3600)
+        assert await sweeper.sweep() == 7
+        assert await sweeper.sweep() == 0
+        assert await sweeper.count_live() == 1
+
+        held = await test_db.scalars(
+            select(SessionModel.session_code).where(SessionModel.session_code.isnot(None))
+        )
+        # Recently expired codes are kept for the grace period
+        assert sorted(held) == ["CODE07", "CODE08"]
+
+    @pytest.mark.asyncio
+    async def test_sweeper_lease_is_only_renewed_or_released_by_its_holder(self, test_db, monkeypatch):
+        from prometheus_client import REGISTRY
+        import backend.session_code_sweeper as sweepers
+
+        class FakeRedis:
+            def __init__(self):
+                self.data = {}
+
+            async def set(self, key, value, nx=False, ex=None):
+                if nx and key in self.data:
+                    return None
+                self.data[key] = value
+                return True
+
+            async def eval(self, script, numkeys, key, token, *args):
+                # The scripts run atomically on the server
+                if self.data.get(key) != token:
+                    return 0
+                if script == sweepers.RELEASE_SCRIPT:
+                    del self.data[key]
+                return 1
+
+        server = FakeRedis()
+        monkeypatch.setattr(sweepers, "get_redis", lambda: server)
+        first = sweepers.SessionCodeSweeper(interval=0.01, backend="redis")
+        second = sweepers.SessionCodeSweeper(interval=0.01, backend="redis")
+
+        assert await first._is_leader()
+        assert not await second._is_leader()
+
+        # The first lease expires and the second process takes over
+        server.data.clear()
+        assert await second._is_leader()
+        assert not await first._is_leader()
+        await first.stop()
+        assert server.data[sweepers.LEADER_KEY] == second._token
+
+        # A process that is not the leader leaves the live-code gauge alone
+        sweepers.session_codes_live.set(5)
+        first.start()
+        await asyncio.sleep(0.05)
+        await first.stop()
+        assert REGISTRY.get_sample_value("lexnova_session_codes_live") == 5
+
+        await second.stop()
+        assert server.data == {}
+
+
+class TestUnitOfWork:
+    """Test the request-scoped unit of work"""
+    
+    @pytest.mark.asyncio
+    async def test_commits_only_when_written(self, test_db):
+        from sqlalchemy import select
+        from backend.database import after_commit
+        from backend.models import Session as SessionModel, SessionStatus
+        
+        committed = []
+        
+        async def on_commit():
+            committed.append(True)
+        
+        async with unit_of_work(read_only=True) as session:
+            await session.execute(select(SessionModel))
+            assert not session.new
+        
+        async with unit_of_work() as session:
+            session.add(SessionModel(
+                id="uow-1", groom_name="John", bride_name="Jane",
+                date="2024-12-15", status=SessionStatus.PENDING
+            ))
+            after_commit(session, on_commit)
+        assert committed == [True]
+        
+        with pytest.raises(RuntimeError):
+            async with unit_of_work() as session:
+                session.add(SessionModel(
+                    id="uow-2", groom_name="John", bride_name="Jane",
+                    date="2024-12-15", status=SessionStatus.PENDING
+                ))
+                after_commit(session, on_commit)
+                await session.flush()
+                raise RuntimeError("boom")
+        assert committed == [True]
+        
+        ids = await test_db.scalars(select(SessionModel.id).where(SessionModel.id.like("uow-%")))
+        assert list(ids) == ["uow-1"]
+
+
+class TestReadReplica:
+    """Test routing of read-only queries to a replica"""
+    
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_until_it_lags(self, client, tmp_path, monkeypatch):
+        import backend.database as dbmod
+        from backend.db_replica import ReplicaMonitor
+        from backend.models import Session as SessionModel, SessionStatus
+        from backend.schemas import SessionCreate
+        
+        # A second SQLite database stands in for the replica
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+        async with replica.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        replica_factory = sessionmaker(replica, class_=AsyncSession, expire_on_commit=False)
+        async with replica_factory() as session:
+            session.add(SessionModel(
+                id="on-replica", groom_name="John", bride_name="Jane",
+                date="2024-12-15", status=SessionStatus.PENDING, session_code="RPL234"
+            ))
+            await session.commit()
+        
+        monitor = ReplicaMonitor(replica, max_lag=5.0)
+        monkeypatch.setattr(dbmod, "replica_engine", replica)
+        monkeypatch.setattr(dbmod, "ReplicaSessionLocal", replica_factory)
+        monkeypatch.setattr(dbmod, "replica_monitor", monitor)
+        
+        # Not measured yet: primary
+        sessions, _ = await dbmod.db.list_sessions()
+        assert sessions == []
+        
+        assert await monitor.check() == 0.0
+        sessions, _ = await dbmod.db.list_sessions()
+        assert [s.id for s in sessions] == ["on-replica"]
+        
+        # Codes missing on the replica are looked up on the primary
+        monkeypatch.setattr(dbmod, "generate_session_code", lambda: "PRM234")
+        primary_session = await dbmod.db.create_session(
+            SessionCreate(groomName="John Doe", brideName="Jane Smith", date="2024-12-15")
+        )
+        info = await client.get("/api/client/session/PRM234")
+        assert info.json()["session_id"] == primary_session.id
+        
+        async def lagging():
+            return 30.0
+        monkeypatch.setattr(monitor, "_measure", lagging)
+        await monitor.check()
+        assert not monitor.usable
+        sessions, _ = await dbmod.db.list_sessions()
+        assert [s.id for s in sessions] == [primary_session.id]
+        
+        await replica.dispose()
 
 
 class TestDocuments:
@@ -239,3 +528,323 @@ class TestDocuments:
         )
         assert response.status_code == 200
         assert response.json()["status"] == "ready"
+
+
+class TestTranscripts:
+    """Test transcript persistence"""
+    
+    @pytest.mark.asyncio
+    async def test_write_behind_preserves_order(self, test_db):
+        from sqlalchemy import select
+        from backend.models import Transcript
+        from backend.transcript import TranscriptManager, TranscriptWriter
+        
+        writer = TranscriptWriter(batch_size=2, flush_interval=60)
+        manager = TranscriptManager("sess1", writer=writer)
+        for i in range(5):
+            await manager.add_entry("AI Officer", f"utterance {i}")
+        await writer.close()
+        
+        assert writer.pending == 0
+        result = await test_db.execute(
+            select(Transcript).where(Transcript.session_id == "sess1").order_by(Transcript.timestamp)
+        )
+        assert [t.text for t in result.scalars().all()] == [f"utterance {i}" for i in range(5)]
+    
+    @pytest.mark.asyncio
+    async def test_journal_replay_is_idempotent(self, test_db, tmp_path):
+        from sqlalchemy import func, select
+        from backend.models import Transcript
+        from backend.transcript import TranscriptManager, TranscriptWriter
+        from backend.transcript_journal import TranscriptJournal, replay_directory
+        
+        journal = TranscriptJournal(str(tmp_path))
+        writer = TranscriptWriter(flush_interval=60, journal=journal)
+        manager = TranscriptManager("sess2", writer=writer)
+        await manager.add_entry("AI Officer", "Good day.")
+        await manager.add_entry("Groom", "John Doe.")
+        await writer.flush()
+        journal.close()
+        
+        # Segment left behind as if the worker crashed after the insert
+        assert await replay_directory(str(tmp_path), min_age_seconds=0) == 2
+        count = await test_db.execute(
+            select(func.count()).select_from(Transcript).where(Transcript.session_id == "sess2")
+        )
+        assert count.scalar_one() == 2
+        assert list(tmp_path.iterdir()) == []
+    
+    @pytest.mark.asyncio
+    async def test_bad_row_is_dead_lettered_without_blocking_the_queue(self, test_db, tmp_path):
+        from datetime import datetime
+        from sqlalchemy import select
+        from backend.models import Transcript
+        from backend.transcript import TranscriptManager, TranscriptWriter
+        from backend.transcript_journal import TranscriptJournal, read_segment
+
+        journal = TranscriptJournal(str(tmp_path))
+        writer = TranscriptWriter(batch_size=10, flush_interval=60, batch_retries=2, journal=journal)
+        manager = TranscriptManager("sess-dl", writer=writer)
+        await manager.add_entry("AI Officer", "before")
+        await writer.enqueue({
+            "id": "00000000-0000-7000-8000-000000000001", "session_id": "sess-dl",
+            "speaker": None, "text": "bad", "timestamp": datetime.utcnow(),
+        })
+        await manager.add_entry("AI Officer", "after")
+
+        with pytest.raises(Exception):
+            await writer.flush()
+        assert writer.pending == 3
+
+        await writer.flush()
+        assert writer.pending == 0
+        result = await test_db.execute(
+            select(Transcript).where(Transcript.session_id == "sess-dl").order_by(Transcript.timestamp)
+        )
+        assert [t.text for t in result.scalars().all()] == ["before", "after"]
+        dead = list(read_segment(str(tmp_path / "dead-letter" / "sess-dl.jsonl")))
+        assert [row["text"] for row in dead] == ["bad"]
+        journal.close()
+
+    @pytest.mark.asyncio
+    async def test_broadcaster_delivers_to_session_subscribers(self):
+        from datetime import datetime
+        from backend.transcript_events import TranscriptBroadcaster
+        
+        broadcaster = TranscriptBroadcaster(backend="local")
+        async with broadcaster.subscribe("sess3") as queue:
+            await broadcaster.publish([
+                {"id": "t1", "session_id": "sess3", "speaker": "Bride", "text": "Yes.", "timestamp": datetime.utcnow()},
+                {"id": "t2", "session_id": "other", "speaker": "Groom", "text": "No.", "timestamp": datetime.utcnow()},
+            ])
+            assert queue.get_nowait()["id"] == "t1"
+            assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_redis_subscribe_waits_for_confirmation_and_overflows_on_reconnect(self, monkeypatch):
+        from datetime import datetime
+        import backend.transcript_events as events
+
+        class FakePubSub:
+            def __init__(self, server):
+                self.server = server
+                self.channels = set()
+                self.messages = asyncio.Queue()
+
+            async def subscribe(self, *channels):
+                self.channels.update(channels)
+                self.server.pubsubs.add(self)
+                asyncio.get_running_loop().create_task(self._confirm(channels))
+
+            async def _confirm(self, channels):
+                await self.server.confirming.wait()
+                for channel in channels:
+                    self.messages.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+            async def unsubscribe(self, *channels):
+                self.channels.difference_update(channels)
+
+            async def get_message(self, timeout):
+                try:
+                    message = await asyncio.wait_for(self.messages.get(), timeout)
+                except asyncio.TimeoutError:
+                    return None
+                if isinstance(message, Exception):
+                    raise message
+                return message
+
+            async def aclose(self):
+                self.server.pubsubs.discard(self)
+
+        class FakeRedis:
+            def __init__(self):
+                self.pubsubs = set()
+                self.confirming = asyncio.Event()
+
+            def pubsub(self):
+                return FakePubSub(self)
+
+            async def publish(self, channel, data):
+                for pubsub in list(self.pubsubs):
+                    if channel in pubsub.channels:
+                        pubsub.messages.put_nowait({"type": "message", "channel": channel, "data": data})
+
+        server = FakeRedis()
+        monkeypatch.setattr(events, "get_redis", lambda: server)
+        broadcaster = events.TranscriptBroadcaster(backend="redis", reconnect_delay=0)
+        row = {"id": "t1", "session_id": "sess4", "speaker": "Bride", "text": "Yes.", "timestamp": datetime.utcnow()}
+
+        server.confirming.set()
+        async with broadcaster.subscribe("other"):
+            server.confirming.clear()
+            subscription = broadcaster.subscribe("sess4")
+            subscribing = asyncio.ensure_future(subscription.__aenter__())
+            await asyncio.sleep(0.05)
+            assert not subscribing.done()
+            server.confirming.set()
+            queue = await asyncio.wait_for(subscribing, 1)
+
+            await broadcaster.publish([row])
+            assert (await asyncio.wait_for(queue.get(), 1))["id"] == "t1"
+
+            # Rows published while the connection is down are lost; the subscriber must backfill
+            next(iter(server.pubsubs)).messages.put_nowait(ConnectionError("connection lost"))
+            assert await asyncio.wait_for(queue.get(), 1) is events.OVERFLOW
+
+            async with broadcaster.subscribe("sess4") as resumed:
+                await broadcaster.publish([dict(row, id="t2")])
+                assert (await asyncio.wait_for(resumed.get(), 1))["id"] == "t2"
+            await subscription.__aexit__(None, None, None)
+
+
+class TestInterviewCheckpoints:
+    """Test agent crash-recovery state"""
+    
+    @pytest.mark.asyncio
+    async def test_checkpoint_round_trip_and_resume(self, test_db):
+        from backend.chat_context import ChatContextWindow
+        from backend.interview_checkpoint import (CheckpointStore, InterviewCheckpointer,
+                                                  load_for_resume)
+        from backend.transcript import TranscriptManager, TranscriptWriter
+        from backend.transcript_capture import SpeakerLabelMapper
+        
+        script = "Question 1: What is your full name?\nQuestion 2: Where did you first meet?"
+        window = ChatContextWindow(script, message_factory=lambda role, content: (role, content))
+        window.restore(["- Officer: What is your full name?"], [0])
+        speakers = SpeakerLabelMapper("John Doe", "Jane Smith")
+        speakers.resolve("speaker 0", "My name is John Doe")
+        
+        store = CheckpointStore(backend="database")
+        checkpointer = InterviewCheckpointer("sess-cp", store, window, speakers, greeted=True)
+        await checkpointer.save()
+        
+        writer = TranscriptWriter(flush_interval=60)
+        manager = TranscriptManager("sess-cp", writer=writer)
+        for i in range(4):
+            await manager.add_entry("John Doe", f"answer {i}")
+        await writer.close()
+        
+        state, entries = await load_for_resume("sess-cp", store, transcript_limit=2)
+        assert state.greeted
+        assert state.speakers == {"speaker 0": "John Doe"}
+        assert state.context["asked"] == [0]
+        assert entries == [("John Doe", "answer 2"), ("John Doe", "answer 3")]
+        
+        await checkpointer.stop(discard=True)
+        assert await store.load("sess-cp") is None
+
+    def test_resumed_history_is_not_summarized_twice(self):
+        from types import SimpleNamespace
+        from backend.chat_context import SUMMARY_MARKER, ChatContextWindow, message_text
+        from backend.interview_checkpoint import resume_history
+        from backend.transcript_capture import AGENT_SPEAKER
+
+        make_message = lambda role, content: SimpleNamespace(role=role, content=content)
+        script = "Question 1: What is your full name?\nQuestion 2: Where did you first meet?"
+        window = ChatContextWindow(script, message_factory=make_message, max_tokens=600, min_recent_messages=4)
+        window.restore(["- Officer: What is your full name?"], [0])
+        entries = []
+        for i in range(12):
+            entries.append((AGENT_SPEAKER, f"Question number {i}, please answer in detail for the record."))
+            entries.append(("John Doe", f"This is my fairly long answer number {i} for the record."))
+
+        history = resume_history(entries, "You are a verification officer.", window, make_message)
+        assert len(history) == len(entries)
+        assert not any(message_text(m).startswith(SUMMARY_MARKER) for m in history)
+
+        # The pipeline hands over a fresh copy of the seeded history plus new turns every turn
+        conversation = [make_message("system", "You are a verification officer.")] + history
+        for i in range(12, 16):
+            conversation.append(make_message("assistant", f"Question number {i}, please answer in detail for the record."))
+            conversation.append(make_message("user", f"John Doe: This is my fairly long answer number {i} for the record."))
+            window.apply(list(conversation))
+
+        summary_lines = [line for line in window.summary.splitlines() if not line.startswith("- (")]
+        assert len(summary_lines) == len(set(summary_lines))
+
+
+class TestReports:
+    """Test session report endpoints"""
+    
+    @pytest.mark.asyncio
+    async def test_transcript_keyset_pagination(self, client, test_db):
+        from datetime import datetime, timedelta
+        from backend.models import Transcript
+        from backend.utils.ids import new_id
+        
+        session_response = await client.post(
+            "/api/sessions",
+            json={"groomName": "John Doe", "brideName": "Jane Smith", "date": "2024-12-15"}
+        )
+        session_id = session_response.json()["id"]
+        start = datetime.utcnow()
+        ids = [new_id() for _ in range(5)]
+        for i, transcript_id in enumerate(ids):
+            test_db.add(Transcript(
+                id=transcript_id, session_id=session_id, speaker="AI Officer",
+                text=f"line {i}", timestamp=start + timedelta(seconds=i)
+            ))
+        await test_db.commit()
+        
+        first = (await client.get(f"/api/sessions/{session_id}/transcripts?limit=3")).json()
+        assert [t["text"] for t in first["items"]] == ["line 0", "line 1", "line 2"]
+        assert first["nextCursor"] == ids[2]
+        
+        second = (await client.get(f"/api/sessions/{session_id}/transcripts?limit=3&after={ids[2]}")).json()
+        assert [t["text"] for t in second["items"]] == ["line 3", "line 4"]
+        assert second["nextCursor"] is None
+        
+        report = (await client.get(f"/api/sessions/{session_id}/report")).json()
+        assert len(report["transcripts"]) == 5
+    
+    @pytest.mark.asyncio
+    async def test_streamed_report_matches_schema(self, client, test_db):
+        from backend.models import Transcript
+        
+        session_response = await client.post(
+            "/api/sessions",
+            json={"groomName": "John Doe", "brideName": "Jane Smith", "date": "2024-12-15"}
+        )
+        session_id = session_response.json()["id"]
+        test_db.add(Transcript(session_id=session_id, speaker="Groom", text="I do."))
+        await test_db.commit()
+        
+        regular = (await client.get(f"/api/sessions/{session_id}/report")).json()
+        streamed = (await client.get(f"/api/sessions/{session_id}/report?stream=true")).json()
+        assert streamed == regular
+    
+    @pytest.mark.asyncio
+    async def test_completed_report_conditional_get(self, client):
+        from backend.database import db
+        from backend.models import SessionStatus
+        
+        session_response = await client.post(
+            "/api/sessions",
+            json={"groomName": "John Doe", "brideName": "Jane Smith", "date": "2024-12-15"}
+        )
+        session_id = session_response.json()["id"]
+        await db.update_session_status(session_id, SessionStatus.COMPLETED)
+        
+        first = await client.get(f"/api/sessions/{session_id}/report")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        
+        second = await client.get(f"/api/sessions/{session_id}/report", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+    
+    @pytest.mark.asyncio
+    async def test_local_report_cache_entries_expire(self, monkeypatch):
+        from types import SimpleNamespace
+        import backend.report_cache as cache_module
+        from backend.report_cache import CachedReport, ReportCache
+        
+        now = [1000.0]
+        monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        cache = ReportCache(local_ttl=5.0)
+        await cache.set("sess-rc", CachedReport(etag='"abc"', body="{}"))
+        assert (await cache.get("sess-rc")).etag == '"abc"'
+        
+        # Invalidated in another process: this one stops serving it after local_ttl
+        now[0] += 5.0
+        assert await cache.get("sess-rc") is None
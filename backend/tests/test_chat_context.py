@@ -0,0 +1,81 @@
+"""
+Unit tests for the bounded agent chat context
+"""
+from dataclasses import dataclass
+
+from backend.chat_context import SUMMARY_MARKER, ChatContextWindow, estimate_tokens, message_text
+
+
+@dataclass
+class Message:
+    role: str
+    content: str
+
+
+SCRIPT = "Question 1: What is your full name?\nQuestion 2: Where did you first meet?\nQuestion 3: Do you consent freely?"
+
+
+def make_window(max_tokens=300):
+    return ChatContextWindow(SCRIPT, message_factory=Message, max_tokens=max_tokens, min_recent_messages=4)
+
+
+class TestChatContextWindow:
+    """Test context trimming and script progress"""
+    
+    def test_history_is_trimmed_under_budget(self):
+        window = make_window()
+        messages = [Message("system", "You are a verification officer.")]
+        for i in range(60):
+            messages.append(Message("assistant", f"Question number {i}, please answer in detail for the record."))
+            messages.append(Message("user", f"This is my fairly long answer number {i} for the record."))
+        
+        tokens = window.apply(messages)
+        
+        assert tokens <= 300
+        assert messages[0].content == "You are a verification officer."
+        assert message_text(messages[1]).startswith(SUMMARY_MARKER)
+        assert messages[-1].content.endswith("answer number 59 for the record.")
+        assert tokens == sum(estimate_tokens(m.content) for m in messages)
+    
+    def test_tracks_script_progress(self):
+        window = make_window(max_tokens=6000)
+        messages = [
+            Message("system", "prompt"),
+            Message("assistant", "Thank you. What is your full name?"),
+            Message("user", "John Doe"),
+        ]
+        window.apply(messages)
+        
+        assert window.next_question_index == 1
+        assert "NEXT QUESTION: Where did you first meet?" in messages[1].content
+    
+    def test_copied_contexts_are_not_summarized_twice(self):
+        import copy
+        
+        window = make_window()
+        conversation = [Message("system", "You are a verification officer.")]
+        for i in range(30):
+            conversation.append(Message("assistant", f"Question number {i}, please answer in detail for the record."))
+            conversation.append(Message("user", f"This is my fairly long answer number {i} for the record."))
+        
+        # The pipeline hands over a fresh copy of the full history every turn
+        first = copy.deepcopy(conversation)
+        window.apply(first)
+        conversation.append(Message("assistant", "Question number 30, please answer in detail for the record."))
+        conversation.append(Message("user", "This is my fairly long answer number 30 for the record."))
+        second = copy.deepcopy(conversation)
+        tokens = window.apply(second)
+        
+        summary_lines = [line for line in window.summary.splitlines() if not line.startswith("- (")]
+        assert len(summary_lines) == len(set(summary_lines))
+        assert sum(message_text(m).startswith(SUMMARY_MARKER) for m in second) == 1
+        assert tokens <= 300
+        
+        # Same result as trimming one list in place
+        in_place = make_window()
+        messages = copy.deepcopy(conversation[:-2])
+        in_place.apply(messages)
+        messages.extend(copy.deepcopy(conversation[-2:]))
+        in_place.apply(messages)
+        assert in_place.summary == window.summary
+        assert [m.content for m in messages] == [m.content for m in second]
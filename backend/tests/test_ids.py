@@ -0,0 +1,32 @@
+"""
+Unit tests for time-ordered identifiers
+"""
+import uuid
+from datetime import datetime
+
+from backend.utils.ids import id_timestamp, is_uuid, new_id, uuid7
+
+
+class TestUuid7:
+    """Test UUIDv7 layout and ordering"""
+
+    def test_version_and_variant(self):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_ids_increase_within_a_process(self):
+        ids = [new_id() for _ in range(10_000)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_embeds_the_given_timestamp(self):
+        at = datetime(2024, 12, 15, 10, 30, 0, 123000)
+        assert id_timestamp(new_id(at)) == at
+        assert new_id(at) < new_id(datetime(2024, 12, 15, 10, 30, 1))
+
+    def test_is_uuid(self):
+        assert is_uuid(new_id())
+        assert is_uuid(str(uuid.uuid4()))
+        assert not is_uuid("t2")
+        assert not is_uuid("")
@@ -0,0 +1,42 @@
+"""
+Unit tests for the session code Bloom filter
+"""
+import random
+import string
+
+from backend.session_code_filter import BloomFilter
+
+
+def _codes(count, seed):
+    rng = random.Random(seed)
+    alphabet = string.ascii_uppercase + string.digits
+    return {"".join(rng.choice(alphabet) for _ in range(6)) for _ in range(count)}
+
+
+class TestBloomFilter:
+    """Test filter sizing and membership"""
+
+    def test_sized_from_capacity_and_error_rate(self):
+        bloom = BloomFilter(capacity=100_000, error_rate=0.001)
+        # ~14.4 bits and 10 hashes per item at 0.1%
+        assert 175_000 < len(bloom.bits) < 185_000
+        assert bloom.hashes == 10
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=5_000, error_rate=0.01)
+        members = _codes(5_000, seed=1)
+        for code in members:
+            bloom.add(code)
+        assert all(code in bloom for code in members)
+
+        others = _codes(20_000, seed=2) - members
+        false_positives = sum(code in bloom for code in others)
+        assert false_positives / len(others) < 0.02
+        assert 0.005 < bloom.estimated_false_positive_rate() < 0.02
+
+    def test_bits_use_redis_bit_order(self):
+        bloom = BloomFilter(capacity=10, error_rate=0.1)
+        bloom.add("ABC234")
+        for offset in bloom.offsets("ABC234"):
+            # Redis GETBIT numbers bits from the most significant end
+            assert (bloom.bits[offset // 8] >> (7 - offset % 8)) & 1
@@ -0,0 +1,86 @@
+"""
+Unit tests for the agent's event-driven session lifecycle
+"""
+import asyncio
+
+import pytest
+
+from backend.session_lifecycle import SessionLifecycle
+
+
+class FakeRoom:
+    def __init__(self):
+        self.remote_participants = {}
+        self._handlers = {}
+
+    def on(self, event, handler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, *args):
+        for handler in self._handlers.get(event, []):
+            handler(*args)
+
+    def join(self, identity):
+        self.remote_participants[identity] = identity
+        self.emit("participant_connected", identity)
+
+    def leave(self, identity):
+        self.remote_participants.pop(identity)
+        self.emit("participant_disconnected", identity)
+
+
+class TestSessionLifecycle:
+    """Test end-of-interview detection"""
+
+    @pytest.mark.asyncio
+    async def test_room_disconnect_ends_immediately(self):
+        room = FakeRoom()
+        lifecycle = SessionLifecycle()
+        lifecycle.attach(room)
+
+        room.emit("disconnected")
+        assert await asyncio.wait_for(lifecycle.wait(), 1) == "room_disconnected"
+        # The agent lost the room; the interview is only interrupted
+        assert not lifecycle.completed
+
+    @pytest.mark.asyncio
+    async def test_attach_before_connect(self):
+        room = FakeRoom()
+        lifecycle = SessionLifecycle(empty_room_grace=0)
+        lifecycle.attach(room)
+        assert not lifecycle.ended
+
+        room.join("groom")
+        await asyncio.sleep(0.01)
+        assert not lifecycle.ended
+
+        room.leave("groom")
+        assert await asyncio.wait_for(lifecycle.wait(), 1) == "participants_left"
+        assert lifecycle.completed
+
+    @pytest.mark.asyncio
+    async def test_empty_room_ends_after_grace(self):
+        room = FakeRoom()
+        lifecycle = SessionLifecycle(empty_room_grace=0.05)
+        lifecycle.attach(room)
+        room.join("groom")
+        room.join("bride")
+
+        room.leave("groom")
+        await asyncio.sleep(0.1)
+        assert not lifecycle.ended
+
+        room.leave("bride")
+        assert await asyncio.wait_for(lifecycle.wait(), 1) == "participants_left"
+
+    @pytest.mark.asyncio
+    async def test_rejoin_cancels_grace(self):
+        room = FakeRoom()
+        lifecycle = SessionLifecycle(empty_room_grace=0.05)
+        lifecycle.attach(room)
+        room.join("groom")
+
+        room.leave("groom")
+        room.join("groom")
+        await asyncio.sleep(0.1)
+        assert not lifecycle.ended
@@ -0,0 +1,77 @@
+"""
+Unit tests for sentence-chunked LLM -> TTS streaming
+"""
+import asyncio
+
+import pytest
+
+from backend.speech_chunker import SpeechChunker, chunk_text_stream, make_before_tts_cb
+
+
+def push_all(chunker, deltas):
+    chunks = []
+    for delta in deltas:
+        chunks.extend(chunker.push(delta))
+    tail = chunker.flush()
+    return chunks + ([tail] if tail else [])
+
+
+class TestSpeechChunker:
+    """Test chunk boundaries"""
+
+    def test_splits_at_sentence_boundaries(self):
+        chunker = SpeechChunker(min_chars=10)
+        deltas = ["Thank you", " for confirming. ", "Could you please", " state where you met? ", "Take your time"]
+
+        assert push_all(chunker, deltas) == [
+            "Thank you for confirming.",
+            "Could you please state where you met?",
+            "Take your time",
+        ]
+
+    def test_first_chunk_is_emitted_before_the_reply_ends(self):
+        chunker = SpeechChunker(min_chars=10)
+        assert chunker.push("Thank you for confirming. Could") == ["Thank you for confirming."]
+        assert chunker.pending == "Could"
+
+    def test_short_sentences_and_abbreviations_are_merged(self):
+        chunker = SpeechChunker(min_chars=20)
+        deltas = ["Yes. ", "Mr. Doe, please ", "confirm your name. ", "Thanks"]
+
+        assert push_all(chunker, deltas) == ["Yes. Mr. Doe, please confirm your name.", "Thanks"]
+
+    def test_long_clauses_and_run_ons_are_cut(self):
+        chunker = SpeechChunker(min_chars=10, clause_chars=40, max_chars=60)
+        clause = push_all(chunker, ["For the official record of this interview, please state your full name"])
+        assert clause[0] == "For the official record of this interview,"
+
+        run_on = push_all(SpeechChunker(min_chars=10, clause_chars=500, max_chars=30), ["word " * 20])
+        assert all(len(chunk) <= 30 for chunk in run_on)
+        assert " ".join(run_on) == ("word " * 20).strip()
+
+
+class TestChunkTextStream:
+    """Test the streaming before_tts_cb"""
+
+    def test_fixed_phrases_pass_through(self):
+        assert make_before_tts_cb()(None, "Good day.") == "Good day."
+
+    @pytest.mark.asyncio
+    async def test_interruption_closes_the_llm_stream(self):
+        requested = []
+        closed = asyncio.Event()
+
+        async def llm_deltas():
+            try:
+                for i in range(100):
+                    requested.append(i)
+                    yield f"Sentence number {i} of the reply. "
+            finally:
+                closed.set()
+
+        stream = chunk_text_stream(llm_deltas(), SpeechChunker(min_chars=10))
+        assert await stream.__anext__() == "Sentence number 0 of the reply."
+        await stream.aclose()  # the pipeline cancels synthesis on interruption
+
+        assert closed.is_set()
+        assert len(requested) < 5
@@ -0,0 +1,27 @@
+"""
+Unit tests for pipeline-event transcript capture
+"""
+from backend.transcript_capture import UNLABELLED_SPEAKER, SpeakerLabelMapper, split_speaker_label
+
+
+class TestSpeakerLabelMapper:
+    """Test diarization label mapping"""
+    
+    def test_maps_labels_from_name_introductions(self):
+        mapper = SpeakerLabelMapper("John Doe", "Jane Smith")
+        assert mapper.resolve("speaker 1", "My name is Jane Smith") == "Jane Smith"
+        assert mapper.resolve("speaker 0", "I am John") == "John Doe"
+        assert mapper.resolve("speaker 1", "Yes, I do.") == "Jane Smith"
+        assert mapper.mapping == {"speaker 1": "Jane Smith", "speaker 0": "John Doe"}
+    
+    def test_unnamed_label_takes_remaining_participant(self):
+        mapper = SpeakerLabelMapper("John Doe", "Jane Smith")
+        mapper.resolve("speaker 0", "My name is Jane Smith")
+        assert mapper.resolve("speaker 1", "Hello there") == "John Doe"
+        assert mapper.resolve("speaker 2", "Who am I?").startswith("Unidentified")
+    
+    def test_unlabelled_text(self):
+        mapper = SpeakerLabelMapper("John Doe", "Jane Smith")
+        assert mapper.resolve(None, "Good morning") == UNLABELLED_SPEAKER
+        assert split_speaker_label("Speaker 1: I do.") == ("speaker 1", "I do.")
+        assert split_speaker_label("I do.") == (None, "I do.")
@@ -0,0 +1,92 @@
+"""
+Unit tests for the TTS phrase cache store
+"""
+import os
+
+from livekit import rtc
+
+from backend.tts_cache import PhraseCacheStore, phrase_cache_store, phrase_key
+
+SAMPLES = 480  # 10 ms at 48 kHz
+
+
+def _frames(count, fill=1):
+    return [
+        rtc.AudioFrame(
+            data=bytes([fill]) * SAMPLES * 2,
+            sample_rate=48000,
+            num_channels=1,
+            samples_per_channel=SAMPLES,
+        )
+        for _ in range(count)
+    ]
+
+
+def _disk_bytes(directory):
+    return sum(os.path.getsize(directory / name) for name in os.listdir(directory) if name.endswith(".pcm"))
+
+
+class TestPhraseCacheStore:
+    """Test disk-backed phrase audio storage"""
+
+    def test_hit_returns_stored_frames(self, tmp_path):
+        store = PhraseCacheStore(str(tmp_path), max_bytes=1_000_000)
+        key = phrase_key("Rachel", "eleven_turbo_v2", "mp3_44100_128", "Good day.")
+        store.save(key, _frames(3, fill=7))
+
+        frames = store.load(key)
+        assert len(frames) == 3
+        assert all(bytes(f.data) == bytes([7]) * SAMPLES * 2 for f in frames)
+        assert frames[0].sample_rate == 48000
+        assert frames[0].samples_per_channel == SAMPLES
+
+    def test_miss_returns_none(self, tmp_path):
+        store = PhraseCacheStore(str(tmp_path), max_bytes=1_000_000)
+        assert store.load(phrase_key("Rachel", "eleven_turbo_v2", "mp3_44100_128", "Unknown.")) is None
+        assert phrase_key("Rachel", "m", "e", "Hello") != phrase_key("Adam", "m", "e", "Hello")
+
+    def test_size_accounting_matches_disk(self, tmp_path):
+        store = PhraseCacheStore(str(tmp_path), max_bytes=1_000_000)
+        store.save("a", _frames(2))
+        assert store.total_bytes == _disk_bytes(tmp_path)
+
+        # A fresh store (e.g. after a restart) counts existing files once
+        reopened = PhraseCacheStore(str(tmp_path), max_bytes=1_000_000)
+        reopened.save("b", _frames(2))
+        assert reopened.total_bytes == _disk_bytes(tmp_path)
+
+        # Overwriting an entry replaces its size rather than adding to it
+        reopened.save("b", _frames(1))
+        assert reopened.total_bytes == _disk_bytes(tmp_path)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        store = PhraseCacheStore(str(tmp_path), max_bytes=1_000_000)
+        store.save("old", _frames(2))
+        entry_bytes = store.total_bytes
+        store = PhraseCacheStore(str(tmp_path), max_bytes=entry_bytes * 2)
+        store.save("used", _frames(2))
+        os.utime(tmp_path / "old.pcm", (1, 1))
+        os.utime(tmp_path / "used.pcm", (2, 2))
+        assert store.load("used") is not None  # refreshes its mtime
+
+        store.save("new", _frames(2))
+        assert store.load("old") is None
+        assert store.load("used") is not None
+        assert store.load("new") is not None
+        assert store.total_bytes == _disk_bytes(tmp_path) <= entry_bytes * 2
+
+    def test_limit_holds_for_stores_sharing_a_directory(self, tmp_path):
+        store = PhraseCacheStore(str(tmp_path), max_bytes=1_000_000)
+        store.save("probe", _frames(2))
+        entry_bytes = store.total_bytes
+        os.remove(tmp_path / "probe.pcm")
+
+        # One store per job process, all writing to the same directory
+        stores = [PhraseCacheStore(str(tmp_path), max_bytes=entry_bytes * 3) for _ in range(3)]
+        for round_ in range(3):
+            for i, store in enumerate(stores):
+                store.save(f"{round_}-{i}", _frames(2))
+                assert _disk_bytes(tmp_path) <= entry_bytes * 3
+
+        # Within a process every voice shares one store per directory
+        assert phrase_cache_store(str(tmp_path), 1) is phrase_cache_store(str(tmp_path), 1)
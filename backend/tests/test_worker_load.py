@@ -0,0 +1,69 @@
+"""
+Unit tests for agent worker load reporting and job acceptance
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from backend.worker_load import LoadCalculator
+
+
+class FakeRequest:
+    def __init__(self):
+        self.room = SimpleNamespace(name="room-1")
+        self.outcome = None
+
+    async def accept(self):
+        self.outcome = "accepted"
+
+    async def reject(self):
+        self.outcome = "rejected"
+
+
+def make_calculator(tmp_path, cpu=0.0, max_sessions=4):
+    return LoadCalculator(
+        max_sessions=max_sessions,
+        threshold=0.9,
+        drain_file=str(tmp_path / "agent.drain"),
+        cpu_percent=lambda: cpu,
+    )
+
+
+def worker_with(jobs):
+    return SimpleNamespace(active_jobs=[object()] * jobs)
+
+
+class TestLoadCalculator:
+    """Test load composition and acceptance"""
+
+    def test_load_is_highest_component(self, tmp_path):
+        calculator = make_calculator(tmp_path, cpu=30.0)
+        assert calculator.load(worker_with(1)) == pytest.approx(0.3)
+        assert calculator.load(worker_with(3)) == pytest.approx(0.75)
+        assert calculator.load(worker_with(6)) == 1.0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_full(self, tmp_path):
+        calculator = make_calculator(tmp_path)
+        calculator.load(worker_with(3))
+        request = FakeRequest()
+        await calculator.request_fnc(request)
+        assert request.outcome == "accepted"
+
+        calculator.load(worker_with(4))
+        request = FakeRequest()
+        await calculator.request_fnc(request)
+        assert request.outcome == "rejected"
+
+    @pytest.mark.asyncio
+    async def test_drain_mode(self, tmp_path):
+        calculator = make_calculator(tmp_path)
+        (tmp_path / "agent.drain").write_text("")
+        assert calculator.load(worker_with(0)) == 1.0
+
+        request = FakeRequest()
+        await calculator.request_fnc(request)
+        assert request.outcome == "rejected"
+
+        (tmp_path / "agent.drain").unlink()
+        assert calculator.load(worker_with(0)) == 0.0
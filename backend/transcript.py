@@ -1,21 +1,205 @@
 # backend/transcript.py
 
-import uuid
+import asyncio
+import logging
+import time
+from collections import deque
 from datetime import datetime
-from .database import AsyncSessionLocal
-from .models import Transcript as TranscriptModel
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from . import database
+from .config import settings
+from .metrics import (
+    transcript_flush_batch_size,
+    transcript_flush_duration,
+    transcript_queue_depth,
+    transcript_rows_dead_lettered,
+)
+from .report_cache import report_cache
+from .transcript_events import transcript_broadcaster
+from .transcript_journal import TranscriptJournal, insert_transcripts_ignoring_duplicates
+from .utils.ids import new_id
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptWriter:
+    """
+    Write-behind queue shared by every session in a worker process.
+
+    Entries are buffered in arrival order and flushed as multi-row inserts
+    when a batch fills up or the flush interval elapses. A single flusher
+    drains the queue front to back, so entries of one session always reach
+    the database in the order they were added.
+
+    When a journal is attached every entry is appended to it before being
+    queued, and the flusher acts as the replayer: it fsyncs the journal and
+    then inserts the batch, skipping ids that are already stored.
+
+    A batch that keeps failing is retried one row at a time so a single
+    bad row (e.g. one whose session was deleted) cannot hold up the rows
+    queued behind it. Rows the database rejects with a constraint or data
+    error are dead-lettered: logged, counted and, with a journal, moved to
+    its dead-letter directory. Any other error (the database being down)
+    leaves the batch at the head of the queue for the next attempt.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.transcript_batch_size,
+        flush_interval: float = settings.transcript_flush_interval,
+        max_pending: int = settings.transcript_max_pending,
+        batch_retries: int = settings.transcript_batch_retries,
+        journal: Optional[TranscriptJournal] = None,
+    ):
+        self._journal = journal
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._batch_retries = batch_retries
+        self._failures = 0
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def enqueue(self, row: Dict[str, Any]) -> None:
+        """Queue a transcript row; applies back-pressure once the queue is full."""
+        if self._journal is not None:
+            self._journal.append(row)
+        self._pending.append(row)
+        transcript_queue_depth.set(len(self._pending))
+        self._ensure_started()
+
+        if len(self._pending) >= self._max_pending:
+            try:
+                await self.flush()
+            except Exception:
+                # The entry is already durable in the journal; let the flusher retry
+                if self._journal is None:
+                    raise
+                logger.warning("Transcript queue full and database unavailable; relying on journal")
+        elif len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write every queued entry to the database."""
+        async with self._flush_lock:
+            if self._journal is not None:
+                await self._journal.sync()
+            while self._pending:
+                count = min(len(self._pending), self._batch_size)
+                batch = [self._pending[i] for i in range(count)]
+                try:
+                    await self._write_batch(batch)
+                except Exception:
+                    self._failures += 1
+                    if self._failures < self._batch_retries:
+                        raise
+                    await self._write_rows(batch)
+                self._failures = 0
+                for _ in range(count):
+                    self._pending.popleft()
+                transcript_queue_depth.set(len(self._pending))
+
+    async def release(self, session_id: str) -> None:
+        """Flush and drop the journal segment of a finished session."""
+        await self.flush()
+        if self._journal is not None:
+            self._journal.discard(session_id)
+
+    async def close(self) -> None:
+        """Stop the background flusher and drain what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._journal is not None:
+            self._journal.close()
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                # Failed batches stay at the head of the queue and are retried,
+                # row by row once they have failed `batch_retries` times
+                logger.error(f"Transcript flush failed, {len(self._pending)} entries pending: {e}")
+                await asyncio.sleep(self._flush_interval)
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        start_time = time.perf_counter()
+        async with database.AsyncSessionLocal() as db:
+            stmt = insert_transcripts_ignoring_duplicates(db.get_bind().dialect.name)
+            await db.execute(stmt, batch)
+            await db.commit()
+        transcript_flush_duration.observe(time.perf_counter() - start_time)
+        transcript_flush_batch_size.observe(len(batch))
+        await report_cache.invalidate_many(row["session_id"] for row in batch)
+        await transcript_broadcaster.publish(batch)
+
+    async def _write_rows(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch row by row, dead-lettering rows the database rejects.
+
+        Other errors propagate and leave the whole batch queued; rows that
+        were already written are skipped by id on the next attempt.
+        """
+        for row in batch:
+            try:
+                await self._write_batch([row])
+            except (IntegrityError, DataError) as e:
+                self._dead_letter(row, e)
+
+    def _dead_letter(self, row: Dict[str, Any], error: Exception) -> None:
+        transcript_rows_dead_lettered.inc()
+        kept_in = "not journaled"
+        if self._journal is not None:
+            try:
+                kept_in = self._journal.dead_letter(row)
+            except OSError as e:
+                logger.error(f"Could not write transcript dead letter: {e}")
+        logger.error(f"Dead-lettered transcript entry {row!r} ({kept_in}): {error}")
+
+
+# Global write-behind queue for this worker process
+transcript_writer = TranscriptWriter(
+    journal=TranscriptJournal(settings.transcript_journal_dir) if settings.transcript_journal_enabled else None
+)
+
 
 class TranscriptManager:
     """Manages saving transcript entries to the database for a specific session."""
 
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, writer: Optional[TranscriptWriter] = None):
         if not session_id:
             raise ValueError("session_id cannot be empty")
         self._session_id = session_id
+        self._writer = writer or transcript_writer
 
     async def add_entry(self, speaker: str, text: str):
         """
-        Saves a single transcript entry to the database.
+        Queues a single transcript entry for the next bulk write.
 
         Args:
             speaker: The name of the speaker (e.g., "Groom", "Bride", "AI Officer").
@@ -24,13 +208,18 @@ class TranscriptManager:
         if not speaker or not text:
             return
 
-        async with AsyncSessionLocal() as db:
-            new_entry = TranscriptModel(
-                id=str(uuid.uuid4()),
-                session_id=self._session_id,
-                speaker=speaker,
-                text=text,
-                timestamp=datetime.utcnow(),
-            )
-            db.add(new_entry)
-            await db.commit()
+        await self._writer.enqueue({
+            "id": new_id(),
+            "session_id": self._session_id,
+            "speaker": speaker,
+            "text": text,
+            "timestamp": datetime.utcnow(),
+        })
+
+    async def flush(self):
+        """Write any queued entries (for this and other sessions) to the database."""
+        await self._writer.flush()
+
+    async def close(self):
+        """Flush the session's entries and remove its journal segment."""
+        await self._writer.release(self._session_id)
@@ -0,0 +1,144 @@
+"""
+Deterministic transcript capture from voice pipeline events
+
+Instead of asking the LLM to call `save_transcript_entry` after every
+utterance, the agent subscribes to the pipeline's committed-speech events
+and writes entries itself. Diarized speaker labels from Deepgram
+("Speaker 0", "Speaker 1", ...) are mapped to the groom and bride from
+their name introductions.
+"""
+import asyncio
+import logging
+import re
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .transcript import TranscriptManager
+
+logger = logging.getLogger(__name__)
+
+AGENT_SPEAKER = "AI Officer"
+
+_LABEL_PREFIX = re.compile(r"^\s*\[?(speaker\s*\d+)\]?\s*:\s*", re.IGNORECASE)
+
+
+UNLABELLED_SPEAKER = "Participant"
+
+
+def split_speaker_label(text: str) -> Tuple[Optional[str], str]:
+    """
+    Split a diarized transcript into (label, text).
+
+    Handles the "Speaker 1: ..." form; the label is None when absent.
+    """
+    match = _LABEL_PREFIX.match(text)
+    if not match:
+        return None, text.strip()
+    label = re.sub(r"\s+", " ", match.group(1).lower())
+    return label, text[match.end():].strip()
+
+
+class SpeakerLabelMapper:
+    """
+    Maps diarization labels to participant names.
+
+    A label is bound to the groom or bride the first time its speaker
+    mentions one of their names (the interview opens with name
+    introductions). Labels that never do are bound to whichever
+    participant is still unassigned.
+    """
+
+    def __init__(self, groom_name: str, bride_name: str):
+        self._names = {"groom": groom_name, "bride": bride_name}
+        self._labels: Dict[str, str] = {}
+
+    @property
+    def mapping(self) -> Dict[str, str]:
+        return {label: self._names[role] for label, role in self._labels.items()}
+
+    def restore(self, mapping: Dict[str, str]) -> None:
+        """Re-apply a mapping previously returned by `mapping`."""
+        for label, name in mapping.items():
+            for role, role_name in self._names.items():
+                if role_name == name:
+                    self._labels[label] = role
+
+    def resolve(self, label: Optional[str], text: str) -> str:
+        if label is None:
+            # Without diarization only an explicit name mention identifies the speaker
+            role = self._match_name(text, include_taken=True)
+            return self._names[role] if role else UNLABELLED_SPEAKER
+
+        role = self._labels.get(label)
+        if role is None:
+            role = self._match_name(text) or self._next_unassigned()
+            if role is None:
+                return f"Unidentified ({label})"
+            self._labels[label] = role
+            logger.info(f"Mapped {label} to {role} ({self._names[role]})")
+        return self._names[role]
+
+    def _match_name(self, text: str, include_taken: bool = False) -> Optional[str]:
+        taken = set() if include_taken else set(self._labels.values())
+        lowered = text.lower()
+        for role, name in self._names.items():
+            if role in taken or not name:
+                continue
+            parts = [name.lower()] + [p for p in name.lower().split() if len(p) > 2]
+            if any(re.search(rf"\b{re.escape(p)}\b", lowered) for p in parts):
+                return role
+        return None
+
+    def _next_unassigned(self) -> Optional[str]:
+        taken = set(self._labels.values())
+        for role in ("groom", "bride"):
+            if role not in taken:
+                return role
+        return None
+
+
+class TranscriptCapture:
+    """Writes committed user and agent speech from a VoicePipelineAgent to the transcript."""
+
+    def __init__(self, transcript_manager: TranscriptManager, speakers: SpeakerLabelMapper):
+        self._manager = transcript_manager
+        self._speakers = speakers
+        self._tasks: Set[asyncio.Task] = set()
+
+    def attach(self, agent: Any) -> None:
+        agent.on("user_speech_committed", self._on_user_speech)
+        agent.on("agent_speech_committed", self._on_agent_speech)
+        agent.on("agent_speech_interrupted", self._on_agent_speech)
+
+    async def drain(self) -> None:
+        """Wait for entries that are still being queued."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _on_user_speech(self, msg: Any) -> None:
+        text = _message_text(msg)
+        if not text:
+            return
+        label = getattr(msg, "speaker_id", None)
+        if label is not None:
+            label = f"speaker {label}"
+        else:
+            label, text = split_speaker_label(text)
+        self._record(self._speakers.resolve(label, text), text)
+
+    def _on_agent_speech(self, msg: Any) -> None:
+        text = _message_text(msg)
+        if text:
+            self._record(AGENT_SPEAKER, text)
+
+    def _record(self, speaker: str, text: str) -> None:
+        # Event callbacks are synchronous; tasks start in creation order, so entries stay ordered
+        task = asyncio.get_running_loop().create_task(self._manager.add_entry(speaker, text))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def _message_text(msg: Any) -> str:
+    content = getattr(msg, "content", msg)
+    if isinstance(content, list):
+        content = " ".join(c for c in content if isinstance(c, str))
+    return str(content or "").strip()
@@ -0,0 +1,209 @@
+"""
+Fan-out of newly stored transcript entries to live subscribers
+
+The agent worker publishes each batch right after it has been committed.
+With the "redis" backend batches travel over Redis pub/sub so API processes
+can push them to dashboards; the "local" backend only reaches subscribers
+in the same process (tests, single-process development).
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from .config import settings
+from .redis_client import get_redis, redis_available
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "lexnova:transcripts:"
+
+# Sentinel pushed to a subscriber whose queue overflowed; it should resume from its last id
+OVERFLOW = object()
+
+
+def _serialize(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "session_id": row["session_id"],
+        "speaker": row["speaker"],
+        "text": row["text"],
+        "timestamp": row["timestamp"].isoformat() if isinstance(row["timestamp"], datetime) else row["timestamp"],
+    }
+
+
+class TranscriptBroadcaster:
+    """
+    Publishes transcript rows per session and delivers them to subscriber queues.
+
+    With the Redis backend a process subscribes only to the channels of
+    sessions it has local subscribers for, over one shared pub/sub
+    connection. `subscribe()` returns once Redis has confirmed the channel
+    subscription, so a caller that backfills from the database afterwards
+    cannot miss a row published in between. Rows published while the
+    connection is down are lost, so every affected queue receives
+    `OVERFLOW` after a reconnect and its client backfills.
+    """
+
+    def __init__(
+        self,
+        backend: str = "local",
+        queue_size: int = 1000,
+        subscribe_timeout: float = 5.0,
+        reconnect_delay: float = 1.0,
+    ):
+        if backend == "redis" and not redis_available():
+            logger.warning("redis package not installed; falling back to in-process transcript events")
+            backend = "local"
+        self._backend = backend
+        self._queue_size = queue_size
+        self._subscribe_timeout = subscribe_timeout
+        self._reconnect_delay = reconnect_delay
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # Per subscribed session: resolves when Redis confirms the channel subscription
+        self._confirmed: Dict[str, asyncio.Future] = {}
+        self._pubsub: Any = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, rows: List[Dict[str, Any]]) -> None:
+        """Announce committed rows; failures are logged, never raised."""
+        by_session: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_session.setdefault(row["session_id"], []).append(_serialize(row))
+
+        if self._backend != "redis":
+            for session_id, events in by_session.items():
+                self._dispatch(session_id, events)
+            return
+
+        try:
+            client = get_redis()
+            for session_id, events in by_session.items():
+                await client.publish(f"{CHANNEL_PREFIX}{session_id}", json.dumps(events))
+        except Exception as e:
+            logger.error(f"Failed to publish transcript events: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, session_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Register a queue that receives every new entry of a session."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        try:
+            if self._backend == "redis":
+                await self._join(session_id)
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(session_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[session_id]
+                    if self._backend == "redis":
+                        await self._leave(session_id)
+
+    def _dispatch(self, session_id: str, events: List[Dict[str, Any]]) -> None:
+        for queue in list(self._subscribers.get(session_id, ())):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Slow consumer: tell it to reconnect and backfill from the database
+                    self._overflow(session_id, queue)
+                    break
+
+    def _overflow(self, session_id: str, queue: asyncio.Queue) -> None:
+        self._subscribers[session_id].discard(queue)
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(OVERFLOW)
+
+    def _overflow_session(self, session_id: str) -> None:
+        for queue in list(self._subscribers.get(session_id, ())):
+            self._overflow(session_id, queue)
+
+    def _connection(self) -> Any:
+        if self._pubsub is None:
+            self._pubsub = get_redis().pubsub()
+        return self._pubsub
+
+    async def _join(self, session_id: str) -> None:
+        confirmed = self._confirmed.get(session_id)
+        if confirmed is None:
+            confirmed = asyncio.get_running_loop().create_future()
+            self._confirmed[session_id] = confirmed
+            try:
+                await self._connection().subscribe(f"{CHANNEL_PREFIX}{session_id}")
+            except Exception as e:
+                # The listener resubscribes once Redis is back and overflows the queue
+                logger.error(f"Failed to subscribe to transcript events of {session_id}: {e}")
+            self._ensure_listener()
+        try:
+            await asyncio.wait_for(asyncio.shield(confirmed), timeout=self._subscribe_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Subscription to transcript events of {session_id} was not confirmed")
+
+    async def _leave(self, session_id: str) -> None:
+        confirmed = self._confirmed.pop(session_id, None)
+        if confirmed is None or self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(f"{CHANNEL_PREFIX}{session_id}")
+        except Exception as e:
+            logger.error(f"Failed to unsubscribe from transcript events of {session_id}: {e}")
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while self._confirmed:
+            try:
+                message = await self._connection().get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Transcript event listener failed, reconnecting: {e}")
+                await self._reconnect()
+                continue
+            if message is None:
+                continue
+
+            session_id = message["channel"][len(CHANNEL_PREFIX):]
+            if message["type"] == "subscribe":
+                confirmed = self._confirmed.get(session_id)
+                if confirmed is None:
+                    continue
+                if confirmed.done():
+                    # The client library resubscribed after a dropped connection
+                    self._overflow_session(session_id)
+                else:
+                    confirmed.set_result(None)
+            elif message["type"] == "message" and session_id in self._subscribers:
+                self._dispatch(session_id, json.loads(message["data"]))
+
+    async def _reconnect(self) -> None:
+        """Start over on a new connection; every subscriber may have missed rows."""
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        for session_id in list(self._subscribers):
+            self._overflow_session(session_id)
+        await asyncio.sleep(self._reconnect_delay)
+        if not self._confirmed:
+            return
+        for session_id, confirmed in self._confirmed.items():
+            if confirmed.done():
+                self._confirmed[session_id] = asyncio.get_running_loop().create_future()
+        try:
+            await self._connection().subscribe(*(f"{CHANNEL_PREFIX}{s}" for s in self._confirmed))
+        except Exception as e:
+            logger.error(f"Failed to resubscribe to transcript events: {e}")
+
+
+# Global broadcaster for this process
+transcript_broadcaster = TranscriptBroadcaster(backend=settings.transcript_events_backend)
@@ -0,0 +1,208 @@
+"""
+Append-only local journal for transcript entries
+
+Each session gets its own segment file of JSON lines. Entries are written
+to the segment before they are queued for the database, so a worker crash
+or a database outage never loses an utterance. Segments are removed once
+every entry of the session has been stored in the `transcripts` table.
+
+Leftover segments from a crashed worker can be re-driven with:
+    python -m backend.transcript_journal replay [--dir PATH]
+
+Entries the database rejects outright (a constraint violation, not an
+outage) are moved to `dead-letter/<session_id>.jsonl` under the journal
+directory; replay skips that subdirectory.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Set, TextIO
+
+from sqlalchemy import insert
+
+from . import database
+from .config import settings
+from .models import Transcript as TranscriptModel
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+DEAD_LETTER_DIR = "dead-letter"
+
+
+def insert_transcripts_ignoring_duplicates(dialect_name: str):
+    """
+    Build an INSERT for transcript rows that skips ids already stored,
+    which makes replaying a segment idempotent.
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(TranscriptModel).on_conflict_do_nothing(index_elements=["id"])
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(TranscriptModel).on_conflict_do_nothing(index_elements=["id"])
+    return insert(TranscriptModel)
+
+
+class TranscriptJournal:
+    """Per-session append-only segment files with batched fsync."""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._files: Dict[str, TextIO] = {}
+        self._dirty: Set[str] = set()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def segment_path(self, session_id: str) -> str:
+        return os.path.join(self._directory, f"{session_id}{SEGMENT_SUFFIX}")
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Write one entry to its session segment (no fsync; see `sync`)."""
+        session_id = row["session_id"]
+        handle = self._files.get(session_id)
+        if handle is None:
+            os.makedirs(self._directory, exist_ok=True)
+            handle = open(self.segment_path(session_id), "a", encoding="utf-8")
+            self._files[session_id] = handle
+
+        record = dict(row, timestamp=row["timestamp"].isoformat())
+        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        handle.flush()
+        self._dirty.add(session_id)
+
+    async def sync(self) -> None:
+        """fsync every segment written since the last call."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        handles = [self._files[s] for s in dirty if s in self._files]
+        await asyncio.to_thread(_fsync_all, handles)
+
+    def dead_letter(self, row: Dict[str, Any]) -> str:
+        """Set aside an entry the database rejected; returns the file it went to."""
+        directory = os.path.join(self._directory, DEAD_LETTER_DIR)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{row['session_id']}{SEGMENT_SUFFIX}")
+        record = dict(row, timestamp=row["timestamp"].isoformat())
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        return path
+
+    def discard(self, session_id: str) -> None:
+        """Close and delete a session segment once it has been fully stored."""
+        handle = self._files.pop(session_id, None)
+        if handle is not None:
+            handle.close()
+        self._dirty.discard(session_id)
+        try:
+            os.remove(self.segment_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        self._files.clear()
+        self._dirty.clear()
+
+
+def _fsync_all(handles: List[TextIO]) -> None:
+    for handle in handles:
+        if not handle.closed:
+            os.fsync(handle.fileno())
+
+
+def read_segment(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entries stored in a segment file.
+
+    A torn final line (crash mid-write) is skipped.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line {line_number} in {path}")
+                continue
+            record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+            yield record
+
+
+async def replay_segment(path: str, batch_size: int = 500) -> int:
+    """Insert every entry of a segment into the database; returns rows read."""
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    async with database.AsyncSessionLocal() as db:
+        stmt = insert_transcripts_ignoring_duplicates(db.get_bind().dialect.name)
+        for record in read_segment(path):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await db.execute(stmt, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            await db.execute(stmt, batch)
+            count += len(batch)
+        await db.commit()
+    return count
+
+
+async def replay_directory(directory: str, min_age_seconds: float = 60.0) -> int:
+    """
+    Replay and remove leftover segments.
+
+    Segments modified within `min_age_seconds` are assumed to belong to a
+    live worker and are left alone.
+    """
+    if not os.path.isdir(directory):
+        return 0
+
+    total = 0
+    now = time.time()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(SEGMENT_SUFFIX):
+            continue
+        path = os.path.join(directory, name)
+        if now - os.path.getmtime(path) < min_age_seconds:
+            logger.info(f"Skipping recently modified segment {path}")
+            continue
+        count = await replay_segment(path)
+        os.remove(path)
+        total += count
+        logger.info(f"Replayed {count} transcript entries from {path}")
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LexNova transcript journal tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    replay = subcommands.add_parser("replay", help="Re-drive leftover journal segments into the database")
+    replay.add_argument("--dir", default=settings.transcript_journal_dir, help="Journal directory")
+    replay.add_argument(
+        "--min-age",
+        type=float,
+        default=60.0,
+        help="Only replay segments idle for at least this many seconds (0 replays everything)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    total = asyncio.run(replay_directory(args.dir, min_age_seconds=args.min_age))
+    print(f"✅ Replayed {total} transcript entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Disk cache of synthesized audio for static agent phrases
+
+The opening and resume greetings are spoken word for word in every
+session. `CachedTTS` wraps the ElevenLabs TTS used by the agent and serves
+phrases it has synthesized before from local disk, keyed by
+(voice, model_id, encoding, text hash). The cache is size-bounded with
+least-recently-used eviction.
+
+Only text spoken with `agent.say()` goes through `synthesize` and can be
+served from the cache. Script questions are phrased by the LLM (names
+filled in, wording adapted) and reach TTS through the streaming path, so
+they are not cached or warmed; the one exception, the question repeated
+verbatim after a resume, is cached the first time it is spoken.
+
+Pre-warm the greetings for every voice (run inside the agent container):
+    python -m backend.tts_cache warm [--voice Rachel]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from livekit import rtc
+from livekit.agents import tts, utils
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+
+def phrase_key(voice: str, model_id: str, encoding: str, text: str) -> str:
+    text_hash = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{voice}|{model_id}|{encoding}|{text_hash}".encode("utf-8")).hexdigest()
+
+
+class PhraseCacheStore:
+    """
+    Size-bounded directory of PCM audio files.
+
+    Each file holds a small JSON header (sample rate, channels, samples per
+    frame) followed by the raw 16-bit PCM of every frame. File mtimes track
+    recency for LRU eviction.
+
+    Every job process (and every voice) writes to the same directory, so
+    the size is re-read from disk on each save rather than tracked in
+    memory; saves only happen on cache misses.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self._directory = directory
+        self._max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.pcm")
+
+    def load(self, key: str) -> Optional[List[rtc.AudioFrame]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                (header_size,) = _HEADER.unpack(handle.read(_HEADER.size))
+                header = json.loads(handle.read(header_size))
+                data = handle.read()
+        except (FileNotFoundError, ValueError, struct.error):
+            return None
+
+        os.utime(path)  # mark as recently used
+        frame_bytes = header["samples_per_channel"] * header["num_channels"] * 2
+        return [
+            rtc.AudioFrame(
+                data=data[offset:offset + frame_bytes],
+                sample_rate=header["sample_rate"],
+                num_channels=header["num_channels"],
+                samples_per_channel=len(data[offset:offset + frame_bytes]) // (2 * header["num_channels"]),
+            )
+            for offset in range(0, len(data), frame_bytes)
+        ]
+
+    def save(self, key: str, frames: List[rtc.AudioFrame]) -> None:
+        if not frames:
+            return
+        first = frames[0]
+        header = json.dumps({
+            "sample_rate": first.sample_rate,
+            "num_channels": first.num_channels,
+            "samples_per_channel": first.samples_per_channel,
+        }).encode("utf-8")
+        payload = b"".join(bytes(f.data) for f in frames)
+
+        os.makedirs(self._directory, exist_ok=True)
+        path = self._path(key)
+        # Per-process temp name: two processes may record the same phrase at once
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(_HEADER.pack(len(header)))
+            handle.write(header)
+            handle.write(payload)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> Iterable[Tuple[str, int, float]]:
+        if not os.path.isdir(self._directory):
+            return []
+        entries = []
+        for name in os.listdir(self._directory):
+            if name.endswith(".pcm"):
+                try:
+                    stat = os.stat(os.path.join(self._directory, name))
+                except FileNotFoundError:
+                    continue  # evicted by another process meanwhile
+                entries.append((name, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for name, size, _ in entries:
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self._directory, name))
+            except FileNotFoundError:
+                pass  # another process evicted it first
+            total -= size
+
+
+class CachedTTS(tts.TTS):
+    """
+    TTS wrapper that serves `synthesize` calls (`agent.say`) from the phrase cache.
+
+    Streaming synthesis (LLM output) is passed through untouched.
+    """
+
+    def __init__(self, wrapped: tts.TTS, store: PhraseCacheStore, voice: str, model_id: str, encoding: str):
+        super().__init__(
+            capabilities=wrapped.capabilities,
+            sample_rate=wrapped.sample_rate,
+            num_channels=wrapped.num_channels,
+        )
+        self._wrapped = wrapped
+        self._store = store
+        self._key_parts = (voice, model_id, encoding)
+
+    def key_for(self, text: str) -> str:
+        return phrase_key(*self._key_parts, text)
+
+    def synthesize(self, text: str, **kwargs) -> tts.ChunkedStream:
+        key = self.key_for(text)
+        frames = self._store.load(key)
+        if frames is not None:
+            return _CachedChunkedStream(tts=self, input_text=text, frames=frames)
+        return _RecordingChunkedStream(
+            tts=self, input_text=text, inner=self._wrapped.synthesize(text, **kwargs),
+            on_complete=lambda recorded: self._store.save(key, recorded)
+        )
+
+    def stream(self, **kwargs) -> tts.SynthesizeStream:
+        return self._wrapped.stream(**kwargs)
+
+    async def warm(self, phrases: Iterable[str]) -> int:
+        """Synthesize every phrase not cached yet; returns how many were added."""
+        added = 0
+        for phrase in phrases:
+            if self._store.load(self.key_for(phrase)) is not None:
+                continue
+            async for _ in self.synthesize(phrase):
+                pass
+            added += 1
+        return added
+
+
+class _CachedChunkedStream(tts.ChunkedStream):
+    def __init__(self, *, tts: tts.TTS, input_text: str, frames: List[rtc.AudioFrame]):
+        super().__init__(tts=tts, input_text=input_text)
+        self._frames = frames
+
+    async def _run(self) -> None:
+        request_id = utils.shortuuid()
+        for frame in self._frames:
+            self._event_ch.send_nowait(tts.SynthesizedAudio(request_id=request_id, frame=frame))
+
+
+class _RecordingChunkedStream(tts.ChunkedStream):
+    def __init__(self, *, tts: tts.TTS, input_text: str, inner: tts.ChunkedStream, on_complete):
+        super().__init__(tts=tts, input_text=input_text)
+        self._inner = inner
+        self._on_complete = on_complete
+
+    async def _run(self) -> None:
+        recorded: List[rtc.AudioFrame] = []
+        async for audio in self._inner:
+            recorded.append(audio.frame)
+            self._event_ch.send_nowait(audio)
+        try:
+            self._on_complete(recorded)
+        except OSError as e:
+            logger.warning(f"Could not store synthesized phrase: {e}")
+
+
+_stores: Dict[str, PhraseCacheStore] = {}
+
+
+def phrase_cache_store(directory: str = settings.tts_cache_dir, max_bytes: int = settings.tts_cache_max_bytes) -> PhraseCacheStore:
+    """The store for `directory`, shared by every voice in this process."""
+    store = _stores.get(directory)
+    if store is None:
+        store = _stores[directory] = PhraseCacheStore(directory, max_bytes)
+    return store
+
+
+def wrap_tts(wrapped: tts.TTS, voice: str, model_id: str, encoding: str) -> tts.TTS:
+    """Wrap a TTS instance with the phrase cache when it is enabled."""
+    if not settings.tts_cache_enabled:
+        return wrapped
+    return CachedTTS(wrapped, phrase_cache_store(), voice=voice, model_id=model_id, encoding=encoding)
+
+
+async def warm_voice(voice: str) -> int:
+    """Pre-synthesize the static phrases the agent says in `voice`."""
+    import aiohttp
+    from livekit.plugins import elevenlabs
+
+    from .agent import INITIAL_GREETING, RESUME_GREETING, TTS_ENCODING, TTS_MODEL_ID
+
+    phrases = [INITIAL_GREETING, RESUME_GREETING]
+
+    async with aiohttp.ClientSession() as http_session:
+        inner = elevenlabs.TTS(
+            api_key=settings.elevenlabs_api_key or os.getenv("ELEVENLABS_API_KEY", ""),
+            voice=voice,
+            model_id=TTS_MODEL_ID,
+            encoding=TTS_ENCODING,
+            http_session=http_session,
+        )
+        cached = CachedTTS(inner, phrase_cache_store(), voice=voice, model_id=TTS_MODEL_ID, encoding=TTS_ENCODING)
+        return await cached.warm(phrases)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LexNova TTS phrase cache tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    warm = subcommands.add_parser("warm", help="Pre-synthesize the agent's greetings")
+    warm.add_argument("--voice", action="append", help="ElevenLabs voice to warm (repeatable; default: all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def warm_all():
+        from .agent import VOICE_MAP
+
+        for voice in args.voice or sorted(set(VOICE_MAP.values())):
+            added = await warm_voice(voice)
+            print(f"✅ Cached {added} new phrases for voice {voice}")
+
+    asyncio.run(warm_all())
+
+
+if __name__ == "__main__":
+    main()
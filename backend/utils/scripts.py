@@ -0,0 +1,25 @@
+"""
+Helpers for uploaded interview scripts
+"""
+import re
+from typing import List
+
+_QUESTION_PREFIX = re.compile(r"^\s*(?:q(?:uestion)?\s*\d+\s*[:.)-]|\d+\s*[:.)-])\s*", re.IGNORECASE)
+
+
+def extract_script_questions(script_content: str) -> List[str]:
+    """
+    Extract the questions of a script in order
+    
+    Args:
+        script_content: Text extracted from the uploaded script
+        
+    Returns:
+        Distinct question lines, stripped of "Question 1:" / "1." numbering
+    """
+    questions: List[str] = []
+    for line in (script_content or "").splitlines():
+        line = _QUESTION_PREFIX.sub("", line).strip()
+        if line.endswith("?") and line not in questions:
+            questions.append(line)
+    return questions
@@ -1,20 +1,22 @@
 """
 Session code generation and validation utilities
 """
-import random
+import secrets
 import string
 from datetime import datetime, timedelta
 
 
 def generate_session_code() -> str:
     """
-    Generate a unique 6-character alphanumeric session code
+    Generate a random 6-character alphanumeric session code
+    
+    Uniqueness is enforced by the database (see Database.create_session).
     
     Returns:
         6-character uppercase alphanumeric code (e.g., "A3X9K2")
     """
     characters = string.ascii_uppercase + string.digits
-    return ''.join(random.choices(characters, k=6))
+    return ''.join(secrets.choice(characters) for _ in range(6))
 
 
 def is_code_expired(expires_at: datetime) -> bool:
@@ -0,0 +1,158 @@
+"""
+Capacity-aware job acceptance for agent workers
+
+LiveKit dispatches a room to a worker whose reported load is below
+`load_threshold`. `LoadCalculator` reports a load that combines the number
+of active interviews (against `settings.agent_max_sessions`), event-loop
+lag of the worker process and host CPU use, and `request_fnc` rejects job
+requests above capacity so LiveKit hands them to another worker. CPU is
+measured system-wide rather than for the worker process: interviews run
+in separate job processes, which the worker's own usage would not show.
+
+Drain mode (rolling deploys): while the drain file exists the worker
+reports full load and rejects new jobs, and running interviews finish
+normally.
+    python -m backend.worker_load drain     # stop taking new interviews
+    python -m backend.worker_load resume
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Optional
+
+try:
+    import psutil
+except Exception:  # psutil ships with livekit-agents, but stay importable without it
+    psutil = None
+
+from .config import settings
+from .metrics import agent_jobs_rejected, agent_worker_load
+
+logger = logging.getLogger(__name__)
+
+
+def _system_cpu_percent() -> float:
+    if psutil is None:
+        return 0.0
+    # Non-blocking: usage since the previous call
+    return psutil.cpu_percent(interval=None)
+
+
+class LoadCalculator:
+    """
+    Worker load in [0, 1]: the highest of session, event-loop lag and host CPU utilisation.
+
+    Pass `load` as `WorkerOptions.load_fnc` and `request_fnc` as
+    `WorkerOptions.request_fnc`.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = settings.agent_max_sessions,
+        lag_budget: float = settings.agent_load_lag_budget,
+        threshold: float = settings.agent_load_threshold,
+        drain_file: str = settings.agent_drain_file,
+        cpu_percent: Callable[[], float] = _system_cpu_percent,
+        lag_interval: float = 0.25,
+    ):
+        self._max_sessions = max(1, max_sessions)
+        self._lag_budget = lag_budget
+        self._threshold = threshold
+        self._drain_file = drain_file
+        self._cpu_percent = cpu_percent
+        self._lag_interval = lag_interval
+        self._lag = 0.0
+        self._lag_handle: Optional[asyncio.TimerHandle] = None
+        self._worker: Any = None
+
+    @property
+    def draining(self) -> bool:
+        return os.path.exists(self._drain_file)
+
+    @property
+    def event_loop_lag(self) -> float:
+        return self._lag
+
+    def active_sessions(self) -> int:
+        worker = self._worker
+        return len(getattr(worker, "active_jobs", None) or []) if worker is not None else 0
+
+    def load(self, worker: Any = None) -> float:
+        if worker is not None:
+            self._worker = worker
+        self._ensure_lag_sampler()
+
+        if self.draining:
+            value = 1.0
+        else:
+            value = min(1.0, max(
+                self.active_sessions() / self._max_sessions,
+                self._lag / self._lag_budget if self._lag_budget > 0 else 0.0,
+                self._cpu_percent() / 100,
+            ))
+        agent_worker_load.set(value)
+        return value
+
+    async def request_fnc(self, request: Any) -> None:
+        """Accept a job request only when the worker has room for another interview."""
+        self._ensure_lag_sampler()
+        reason = None
+        if self.draining:
+            reason = "draining"
+        elif self.active_sessions() >= self._max_sessions:
+            reason = "max_sessions"
+        elif self.load() >= self._threshold:
+            reason = "load"
+
+        if reason is not None:
+            agent_jobs_rejected.labels(reason=reason).inc()
+            logger.info(f"Rejecting job for room {getattr(request.room, 'name', '?')}: {reason}")
+            await request.reject()
+            return
+        await request.accept()
+
+    def _ensure_lag_sampler(self) -> None:
+        if self._lag_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # called from an executor thread; the next call on the loop starts it
+        self._schedule_lag_sample(loop)
+
+    def _schedule_lag_sample(self, loop: asyncio.AbstractEventLoop) -> None:
+        expected = time.perf_counter() + self._lag_interval
+
+        def sample():
+            lag = max(0.0, time.perf_counter() - expected)
+            # Smooth so a single slow callback does not flip availability
+            self._lag = 0.8 * self._lag + 0.2 * lag
+            self._schedule_lag_sample(loop)
+
+        self._lag_handle = loop.call_later(self._lag_interval, sample)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LexNova agent worker capacity tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("drain", help="Stop accepting new interviews on this worker")
+    subcommands.add_parser("resume", help="Accept new interviews again")
+    args = parser.parse_args()
+
+    if args.command == "drain":
+        os.makedirs(os.path.dirname(settings.agent_drain_file) or ".", exist_ok=True)
+        with open(settings.agent_drain_file, "w") as handle:
+            handle.write(f"{time.time()}\n")
+        print(f"✅ Draining: new jobs are rejected ({settings.agent_drain_file})")
+    else:
+        try:
+            os.remove(settings.agent_drain_file)
+        except FileNotFoundError:
+            pass
+        print("✅ Accepting new jobs")
+
+
+if __name__ == "__main__":
+    main()
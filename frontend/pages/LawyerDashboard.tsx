@@ -9,7 +9,7 @@ import { useSessionStore, SessionReport } from '../store/useSessionStore';
 
 export const LawyerDashboard: React.FC = () => {
    const navigate = useNavigate();
-   const { sessions, fetchSessions, createSession, uploadScript, startSession, fetchReport, isLoading: storeLoading } = useSessionStore();
+   const { sessions, nextSessionsCursor, fetchSessions, fetchMoreSessions, createSession, uploadScript, startSession, fetchReport, isLoading: storeLoading } = useSessionStore();
 
    const [isCreating, setIsCreating] = useState(false);
    const [newSessionData, setNewSessionData] = useState({ groom: '', bride: '', date: '' });
@@ -455,6 +455,11 @@ export const LawyerDashboard: React.FC = () => {
                         </div>
                      </div>
                   ))}
+                  {nextSessionsCursor && (
+                     <div className="px-6 py-4 text-center">
+                        <button onClick={() => fetchMoreSessions().catch(() => setError('Failed to load sessions. Please try again.'))} disabled={storeLoading} className="text-sm text-violet-400 hover:text-violet-300 underline disabled:opacity-50" aria-label="Load more sessions">{storeLoading ? 'Loading...' : 'Load more'}</button>
+                     </div>
+                  )}
                </div>
             ) : null}
          </div>
@@ -36,13 +36,17 @@ export interface Session {
     };
 }
 
+const SESSION_PAGE_SIZE = 100;
+
 interface SessionState {
     sessions: Session[];
+    nextSessionsCursor: string | null;
     currentSession: Session | null;
     isLoading: boolean;
     error: string | null;
 
     fetchSessions: () => Promise<void>;
+    fetchMoreSessions: () => Promise<void>;
     createSession: (data: Partial<Session>) => Promise<Session>;
     uploadScript: (sessionId: string, file: File) => Promise<void>;
     startSession: (sessionId: string) => Promise<{ groom_token: string; bride_token: string; lawyer_token: string }>;
@@ -52,6 +56,7 @@ interface SessionState {
 
 export const useSessionStore = create<SessionState>((set, get) => ({
     sessions: [],
+    nextSessionsCursor: null,
     currentSession: null,
     isLoading: false,
     error: null,
@@ -59,8 +64,35 @@ export const useSessionStore = create<SessionState>((set, get) => ({
     fetchSessions: async () => {
         set({ isLoading: true, error: null });
         try {
-            const response = await api.get('/sessions');
-            set({ sessions: response.data, isLoading: false });
+            // The list view never shows scripts; leave them out of the payload
+            const response = await api.get('/sessions', {
+                params: { limit: SESSION_PAGE_SIZE, includeScript: false },
+            });
+            set({
+                sessions: response.data,
+                nextSessionsCursor: response.headers['x-next-cursor'] ?? null,
+                isLoading: false,
+            });
+        } catch (error) {
+            set({ error: 'Failed to fetch sessions', isLoading: false });
+            console.error(error);
+            throw error;
+        }
+    },
+
+    fetchMoreSessions: async () => {
+        const cursor = get().nextSessionsCursor;
+        if (!cursor) return;
+        set({ isLoading: true, error: null });
+        try {
+            const response = await api.get('/sessions', {
+                params: { limit: SESSION_PAGE_SIZE, includeScript: false, after: cursor },
+            });
+            set({
+                sessions: [...get().sessions, ...response.data],
+                nextSessionsCursor: response.headers['x-next-cursor'] ?? null,
+                isLoading: false,
+            });
         } catch (error) {
             set({ error: 'Failed to fetch sessions', isLoading: false });
             console.error(error);